@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+if not pa.Codec.is_available("zstd"):
+    pytest.skip("pyarrow was built without zstd", allow_module_level=True)
+
+from tools.archiver import (  # noqa: E402
+    PackedArchive,
+    pack_archived_asset,
+    pack_folder,
+    pack_path,
+    unpack_archived_asset,
+)
+from tools.settings import Settings  # noqa: E402
+
+ARCHIVED = "AEN_PV025_Sunfield_Spain_[SOLD]"
+
+
+def _make_asset(root):
+    (root / "01_PIPELINE" / "Reports").mkdir(parents=True)
+    (root / "02_DEVELOPMENT").mkdir()
+    (root / "01_PIPELINE" / "Reports" / "study.pdf").write_bytes(os.urandom(10_000))
+    (root / "01_PIPELINE" / "notes.txt").write_text("notes " * 500)
+    (root / "01_PIPELINE" / "empty.txt").write_bytes(b"")
+    (root / "_STATUS_05_ARCHIVED.txt").write_text("archived")
+    os.chmod(root / "01_PIPELINE" / "notes.txt", 0o444)
+    return root
+
+
+def _tree(root):
+    entries = {}
+    for path in sorted(root.rglob("*")):
+        st = path.stat()
+        rel = path.relative_to(root).as_posix()
+        content = None if path.is_dir() else path.read_bytes()
+        entries[rel] = (content, st.st_mode, None if path.is_dir() else st.st_mtime_ns)
+    return entries
+
+
+def test_pack_round_trip(tmp_path):
+    src = _make_asset(tmp_path / "asset")
+    dst = tmp_path / "asset.zpack"
+
+    # A small block size makes files span several blocks
+    stats = pack_folder(src, dst, workers=2, block_size=4096)
+    assert stats.files == 4
+    assert stats.dirs == 3
+    assert stats.blocks > 2
+
+    with PackedArchive(dst) as archive:
+        assert len(archive) == 4
+        assert "01_PIPELINE/notes.txt" in archive
+        assert [m.path for m in archive.members("01_PIPELINE/*.txt")] == [
+            "01_PIPELINE/empty.txt",
+            "01_PIPELINE/notes.txt",
+        ]
+        study = "01_PIPELINE/Reports/study.pdf"
+        assert archive.read(study) == (src / study).read_bytes()
+        assert archive.read("01_PIPELINE/empty.txt") == b""
+        assert archive.verify(workers=2).files == 4
+        archive.extract_all(tmp_path / "restored", workers=2)
+
+    assert _tree(tmp_path / "restored") == _tree(src)
+    assert not (tmp_path / ".restored.unpacking").exists()
+
+
+def test_pack_refuses_existing_destination(tmp_path):
+    src = _make_asset(tmp_path / "asset")
+    dst = tmp_path / "asset.zpack"
+    dst.write_bytes(b"")
+    with pytest.raises(FileExistsError):
+        pack_folder(src, dst)
+
+
+@pytest.fixture
+def settings(tmp_path):
+    _make_asset(tmp_path / "ARCHIVE" / "2024" / ARCHIVED)
+    return Settings(fileserver_root=tmp_path, default_export_dir=tmp_path / "reports")
+
+
+def test_pack_and_unpack_archived_asset(settings):
+    folder = settings.archive_path / "2024" / ARCHIVED
+    expected = _tree(folder)
+
+    stats = pack_archived_asset(settings, ARCHIVED, workers=1)
+    assert stats.files == 4
+    assert not folder.exists()
+    assert pack_path(folder).exists()
+
+    unpack_archived_asset(settings, ARCHIVED, year=2024, workers=1)
+    assert _tree(folder) == expected
+
+
+def test_pack_archived_asset_refuses_symlinks(settings):
+    folder = settings.archive_path / "2024" / ARCHIVED
+    os.symlink("notes.txt", folder / "01_PIPELINE" / "link.txt")
+    expected = _tree(folder)
+
+    with pytest.raises(ValueError, match="not regular files or folders"):
+        pack_archived_asset(settings, ARCHIVED, workers=1)
+    assert _tree(folder) == expected
+    assert (folder / "01_PIPELINE" / "link.txt").is_symlink()
+    assert sorted(p.name for p in folder.parent.iterdir()) == [ARCHIVED]
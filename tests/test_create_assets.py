@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from tools.lifecycle_ops import CREATION_MARKER, PIPELINE_STATUS_FILE, create_assets_bulk
+from tools.settings import Settings
+
+ROW = {
+    "subco": "AEN",
+    "asset_type": "PV",
+    "asset_id": "025",
+    "name": "Sunfield",
+    "location": "Spain",
+    "dev_pm": "J. Doe",
+}
+FOLDER = "AEN_PV025_Sunfield_Spain"
+
+
+@pytest.fixture
+def settings(tmp_path):
+    template = tmp_path / "TEMPLATES" / "ASSET_LIFECYCLE_TEMPLATE"
+    (template / "01_PIPELINE" / "Reports").mkdir(parents=True)
+    (template / "02_DEVELOPMENT").mkdir()
+    (template / "01_PIPELINE" / "Reports" / "checklist.txt").write_text("check")
+    (tmp_path / "ASSETS").mkdir()
+    return Settings(fileserver_root=tmp_path, default_export_dir=tmp_path / "reports")
+
+
+def _results(df):
+    return dict(zip(df["Asset_Folder"], df["Result"]))
+
+
+def test_creates_tree_and_status_without_marker(settings):
+    df = create_assets_bulk(settings, [ROW])
+    assert _results(df) == {FOLDER: "created"}
+    asset = settings.assets_path / FOLDER
+    assert (asset / "01_PIPELINE" / "Reports" / "checklist.txt").read_text() == "check"
+    assert (asset / "02_DEVELOPMENT").is_dir()
+    assert (asset / PIPELINE_STATUS_FILE).exists()
+    assert not (asset / CREATION_MARKER).exists()
+
+    assert _results(create_assets_bulk(settings, [ROW])) == {FOLDER: "exists"}
+
+
+def test_blank_and_nan_cells_are_missing(settings):
+    df = pd.DataFrame(
+        [
+            {**ROW, "asset_id": float("nan")},
+            {**ROW, "name": "   "},
+            {**ROW, "asset_id": 12.0},
+        ]
+    )
+    df = create_assets_bulk(settings, df)
+    assert df["Result"].tolist() == ["invalid", "invalid", "created"]
+    assert df["Error"].iloc[0] == "Missing asset_id"
+    assert df["Error"].iloc[1] == "Missing name"
+    assert df["Asset_Folder"].iloc[2] == "AEN_PV12_Sunfield_Spain"
+    assert not any("nan" in p.name for p in settings.assets_path.iterdir())
+
+
+def test_duplicate_rows_are_invalid(settings):
+    df = create_assets_bulk(settings, [ROW, dict(ROW)])
+    assert df["Result"].tolist() == ["created", "invalid"]
+    assert df["Error"].iloc[1] == "Duplicate row"
+
+
+def test_existing_folder_without_marker_is_untouched(settings):
+    legacy = settings.assets_path / FOLDER
+    legacy.mkdir()
+    (legacy / "notes.txt").write_text("legacy")
+
+    df = create_assets_bulk(settings, [ROW])
+    assert df["Result"].tolist() == ["exists"]
+    assert sorted(p.name for p in legacy.iterdir()) == ["notes.txt"]
+
+
+def test_interrupted_creation_is_completed(settings):
+    partial = settings.assets_path / FOLDER
+    (partial / "01_PIPELINE").mkdir(parents=True)
+    (partial / CREATION_MARKER).touch()
+
+    df = create_assets_bulk(settings, [ROW])
+    assert df["Result"].tolist() == ["created"]
+    assert (partial / "01_PIPELINE" / "Reports" / "checklist.txt").exists()
+    assert (partial / PIPELINE_STATUS_FILE).exists()
+    assert not (partial / CREATION_MARKER).exists()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from tools.naming import _parse_with_arrow, _parse_with_pandas
+
+NAMES = pd.Series(
+    [
+        "AEN_PV025_PF_REP_Site-Study_20240115_v03_FINAL.pdf",
+        "AEN_PV025_PF_REP_Site-Study_20240115_v999_FINAL.pdf",
+        "AEN_PV025_PF_REP_Site-Study_20240115_v99999_FINAL.pdf",
+        "AEN_PV025_PF_REP_Site-Study_20240115_v99999999999999999999_FINAL.pdf",
+        "notes.txt",
+    ],
+    dtype="string",
+)
+
+
+def _parsers():
+    yield _parse_with_pandas
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.compute as pc
+
+    yield lambda names: _parse_with_arrow(names, pa, pc)
+
+
+@pytest.mark.parametrize("parse", list(_parsers()), ids=["pandas", "arrow"])
+def test_out_of_range_version_is_null(parse):
+    parsed = parse(NAMES)
+    assert parsed["Version_Number"].tolist() == [3, 999, pd.NA, pd.NA, pd.NA]
+    assert parsed["Version"].iloc[2] == "v99999"
+    assert parsed["Convention_Valid"].tolist() == [True, True, True, True, False]
+
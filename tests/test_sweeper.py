@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+import tools.sweeper as sweeper
+from tools.lifecycle_ops import lock_read_only
+from tools.scanner import SUPERSEDED_DIR
+from tools.settings import Settings
+
+ASSET = "AEN_PV025_Sunfield_Spain"
+
+
+def _doc(description, version, status="DRAFT"):
+    return f"AEN_PV025_PF_REP_{description}_20240115_v{version:02d}_{status}.pdf"
+
+
+@pytest.fixture
+def settings(tmp_path):
+    (tmp_path / "ASSETS").mkdir()
+    return Settings(
+        fileserver_root=tmp_path, default_export_dir=tmp_path / "reports", scan_workers=1
+    )
+
+
+def _write(settings, folder, names):
+    path = settings.assets_path / ASSET / folder
+    path.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (path / name).write_bytes(b"x")
+    return path
+
+
+def test_plan_keeps_latest_and_protected_documents(settings):
+    _write(
+        settings,
+        "01_PIPELINE",
+        [_doc("Study", 1), _doc("Study", 2), _doc("Study", 3)]
+        + [_doc("Permit", 1), _doc("Permit", 2, "APPROVED")]
+        + ["notes.txt"],
+    )
+    plan = sweeper.plan_superseded_sweep(settings)
+    assert sorted(plan["Filename"]) == [_doc("Study", 1), _doc("Study", 2)]
+    assert set(plan["Latest_Version"]) == {3}
+
+    plan = sweeper.plan_superseded_sweep(settings, keep_latest=2)
+    assert plan["Filename"].tolist() == [_doc("Study", 1)]
+
+
+def test_locked_folders_are_skipped(settings):
+    open_folder = _write(settings, "01_PIPELINE", [_doc("Study", 1), _doc("Study", 2)])
+    locked = _write(settings, "02_DEVELOPMENT", [_doc("Layout", 1), _doc("Layout", 2)])
+    lock_read_only(locked)
+
+    result = sweeper.sweep_superseded_versions(settings, dry_run=False)
+    assert result["Folder"].tolist() == ["01_PIPELINE"]
+    assert result["Result"].tolist() == ["moved"]
+    assert (open_folder / SUPERSEDED_DIR / _doc("Study", 1)).exists()
+    assert sorted(p.name for p in locked.iterdir()) == [_doc("Layout", 1), _doc("Layout", 2)]
+
+
+def test_batches_never_split_a_folder(settings, monkeypatch):
+    # Folders with 1, 1 and 5 superseded files
+    _write(settings, "A", [_doc("Study", 1), _doc("Study", 2)])
+    _write(settings, "B", [_doc("Study", 1), _doc("Study", 2)])
+    _write(settings, "C", [_doc("Study", v) for v in range(1, 7)])
+    batches = []
+    move_batch = sweeper._move_batch
+
+    def recording(assets_path, batch):
+        batches.append(sorted(set(batch["Folder"])))
+        return move_batch(assets_path, batch)
+
+    monkeypatch.setattr(sweeper, "_move_batch", recording)
+    result = sweeper.sweep_superseded_versions(settings, dry_run=False, batch_size=2)
+    assert batches == [["A", "B"], ["C"]]
+    assert (result["Result"] == "moved").all()
+    assert len(result) == 7
+
+
+def test_dry_run_and_max_files_move_nothing_extra(settings):
+    folder = _write(settings, "01_PIPELINE", [_doc("Study", v) for v in range(1, 5)])
+
+    plan = sweeper.sweep_superseded_versions(settings)
+    assert plan["Result"].tolist() == ["planned"] * 3
+    assert not (folder / SUPERSEDED_DIR).exists()
+
+    result = sweeper.sweep_superseded_versions(settings, dry_run=False, max_files=2)
+    assert result["Result"].tolist() == ["moved", "moved"]
+    assert len(list((folder / SUPERSEDED_DIR).iterdir())) == 2
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import errno
+import os
+
+import pytest
+
+from tools.transfer import TransferJournal, copy_tree, move_tree
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _make_tree(root):
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "one.txt").write_bytes(b"1" * 100)
+    (root / "a" / "two.txt").write_bytes(b"2" * 200)
+    (root / "a" / "b" / "big.bin").write_bytes(os.urandom(10_000))
+    return root
+
+
+def _contents(root):
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file() and not p.is_symlink()
+    }
+
+
+def _stop_after(n):
+    def progress(stats):
+        if stats.files_done >= n:
+            raise Interrupted
+
+    return progress
+
+
+def test_copy_tree_resumes_from_journal(tmp_path):
+    src = _make_tree(tmp_path / "src")
+    dst = tmp_path / "dst"
+    journal = TransferJournal.for_destination(dst)
+
+    with pytest.raises(Interrupted):
+        copy_tree(src, dst, workers=1, chunk_size=4096, progress=_stop_after(1), journal=journal)
+    journal.close()
+    assert len(TransferJournal.for_destination(dst)) == 1
+
+    journal = TransferJournal.for_destination(dst)
+    stats = copy_tree(src, dst, workers=1, chunk_size=4096, journal=journal)
+    assert stats.files_skipped == 1
+    assert stats.files_done == stats.total_files == 3
+    assert _contents(dst) == _contents(src)
+
+
+def test_copy_tree_recopies_changed_file(tmp_path):
+    src = _make_tree(tmp_path / "src")
+    dst = tmp_path / "dst"
+    journal = TransferJournal.for_destination(dst)
+    copy_tree(src, dst, journal=journal)
+    journal.close()
+
+    (src / "one.txt").write_bytes(b"changed")
+    stats = copy_tree(src, dst, journal=TransferJournal.for_destination(dst))
+    assert stats.files_skipped == 2
+    assert (dst / "one.txt").read_bytes() == b"changed"
+
+
+def test_move_tree_resumes_across_volumes(tmp_path, monkeypatch):
+    def cross_device(_src, _dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "rename", cross_device)
+    src = _make_tree(tmp_path / "src")
+    expected = _contents(src)
+    dst = tmp_path / "moved" / "dst"
+
+    with pytest.raises(Interrupted):
+        move_tree(src, dst, workers=1, progress=_stop_after(2))
+    assert src.exists()
+    assert TransferJournal.for_destination(dst).path.exists()
+
+    stats = move_tree(src, dst, workers=1)
+    assert stats.files_skipped == 2
+    assert not src.exists()
+    assert not TransferJournal.for_destination(dst).path.exists()
+    assert _contents(dst) == expected
+
+
+def test_move_tree_refuses_existing_destination(tmp_path):
+    src = _make_tree(tmp_path / "src")
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    with pytest.raises(FileExistsError):
+        move_tree(src, dst)
+
+
+def test_copy_tree_recreates_symlinks(tmp_path):
+    src = _make_tree(tmp_path / "src")
+    os.symlink("one.txt", src / "link.txt")
+    os.symlink("a", src / "dir_link", target_is_directory=True)
+    os.symlink("missing", src / "dangling")
+    dst = tmp_path / "dst"
+
+    stats = copy_tree(src, dst)
+    assert stats.total_files == 3
+    for name, target in [("link.txt", "one.txt"), ("dir_link", "a"), ("dangling", "missing")]:
+        assert (dst / name).is_symlink()
+        assert os.readlink(dst / name) == target
+    assert sorted(p.name for p in dst.iterdir()) == [
+        "a",
+        "dangling",
+        "dir_link",
+        "link.txt",
+        "one.txt",
+    ]
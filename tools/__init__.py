@@ -1,22 +1,44 @@
-# update __init__.py to include the new functions in lifecycle_ops.py
-
-from .lifecycle_ops import (
-    load_settings,
-    get_current_phase,
-    list_assets,
-    copy_asset,
-    move_asset,
-    delete_asset,
-    generate_asset_report,
-    create_fileserver_structure
-)
-__all__ = [
-    "load_settings",
-    "get_current_phase",
-    "list_assets",
-    "copy_asset",
-    "move_asset",
-    "delete_asset",
-    "generate_asset_report",
-    "create_fileserver_structure"
-]   
\ No newline at end of file
+"""
+Asset lifecycle file server tools.
+
+The public functions are imported from their modules on first access, so
+`import tools` and `python -m tools` do not load pandas, openpyxl or
+matplotlib until a function that needs them is used.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+# Public name -> module defining it
+_EXPORTS = {
+    "Settings": "settings",
+    "load_settings": "settings",
+    "get_current_phase": "lifecycle_ops",
+    "list_assets": "lifecycle_ops",
+    "discover_all_assets": "lifecycle_ops",
+    "copy_asset": "lifecycle_ops",
+    "move_asset": "lifecycle_ops",
+    "archive_asset": "lifecycle_ops",
+    "delete_asset": "lifecycle_ops",
+    "list_archived_assets": "lifecycle_ops",
+    "pack_archived_asset": "archiver",
+    "unpack_archived_asset": "archiver",
+    "create_fileserver_structure": "lifecycle_ops",
+    "generate_asset_report": "reports",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
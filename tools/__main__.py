@@ -0,0 +1,160 @@
+"""
+Command line entry point for the everyday file server tasks.
+
+    python -m tools phase [ASSET ...]
+    python -m tools scan [--cache] [--json]
+    python -m tools register ASSET
+    python -m tools sweep [--apply] [--keep-latest N] [--max-files N]
+    python -m tools report [ASSET] [--out PATH]
+
+phase and scan only use the standard library, so they start in well under
+100 ms and suit scheduled tasks; pandas and the Excel writers are imported
+by the commands that need them (see tools.benchmark --startup).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import json
+import sys
+
+from .settings import Settings, load_settings
+
+
+def _phase(settings: Settings, args: argparse.Namespace) -> int:
+    from .scanner import list_asset_folders
+    from .status import current_status
+
+    if args.assets:
+        folders = [settings.assets_path / name for name in args.assets]
+    else:
+        folders = list_asset_folders(settings.assets_path)
+    missing = 0
+    for folder in folders:
+        if not folder.is_dir():
+            print(f"{folder.name}\tnot found", file=sys.stderr)
+            missing += 1
+            continue
+        record = current_status(folder)
+        if record is None:
+            print(f"{folder.name}\t00\tNo status file")
+            continue
+        days = record.days_in_phase()
+        print(
+            f"{folder.name}\t{record.phase}\t{record.phase_name}"
+            f"\t{'' if days is None else f'{days} days'}"
+        )
+    return 1 if missing else 0
+
+
+def _scan(settings: Settings, args: argparse.Namespace) -> int:
+    from .scanner import scan_portfolio
+
+    workers = args.workers or settings.scan_workers
+    if args.cache:
+        from .scan_cache import ScanCache
+
+        with ScanCache(settings.scan_cache_path) as cache:
+            scans = scan_portfolio(settings.assets_path, max_workers=workers, cache=cache)
+    else:
+        scans = scan_portfolio(settings.assets_path, max_workers=workers)
+
+    if args.json:
+        rows = [
+            {
+                "asset": s.asset,
+                "phase": s.phase,
+                "file_count": s.file_count,
+                "total_size_mb": s.total_size_mb,
+                "last_modified": s.last_modified,
+            }
+            for s in scans
+        ]
+        print(json.dumps(rows, indent=1))
+        return 0
+    for s in scans:
+        print(f"{s.asset:<50} {s.phase}  {s.file_count:>8} files  {s.total_size_mb:>10.2f} MB")
+    total_mb = sum(s.total_size_bytes for s in scans) / (1024 * 1024)
+    print(f"{len(scans)} assets, {sum(s.file_count for s in scans)} files, {total_mb:.2f} MB")
+    return 0
+
+
+def _register(settings: Settings, args: argparse.Namespace) -> int:
+    from .documents import generate_document_register
+
+    df = generate_document_register(settings, args.asset, output_file=args.out)
+    return 0 if len(df) else 1
+
+
+def _sweep(settings: Settings, args: argparse.Namespace) -> int:
+    from .sweeper import sweep_superseded_versions
+
+    result = sweep_superseded_versions(
+        settings,
+        keep_latest=args.keep_latest,
+        dry_run=not args.apply,
+        max_files=args.max_files,
+    )
+    return 1 if (result["Result"] == "failed").any() else 0
+
+
+def _report(settings: Settings, args: argparse.Namespace) -> int:
+    if args.asset:
+        from .reports import generate_asset_report
+
+        return 0 if generate_asset_report(settings, args.asset, args.out) else 1
+
+    from datetime import datetime
+
+    from .lifecycle_ops import discover_all_assets
+    from .reports import export_portfolio_report
+
+    out = args.out or settings.default_export_dir / (
+        f"Portfolio_Report_{datetime.now():%Y%m%d}.xlsx"
+    )
+    export_portfolio_report(
+        discover_all_assets(settings), out, max_sheet_rows=settings.report_max_sheet_rows
+    )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools", description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("--env", type=Path, default=Path(".env"), help="settings file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    phase = commands.add_parser("phase", help="current lifecycle phase of assets")
+    phase.add_argument("assets", nargs="*", metavar="ASSET", help="default: all assets")
+    phase.set_defaults(run=_phase)
+
+    scan = commands.add_parser("scan", help="file count and size per asset")
+    scan.add_argument("--cache", action="store_true", help="use the incremental scan cache")
+    scan.add_argument("--workers", type=int)
+    scan.add_argument("--json", action="store_true")
+    scan.set_defaults(run=_scan)
+
+    register = commands.add_parser("register", help="document register of one asset")
+    register.add_argument("asset", metavar="ASSET")
+    register.add_argument("--out", type=Path, help="CSV path")
+    register.set_defaults(run=_register)
+
+    sweep = commands.add_parser("sweep", help="move superseded versions to _SUPERSEDED")
+    sweep.add_argument("--apply", action="store_true", help="move files (default: dry run)")
+    sweep.add_argument("--keep-latest", type=int, default=1)
+    sweep.add_argument("--max-files", type=int)
+    sweep.set_defaults(run=_sweep)
+
+    report = commands.add_parser("report", help="portfolio or single-asset Excel report")
+    report.add_argument("asset", nargs="?", metavar="ASSET", help="default: whole portfolio")
+    report.add_argument("--out", type=Path, help="xlsx path")
+    report.set_defaults(run=_report)
+
+    args = parser.parse_args(argv)
+    return args.run(load_settings(args.env), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
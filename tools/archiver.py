@@ -0,0 +1,715 @@
+"""
+Packed archive containers for retired assets in ARCHIVE\\[YEAR].
+
+An archived asset folder is packed into one file, <folder>.zpack, next to
+where the folder was:
+
+    LCPACK01 | block 0 | block 1 | ... | index | trailer
+
+The contents of all files, in path order, form one byte stream that is cut
+into blocks of block_size bytes and compressed with zstd in parallel. The
+index at the end (itself zstd-compressed JSON) lists the blocks and, for
+every file, its offset in the stream, size, mtime, mode and SHA-256, plus
+every directory so that empty lifecycle folders survive the round trip.
+Listing a pack reads only the trailer and the index; extracting one
+document decompresses only the blocks it spans.
+
+    python -m tools.archiver pack --all             (pack every archived folder)
+    python -m tools.archiver list
+    python -m tools.archiver extract ARCHIVE\\2024\\X_[SOLD].zpack "01_PREFEASIBILITY/*.pdf"
+    python -m tools.archiver unpack X_[SOLD]         (restore the folder)
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from fnmatch import fnmatchcase
+from pathlib import Path
+from threading import Lock
+from typing import IO, Iterator
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import stat
+import struct
+import sys
+import time
+
+import pyarrow as pa
+
+from .instrumentation import add_counter, instrumented
+from .settings import Settings, load_settings
+from .transfer import remove_tree
+
+PACK_SUFFIX = ".zpack"
+MAGIC = b"LCPACK01"
+TRAILER_MAGIC = b"LCPACKIX"
+# index offset, compressed index size, raw index size, magic
+_TRAILER = struct.Struct("<QQQ8s")
+FORMAT_VERSION = 1
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_LEVEL = 9
+DEFAULT_PACK_WORKERS = os.cpu_count() or 4
+_READ_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """A file inside a pack; offset is its position in the uncompressed stream."""
+
+    path: str
+    offset: int
+    size: int
+    mtime_ns: int
+    mode: int
+    sha256: str
+
+
+@dataclass
+class PackStats:
+    """Outcome of packing, unpacking or verifying a pack."""
+
+    files: int = 0
+    dirs: int = 0
+    raw_bytes: int = 0
+    packed_bytes: int = 0
+    blocks: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def ratio(self) -> float:
+        """Packed size as a fraction of the original size."""
+        return self.packed_bytes / self.raw_bytes if self.raw_bytes else 1.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.files} files, {self.raw_bytes / 1024**2:.1f} MB -> "
+            f"{self.packed_bytes / 1024**2:.1f} MB ({self.ratio:.1%}) "
+            f"in {self.blocks} blocks, {self.seconds:.1f}s"
+        )
+
+
+def _codec(level: int | None = None) -> pa.Codec:
+    return pa.Codec("zstd", compression_level=level)
+
+
+def _walk(
+    src: Path,
+) -> tuple[list[tuple[str, int, int]], list[tuple[str, int, int, int]], list[str]]:
+    """
+    Directories as (rel, mode, mtime_ns), files as (rel, size, mtime_ns,
+    mode) and the other entries a pack cannot hold (symlinks, devices,
+    pipes) below src, sorted by path; rel uses "/" separators.
+    """
+    dirs: list[tuple[str, int, int]] = []
+    files: list[tuple[str, int, int, int]] = []
+    other: list[str] = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(src / rel_dir if rel_dir else src) as it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                st = entry.stat(follow_symlinks=False)
+                if stat.S_ISDIR(st.st_mode):
+                    dirs.append((rel, stat.S_IMODE(st.st_mode), st.st_mtime_ns))
+                    stack.append(rel)
+                elif stat.S_ISREG(st.st_mode):
+                    files.append((rel, st.st_size, st.st_mtime_ns, stat.S_IMODE(st.st_mode)))
+                else:
+                    other.append(rel)
+    dirs.sort()
+    files.sort()
+    other.sort()
+    return dirs, files, other
+
+
+def pack_folder(
+    src: Path,
+    dst: Path,
+    workers: int = DEFAULT_PACK_WORKERS,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    level: int = DEFAULT_LEVEL,
+) -> PackStats:
+    """
+    Pack the folder src into the container file dst (which must not exist).
+    Raises ValueError if src holds anything but regular files and folders,
+    e.g. symlinks, since the pack could not restore it.
+
+    Files are read sequentially and the blocks compressed by a pool of
+    workers, at most two blocks per worker in flight. The pack is written
+    to a .partial file and renamed into place once complete.
+
+    Returns:
+        PackStats with the original and packed sizes
+    """
+    if dst.exists():
+        raise FileExistsError(dst)
+    stats = PackStats()
+    dirs, planned, other = _walk(src)
+    if other:
+        raise ValueError(
+            f"Cannot pack {src}: {len(other)} entries are not regular files or folders, "
+            f"e.g. {', '.join(other[:5])}"
+        )
+    codec = _codec(level)
+    blocks: list[tuple[int, int, int]] = []
+    members: list[list] = []
+    tmp = dst.with_name(dst.name + ".partial")
+    dst.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with open(tmp, "wb") as out, ThreadPoolExecutor(max(1, workers)) as pool:
+            out.write(MAGIC)
+            pending: deque = deque()
+
+            def write_block() -> None:
+                future, raw_len = pending.popleft()
+                data = future.result()
+                blocks.append((out.tell(), len(data), raw_len))
+                out.write(data)
+
+            def submit(block: bytes) -> None:
+                pending.append((pool.submit(codec.compress, block, asbytes=True), len(block)))
+                while len(pending) > 2 * workers:
+                    write_block()
+
+            buf = bytearray()
+            offset = 0
+            for rel, _, mtime_ns, mode in planned:
+                digest = hashlib.sha256()
+                size = 0
+                with open(src / rel, "rb") as f:
+                    while chunk := f.read(min(_READ_SIZE, block_size - len(buf))):
+                        digest.update(chunk)
+                        buf += chunk
+                        size += len(chunk)
+                        if len(buf) >= block_size:
+                            submit(bytes(buf))
+                            buf.clear()
+                # Size as read, in case the file changed since the walk
+                members.append([rel, offset, size, mtime_ns, mode, digest.hexdigest()])
+                offset += size
+            if buf:
+                submit(bytes(buf))
+            while pending:
+                write_block()
+
+            index = json.dumps(
+                {
+                    "version": FORMAT_VERSION,
+                    "source": src.name,
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "block_size": block_size,
+                    "blocks": blocks,
+                    "dirs": dirs,
+                    "files": members,
+                },
+                separators=(",", ":"),
+            ).encode("utf-8")
+            packed_index = codec.compress(index, asbytes=True)
+            index_offset = out.tell()
+            out.write(packed_index)
+            out.write(_TRAILER.pack(index_offset, len(packed_index), len(index), TRAILER_MAGIC))
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, dst)
+
+    stats.files = len(members)
+    stats.dirs = len(dirs)
+    stats.raw_bytes = offset
+    stats.packed_bytes = dst.stat().st_size
+    stats.blocks = len(blocks)
+    stats.finished = time.perf_counter()
+    return stats
+
+
+class PackedArchive:
+    """
+    Read access to a pack: list members, read or extract single documents,
+    restore the whole folder or verify every checksum.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._lock = Lock()
+        self._cached: tuple[int, bytes] | None = None
+        try:
+            self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_index(self) -> None:
+        f = self._file
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        f.seek(0)
+        if end < len(MAGIC) + _TRAILER.size or f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a packed archive: {self.path}")
+        f.seek(end - _TRAILER.size)
+        index_offset, index_clen, index_rlen, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            raise ValueError(f"Packed archive is truncated: {self.path}")
+        f.seek(index_offset)
+        index = json.loads(
+            _codec().decompress(f.read(index_clen), decompressed_size=index_rlen, asbytes=True)
+        )
+        if index["version"] > FORMAT_VERSION:
+            raise ValueError(f"Unsupported pack version {index['version']}: {self.path}")
+        self.source: str = index["source"]
+        self.created: str = index["created"]
+        self.packed_size = end
+        self._blocks: list[tuple[int, int, int]] = [tuple(b) for b in index["blocks"]]
+        self._dirs: list[tuple[str, int, int]] = [tuple(d) for d in index["dirs"]]
+        self._members = {row[0]: ArchiveMember(*row) for row in index["files"]}
+        for name in [*self._members, *(d[0] for d in self._dirs)]:
+            if name.startswith("/") or ".." in name.split("/"):
+                raise ValueError(f"Unsafe path {name!r} in {self.path}")
+        # Stream offset at which each block starts
+        self._starts: list[int] = []
+        position = 0
+        for _, _, raw_len in self._blocks:
+            self._starts.append(position)
+            position += raw_len
+        self.total_size = position
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> PackedArchive:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def members(self, pattern: str | None = None) -> list[ArchiveMember]:
+        """Members in stream order, optionally only those matching a glob pattern."""
+        return [
+            m for m in self._members.values() if pattern is None or fnmatchcase(m.path, pattern)
+        ]
+
+    def _read_block(self, i: int) -> bytes:
+        offset, clen, _ = self._blocks[i]
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(clen)
+
+    def _block(self, i: int) -> bytes:
+        cached = self._cached
+        if cached is not None and cached[0] == i:
+            return cached[1]
+        data = _codec().decompress(
+            self._read_block(i), decompressed_size=self._blocks[i][2], asbytes=True
+        )
+        self._cached = (i, data)
+        return data
+
+    def read(self, name: str) -> bytes:
+        """Contents of one member, checked against its SHA-256."""
+        member = self._members.get(name)
+        if member is None:
+            raise FileNotFoundError(f"{name} not in {self.path}")
+        parts = []
+        end = member.offset + member.size
+        i = bisect.bisect_right(self._starts, member.offset) - 1
+        while member.size and i < len(self._blocks) and self._starts[i] < end:
+            start = self._starts[i]
+            data = self._block(i)
+            parts.append(data[max(member.offset - start, 0) : end - start])
+            i += 1
+        content = b"".join(parts)
+        if hashlib.sha256(content).hexdigest() != member.sha256:
+            raise OSError(f"Checksum mismatch for {name} in {self.path}")
+        return content
+
+    def extract(self, name: str, dest_dir: Path) -> Path:
+        """Write one member below dest_dir, keeping its relative path and mtime."""
+        member = self._members.get(name)
+        if member is None:
+            raise FileNotFoundError(f"{name} not in {self.path}")
+        target = dest_dir.joinpath(*name.split("/"))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(self.read(name))
+        os.utime(target, ns=(member.mtime_ns, member.mtime_ns))
+        return target
+
+    def _iter_blocks(self, workers: int) -> Iterator[tuple[int, bytes]]:
+        """(stream offset, data) of every block, decompressed ahead in parallel."""
+        codec = _codec()
+        with ThreadPoolExecutor(max(1, workers)) as pool:
+            pending: deque = deque()
+            for i, (_, _, raw_len) in enumerate(self._blocks):
+                future = pool.submit(
+                    codec.decompress, self._read_block(i), decompressed_size=raw_len, asbytes=True
+                )
+                pending.append((self._starts[i], future))
+                if len(pending) > 2 * workers:
+                    start, future = pending.popleft()
+                    yield start, future.result()
+            while pending:
+                start, future = pending.popleft()
+                yield start, future.result()
+
+    def _iter_contents(self, workers: int) -> Iterator[tuple[ArchiveMember, memoryview, bool]]:
+        """(member, piece, is_last_piece) over all members in stream order."""
+        members = list(self._members.values())
+        k = 0
+        for start, data in self._iter_blocks(workers):
+            view = memoryview(data)
+            block_end = start + len(data)
+            while k < len(members):
+                m = members[k]
+                m_end = m.offset + m.size
+                lo, hi = max(m.offset, start), min(m_end, block_end)
+                last = m_end <= block_end
+                if hi > lo or last:
+                    yield m, view[lo - start : max(hi, lo) - start], last
+                if not last:
+                    break
+                k += 1
+        # Empty files after the last block (or in a pack without blocks)
+        for m in members[k:]:
+            yield m, memoryview(b""), True
+
+    def verify(self, workers: int = DEFAULT_PACK_WORKERS) -> PackStats:
+        """Decompress every block and check every member's SHA-256."""
+        stats = PackStats(dirs=len(self._dirs), packed_bytes=self.packed_size)
+        stats.blocks = len(self._blocks)
+        digest = hashlib.sha256()
+        for member, piece, last in self._iter_contents(workers):
+            digest.update(piece)
+            if last:
+                if digest.hexdigest() != member.sha256:
+                    raise OSError(f"Checksum mismatch for {member.path} in {self.path}")
+                digest = hashlib.sha256()
+                stats.files += 1
+                stats.raw_bytes += member.size
+        stats.finished = time.perf_counter()
+        return stats
+
+    def extract_all(self, dest: Path, workers: int = DEFAULT_PACK_WORKERS) -> PackStats:
+        """
+        Restore the packed folder as dest (which must not exist).
+
+        Files are written into a hidden sibling directory and checked
+        against their SHA-256 as they are written; modes and mtimes of files
+        and directories are restored, and the directory is renamed to dest
+        only when everything matched.
+        """
+        if dest.exists():
+            raise FileExistsError(dest)
+        tmp = dest.with_name(f".{dest.name}.unpacking")
+        if tmp.exists():
+            remove_tree(tmp)
+        tmp.mkdir(parents=True)
+        stats = PackStats(dirs=len(self._dirs), packed_bytes=self.packed_size)
+        stats.blocks = len(self._blocks)
+        out: IO[bytes] | None = None
+        try:
+            for rel, _, _ in self._dirs:
+                tmp.joinpath(*rel.split("/")).mkdir(exist_ok=True)
+            digest = hashlib.sha256()
+            for member, piece, last in self._iter_contents(workers):
+                if out is None:
+                    out = open(tmp.joinpath(*member.path.split("/")), "wb")
+                out.write(piece)
+                digest.update(piece)
+                if last:
+                    out.close()
+                    out = None
+                    if digest.hexdigest() != member.sha256:
+                        raise OSError(f"Checksum mismatch for {member.path} in {self.path}")
+                    digest = hashlib.sha256()
+                    target = tmp.joinpath(*member.path.split("/"))
+                    os.utime(target, ns=(member.mtime_ns, member.mtime_ns))
+                    os.chmod(target, member.mode)
+                    stats.files += 1
+                    stats.raw_bytes += member.size
+            # Deepest first, so that read-only parents are set after their children
+            for rel, mode, mtime_ns in reversed(self._dirs):
+                path = tmp.joinpath(*rel.split("/"))
+                os.utime(path, ns=(mtime_ns, mtime_ns))
+                os.chmod(path, mode)
+        except BaseException:
+            if out is not None:
+                out.close()
+            remove_tree(tmp)
+            raise
+        os.rename(tmp, dest)
+        stats.finished = time.perf_counter()
+        return stats
+
+
+def _same_tree(src: Path, archive: PackedArchive) -> bool:
+    """
+    True if src still holds exactly the folders, and the files with the
+    sizes and mtimes, recorded in the pack.
+    """
+    dirs, files, other = _walk(src)
+    packed = {(m.path, m.size, m.mtime_ns) for m in archive.members()}
+    return (
+        not other
+        and [d[0] for d in dirs] == [d[0] for d in archive._dirs]
+        and len(files) == len(packed)
+        and all((r, s, t) in packed for r, s, t, _ in files)
+    )
+
+
+def pack_path(folder: Path) -> Path:
+    """Container file that replaces an archived folder."""
+    return folder.with_name(folder.name + PACK_SUFFIX)
+
+
+def find_archived(settings: Settings, name: str, year: int | str | None = None) -> Path:
+    """
+    Path of an archived asset, as a folder or a pack, below ARCHIVE\\[YEAR].
+
+    name is the folder name including its [REASON] suffix; the .zpack
+    suffix is optional. Without year, all year folders are searched.
+    """
+    name = name.removesuffix(PACK_SUFFIX)
+    years = [settings.archive_path / str(year)] if year else sorted(
+        (p for p in settings.archive_path.iterdir() if p.is_dir()), reverse=True
+    )
+    for year_dir in years:
+        for candidate in (year_dir / name, year_dir / (name + PACK_SUFFIX)):
+            if candidate.exists():
+                return candidate
+    raise FileNotFoundError(f"Archived asset not found: {name}")
+
+
+@instrumented
+def pack_archived_asset(
+    settings: Settings,
+    archived_folder: str,
+    year: int | str | None = None,
+    workers: int = DEFAULT_PACK_WORKERS,
+    keep_folder: bool = False,
+) -> PackStats:
+    """
+    Pack one asset folder in ARCHIVE\\[YEAR] into <folder>.zpack.
+
+    Args:
+        settings: Settings object containing the archive_path configuration
+        archived_folder: Folder name including its [REASON] suffix
+        year: Archive year; default: search all year folders
+        workers: Concurrent block compressions
+        keep_folder: Keep the folder after packing (default: remove it)
+
+    Returns:
+        PackStats with the original and packed sizes
+
+    The folder is only removed after the pack has been read back, every
+    checksum matched, and the folder was found unchanged since it was packed.
+    A folder holding symlinks or other entries that a pack cannot restore
+    raises ValueError and is kept as it is.
+    """
+    src = find_archived(settings, archived_folder, year)
+    if not src.is_dir():
+        raise FileExistsError(f"Already packed: {src}")
+    dst = pack_path(src)
+    stats = pack_folder(src, dst, workers=workers)
+    try:
+        with PackedArchive(dst) as archive:
+            archive.verify(workers)
+            unchanged = _same_tree(src, archive)
+    except BaseException:
+        dst.unlink(missing_ok=True)
+        raise
+    if not unchanged:
+        dst.unlink()
+        raise OSError(f"{src} changed while it was packed; the folder was kept")
+    if not keep_folder:
+        remove_tree(src)
+    add_counter("bytes_packed", stats.raw_bytes)
+    print(f"Packed {src.name}: {stats.summary()}")
+    return stats
+
+
+@instrumented
+def pack_archive(
+    settings: Settings, year: int | str | None = None, workers: int = DEFAULT_PACK_WORKERS
+) -> list[PackStats]:
+    """Pack every archived asset folder (of one year, or all years) that is not packed yet."""
+    years = [settings.archive_path / str(year)] if year else sorted(
+        p for p in settings.archive_path.iterdir() if p.is_dir()
+    )
+    results = []
+    for year_dir in years:
+        for folder in sorted(year_dir.iterdir()):
+            if folder.is_dir() and folder.name.endswith("]") and "_[" in folder.name:
+                results.append(
+                    pack_archived_asset(settings, folder.name, year_dir.name, workers=workers)
+                )
+    return results
+
+
+@instrumented
+def unpack_archived_asset(
+    settings: Settings,
+    archived_asset: str,
+    year: int | str | None = None,
+    dest_dir: Path | None = None,
+    workers: int = DEFAULT_PACK_WORKERS,
+    keep_pack: bool = True,
+) -> PackStats:
+    """
+    Restore a packed asset as a folder, in its ARCHIVE year folder or dest_dir.
+
+    Every file is checked against its SHA-256 as it is written; with
+    keep_pack=False the pack is deleted once the folder is complete.
+    """
+    src = find_archived(settings, archived_asset, year)
+    if src.is_dir():
+        raise FileExistsError(f"Not packed: {src}")
+    dest = (dest_dir or src.parent) / src.name.removesuffix(PACK_SUFFIX)
+    with PackedArchive(src) as archive:
+        stats = archive.extract_all(dest, workers)
+    if not keep_pack:
+        src.unlink()
+    print(f"Unpacked {src.name} to {dest}: {stats.summary()}")
+    return stats
+
+
+def archived_asset_rows(settings: Settings) -> list[dict]:
+    """
+    One row per archived asset, folder or pack. Packs are summarised from
+    their index alone; folders still need a full walk.
+    """
+    from .scanner import scan_asset
+
+    if not settings.archive_path.is_dir():
+        return []
+    rows = []
+    for year_dir in sorted(p for p in settings.archive_path.iterdir() if p.is_dir()):
+        for path in sorted(year_dir.iterdir()):
+            if path.is_dir():
+                scan = scan_asset(path)
+                name, files, size, packed = path.name, scan.file_count, scan.total_size_bytes, None
+            elif path.name.endswith(PACK_SUFFIX):
+                with PackedArchive(path) as archive:
+                    name, files, size = archive.source, len(archive), archive.total_size
+                    packed = archive.packed_size
+            else:
+                continue
+            base, _, reason = name.rpartition("_[")
+            rows.append(
+                {
+                    "Archive_Year": year_dir.name,
+                    "Asset_Folder": base if reason.endswith("]") else name,
+                    "Reason": reason[:-1] if reason.endswith("]") else None,
+                    "Packed": packed is not None,
+                    "Total_Files": files,
+                    "Total_Size_MB": round(size / (1024 * 1024), 2),
+                    "Packed_Size_MB": None if packed is None else round(packed / (1024 * 1024), 2),
+                    "Path": str(path),
+                }
+            )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.archiver", description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("--env", type=Path, default=Path(".env"), help="settings file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_PACK_WORKERS)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack = commands.add_parser("pack", help="pack archived asset folders")
+    pack.add_argument("assets", nargs="*", metavar="ASSET", help="folder names with [REASON]")
+    pack.add_argument("--all", action="store_true", help="every folder not packed yet")
+    pack.add_argument("--year")
+    pack.add_argument("--keep-folder", action="store_true")
+
+    unpack = commands.add_parser("unpack", help="restore packed assets as folders")
+    unpack.add_argument("assets", nargs="+", metavar="ASSET")
+    unpack.add_argument("--year")
+    unpack.add_argument("--dest", type=Path, help="default: next to the pack")
+    unpack.add_argument("--remove-pack", action="store_true")
+
+    commands.add_parser("list", help="archived assets, packed or not")
+
+    ls = commands.add_parser("ls", help="documents in a pack")
+    ls.add_argument("pack", type=Path)
+    ls.add_argument("pattern", nargs="?")
+
+    extract = commands.add_parser("extract", help="extract documents from a pack")
+    extract.add_argument("pack", type=Path)
+    extract.add_argument("patterns", nargs="+", metavar="PATTERN")
+    extract.add_argument("--dest", type=Path, default=Path("."))
+
+    verify = commands.add_parser("verify", help="check every checksum of packs")
+    verify.add_argument("packs", nargs="+", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "ls":
+        with PackedArchive(args.pack) as archive:
+            for m in archive.members(args.pattern):
+                modified = datetime.fromtimestamp(m.mtime_ns / 1e9)
+                print(f"{m.size:>12}  {modified:%Y-%m-%d %H:%M}  {m.path}")
+        return 0
+    if args.command == "extract":
+        with PackedArchive(args.pack) as archive:
+            names = {m.path for p in args.patterns for m in archive.members(p)}
+            for name in sorted(names):
+                print(archive.extract(name, args.dest))
+        return 0 if names else 1
+    if args.command == "verify":
+        for path in args.packs:
+            with PackedArchive(path) as archive:
+                print(f"{path.name}: OK, {archive.verify(args.workers).summary()}")
+        return 0
+
+    settings = load_settings(args.env)
+    if args.command == "pack":
+        if args.all:
+            pack_archive(settings, args.year, workers=args.workers)
+        for name in args.assets:
+            pack_archived_asset(
+                settings, name, args.year, workers=args.workers, keep_folder=args.keep_folder
+            )
+    elif args.command == "unpack":
+        for name in args.assets:
+            unpack_archived_asset(
+                settings,
+                name,
+                args.year,
+                dest_dir=args.dest,
+                workers=args.workers,
+                keep_pack=not args.remove_pack,
+            )
+    else:
+        for row in archived_asset_rows(settings):
+            kind = "packed" if row["Packed"] else "folder"
+            print(
+                f"{row['Archive_Year']}  {row['Asset_Folder']:<45} {row['Reason'] or '':<15}"
+                f" {kind:<7} {row['Total_Files']:>7} files  {row['Total_Size_MB']:>9.2f} MB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+"""
+Benchmark suite for the scan, register, sweep and report functions.
+
+Generates a synthetic fileserver (see tools.synthetic), runs every case in
+a fresh process and writes the results as JSON:
+
+    python -m tools.benchmark --assets 200 --depth 3 --out bench.json
+    python -m tools.benchmark --assets 200 --depth 3 --compare bench.json
+
+Per case it reports wall time, files/sec, peak RSS and filesystem call
+counts. Call counts come from audit events (open, os.scandir, os.mkdir,
+os.rename, ...) plus os.stat/os.lstat; DirEntry.stat() is answered by the
+C layer and does not show up there. On Linux the kernel's read/write
+syscall counters from /proc/self/io are included as well.
+
+The startup check runs the lightweight `python -m tools` commands (phase
+and scan) in fresh interpreters. It fails when phase takes longer than the
+startup budget or either command imports pandas, numpy, pyarrow or an
+Excel/plotting library:
+
+    python -m tools.benchmark --assets 20 --startup-only
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from threading import Lock
+from typing import Callable
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .lifecycle_ops import Settings
+from .synthetic import SyntheticSpec, generate_fileserver
+
+# Audit events counted as filesystem calls
+COUNTED_EVENTS = {
+    "open",
+    "os.scandir",
+    "os.listdir",
+    "os.mkdir",
+    "os.rename",
+    "os.remove",
+    "os.rmdir",
+    "os.chmod",
+    "os.utime",
+    "os.truncate",
+    "shutil.copyfile",
+    "shutil.copytree",
+    "shutil.move",
+    "shutil.rmtree",
+}
+
+REGRESSION_THRESHOLD = 0.10
+
+# Lightweight CLI commands must start and finish within this budget, measured
+# from the first import of tools to the end of the command
+STARTUP_BUDGET_MS = 100.0
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "openpyxl", "xlsxwriter", "matplotlib")
+_STARTUP_PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+from tools.__main__ import main
+with contextlib.redirect_stdout(io.StringIO()):
+    code = main(sys.argv[1:])
+print(json.dumps({
+    "ms": (time.perf_counter() - start) * 1000,
+    "code": code,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _asset_names(settings: Settings) -> list[str]:
+    from .scanner import list_asset_folders
+
+    return [p.name for p in list_asset_folders(settings.assets_path)]
+
+
+def _bench_list_assets(settings: Settings) -> Callable[[], object]:
+    from .lifecycle_ops import list_assets
+
+    return lambda: list_assets(settings)
+
+
+def _bench_discover_all_assets(settings: Settings) -> Callable[[], object]:
+    from .lifecycle_ops import discover_all_assets
+
+    return lambda: discover_all_assets(settings)
+
+
+def _bench_scan_asset_documents(settings: Settings) -> Callable[[], object]:
+    from .documents import scan_asset_documents
+
+    names = _asset_names(settings)
+    return lambda: [scan_asset_documents(settings, name) for name in names]
+
+
+def _bench_export_portfolio_report(settings: Settings) -> Callable[[], object]:
+    from .lifecycle_ops import discover_all_assets
+    from .reports import export_portfolio_report
+
+    assets_df = discover_all_assets(settings)
+    out = settings.default_export_dir / "benchmark_portfolio_report.xlsx"
+    return lambda: export_portfolio_report(assets_df, out)
+
+
+def _bench_manage_superseded_versions(settings: Settings) -> Callable[[], object]:
+    from .lifecycle_ops import manage_superseded_versions
+
+    targets = []
+    for name in _asset_names(settings):
+        asset_path = settings.assets_path / name
+        for phase in sorted(p for p in os.listdir(asset_path) if (asset_path / p).is_dir()):
+            targets.append((name, phase, None))
+            for sub in sorted(os.listdir(asset_path / phase)):
+                if (asset_path / phase / sub).is_dir():
+                    targets.append((name, phase, sub))
+
+    def run() -> int:
+        return sum(manage_superseded_versions(settings, *target) for target in targets)
+
+    return run
+
+
+def _bench_plan_superseded_sweep(settings: Settings) -> Callable[[], object]:
+    from .sweeper import plan_superseded_sweep
+
+    return lambda: plan_superseded_sweep(settings)
+
+
+# name -> (case factory, mutates the tree). A factory does its untimed setup
+# and returns the callable that is timed. Cases that mutate run once, last.
+BENCHMARKS: dict[str, tuple[Callable[[Settings], Callable[[], object]], bool]] = {
+    "list_assets": (_bench_list_assets, False),
+    "discover_all_assets": (_bench_discover_all_assets, False),
+    "scan_asset_documents": (_bench_scan_asset_documents, False),
+    "export_portfolio_report": (_bench_export_portfolio_report, False),
+    "plan_superseded_sweep": (_bench_plan_superseded_sweep, False),
+    "manage_superseded_versions": (_bench_manage_superseded_versions, True),
+}
+
+
+def _rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _proc_io() -> dict[str, int]:
+    try:
+        with open("/proc/self/io") as f:
+            pairs = (line.split(":") for line in f)
+            return {k: int(v) for k, v in pairs if k in ("syscr", "syscw")}
+    except OSError:
+        return {}
+
+
+def _install_counters() -> Counter:
+    counts: Counter = Counter()
+    lock = Lock()
+
+    def hook(event: str, args: tuple) -> None:
+        if event in COUNTED_EVENTS:
+            with lock:
+                counts[event] += 1
+
+    def counting(name: str, func: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            with lock:
+                counts[name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    sys.addaudithook(hook)
+    os.stat = counting("os.stat", os.stat)
+    os.lstat = counting("os.lstat", os.lstat)
+    return counts
+
+
+def _run_case(name: str, settings: Settings) -> dict:
+    """Run one case in the current (fresh) process and measure it."""
+    factory, _ = BENCHMARKS[name]
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        run = factory(settings)
+        baseline_rss = _rss_mb()
+        counts = _install_counters()
+        io_before = _proc_io()
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        io_after = _proc_io()
+    calls = dict(sorted(counts.items()))
+    calls.update({k: io_after[k] - io_before.get(k, 0) for k in io_after})
+    return {
+        "seconds": seconds,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": _rss_mb(),
+        "syscalls": calls,
+    }
+
+
+def measure_startup(settings: Settings, runs: int = 5) -> dict:
+    """
+    Time the lightweight CLI commands (phase of one asset, scan of the
+    portfolio) in fresh interpreters, without the interpreter's own startup.
+
+    Returns:
+        Dict per command with the median milliseconds and the heavy modules
+        the command imported
+    """
+    package_parent = str(Path(__file__).resolve().parents[1])
+    env = {
+        **os.environ,
+        "FILESERVER_ROOT": str(settings.fileserver_root),
+        "ASSETS_DIR": settings.assets_dir,
+        "DEFAULT_EXPORT_DIR": str(settings.default_export_dir),
+        "PYTHONPATH": os.pathsep.join(filter(None, [package_parent, os.environ.get("PYTHONPATH")])),
+    }
+    commands = {"phase": ["phase", _asset_names(settings)[0]], "scan": ["scan", "--json"]}
+    results = {}
+    for name, args in commands.items():
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", _STARTUP_PROBE, *args],
+                env=env,
+                cwd=settings.default_export_dir,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            samples.append(json.loads(out.stdout.splitlines()[-1]))
+        results[name] = {
+            "ms_median": round(median(s["ms"] for s in samples), 1),
+            "heavy_modules": sorted({m for s in samples for m in s["heavy"]}),
+        }
+    return results
+
+
+def run_benchmarks(
+    root: Path,
+    spec: SyntheticSpec = SyntheticSpec(),
+    repeat: int = 3,
+    cases: list[str] | None = None,
+    startup: bool = True,
+) -> dict:
+    """
+    Generate a synthetic tree below root and run the benchmark cases on it.
+
+    Every run happens in a freshly spawned process, so peak RSS and call
+    counts belong to that case alone. Cases that modify the tree run once
+    and after all others.
+
+    Args:
+        root: Empty directory for the synthetic fileserver
+        spec: Shape of the generated portfolio
+        repeat: Runs per non-mutating case; the median time is reported
+        cases: Subset of BENCHMARKS to run; defaults to all
+        startup: Also run measure_startup
+
+    Returns:
+        Dict with environment, tree statistics and per-case results
+    """
+    cases = list(BENCHMARKS if cases is None else cases)
+    unknown = set(cases) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+    cases.sort(key=lambda c: BENCHMARKS[c][1])
+
+    settings = Settings(fileserver_root=root, default_export_dir=root / "reports")
+    start = time.perf_counter()
+    tree = generate_fileserver(root, spec)
+    tree["generate_seconds"] = round(time.perf_counter() - start, 3)
+    print(f"Generated {tree['files']} files in {tree['assets']} assets ({tree['generate_seconds']}s)")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for name in cases:
+        runs = []
+        for _ in range(1 if BENCHMARKS[name][1] else repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                runs.append(pool.submit(_run_case, name, settings).result())
+        seconds = [r["seconds"] for r in runs]
+        best = median(seconds)
+        last = runs[-1]
+        results[name] = {
+            "runs": len(runs),
+            "seconds_median": round(best, 4),
+            "seconds_min": round(min(seconds), 4),
+            "files_per_sec": round(tree["files"] / best) if best else None,
+            "baseline_rss_mb": last["baseline_rss_mb"],
+            "peak_rss_mb": max((r["peak_rss_mb"] or 0) for r in runs) or None,
+            "syscalls": last["syscalls"],
+        }
+        print(f"{name:28s} {best:8.3f}s  {results[name]['files_per_sec']:>10} files/s")
+
+    startup_results = None
+    if startup:
+        settings.default_export_dir.mkdir(parents=True, exist_ok=True)
+        startup_results = measure_startup(settings, runs=max(repeat, 3))
+        for name, row in startup_results.items():
+            heavy = f"  imports {', '.join(row['heavy_modules'])}" if row["heavy_modules"] else ""
+            print(f"startup: python -m tools {name:12s} {row['ms_median']:8.1f}ms{heavy}")
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "tree": tree,
+        "results": results,
+        "startup": startup_results,
+    }
+
+
+def compare_results(
+    baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD
+) -> list[dict]:
+    """
+    Compare two run_benchmarks outputs case by case.
+
+    Returns:
+        One dict per case present in both, with both median times, the
+        ratio current/baseline and whether it exceeds 1 + threshold
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or not before["seconds_median"]:
+            continue
+        ratio = result["seconds_median"] / before["seconds_median"]
+        rows.append(
+            {
+                "case": name,
+                "baseline_s": before["seconds_median"],
+                "current_s": result["seconds_median"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = SyntheticSpec()
+    parser = argparse.ArgumentParser(prog="python -m tools.benchmark", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--assets", type=int, default=defaults.assets)
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--fanout", type=int, default=defaults.fanout)
+    parser.add_argument("--files-per-folder", type=int, default=defaults.files_per_folder)
+    parser.add_argument("--size-median-kb", type=float, default=defaults.size_median_kb)
+    parser.add_argument("--size-sigma", type=float, default=defaults.size_sigma)
+    parser.add_argument("--superseded-share", type=float, default=defaults.superseded_share)
+    parser.add_argument("--dense", action="store_true", help="write real file content")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--case", action="append", choices=list(BENCHMARKS), dest="cases")
+    parser.add_argument("--root", type=Path, help="where to generate the tree (default: temp dir)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated temp tree")
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS, help="ms")
+    startup = parser.add_mutually_exclusive_group()
+    startup.add_argument("--no-startup", action="store_true", help="skip the CLI startup check")
+    startup.add_argument("--startup-only", action="store_true", help="only run the startup check")
+    args = parser.parse_args(argv)
+
+    spec = SyntheticSpec(
+        assets=args.assets,
+        depth=args.depth,
+        fanout=args.fanout,
+        files_per_folder=args.files_per_folder,
+        size_median_kb=args.size_median_kb,
+        size_sigma=args.size_sigma,
+        superseded_share=args.superseded_share,
+        sparse=not args.dense,
+        seed=args.seed,
+    )
+    root = args.root or Path(tempfile.mkdtemp(prefix="sch_bench_"))
+    try:
+        report = run_benchmarks(
+            root,
+            spec,
+            repeat=args.repeat,
+            cases=[] if args.startup_only else args.cases,
+            startup=not args.no_startup,
+        )
+    finally:
+        # Only a temp dir created here is removed; --root is left alone
+        if args.root is None and not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"Results written to: {args.out}")
+
+    failed = False
+    if report["startup"]:
+        phase = report["startup"]["phase"]
+        if phase["ms_median"] > args.startup_budget:
+            print(f"STARTUP REGRESSION: phase took {phase['ms_median']}ms (> {args.startup_budget}ms)")
+            failed = True
+        for name, row in report["startup"].items():
+            if row["heavy_modules"]:
+                print(f"STARTUP REGRESSION: {name} imports {', '.join(row['heavy_modules'])}")
+                failed = True
+
+    if args.compare:
+        rows = compare_results(json.loads(args.compare.read_text()), report, args.threshold)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(
+                f"{row['case']:28s} {row['baseline_s']:8.3f}s -> {row['current_s']:8.3f}s"
+                f"  x{row['ratio']:<6} {flag}"
+            )
+        failed = failed or any(row["regression"] for row in rows)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
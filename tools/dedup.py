@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+
+from .lifecycle_ops import Settings
+from .scanner import SUPERSEDED_DIR, iter_file_entries, list_asset_folders
+
+try:
+    import xxhash
+except ImportError:  # optional, faster than blake2b
+    xxhash = None
+
+DEFAULT_MIN_SIZE = 1024 * 1024
+PARTIAL_BLOCK = 64 * 1024
+READ_SIZE = 4 * 1024 * 1024
+
+_HASH_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial TEXT,
+    full TEXT
+);
+"""
+
+
+class FileRef(NamedTuple):
+    asset: str
+    path: str
+    size: int
+    mtime_ns: int
+
+
+def _new_hasher():
+    if xxhash is not None:
+        return "xxh3", xxhash.xxh3_128()
+    return "blake2b", hashlib.blake2b(digest_size=16)
+
+
+def partial_hash(path: str) -> str | None:
+    """
+    Hash the first and last PARTIAL_BLOCK bytes of a file (the whole file if
+    it is smaller than two blocks). Returns None if the file cannot be read.
+    """
+    name, h = _new_hasher()
+    try:
+        with open(path, "rb") as f:
+            head = f.read(PARTIAL_BLOCK)
+            h.update(head)
+            if len(head) == PARTIAL_BLOCK:
+                f.seek(-PARTIAL_BLOCK, os.SEEK_END)
+                h.update(f.read(PARTIAL_BLOCK))
+    except OSError:
+        return None
+    return f"{name}:{h.hexdigest()}"
+
+
+def full_hash(path: str) -> str | None:
+    """Hash the complete file. Returns None if the file cannot be read."""
+    name, h = _new_hasher()
+    buf = bytearray(READ_SIZE)
+    view = memoryview(buf)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                h.update(view[:n])
+    except OSError:
+        return None
+    return f"{name}:{h.hexdigest()}"
+
+
+class HashCache:
+    """SQLite cache of partial and full hashes keyed on (path, size, mtime)."""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_HASH_CACHE_SCHEMA)
+        self._rows = {
+            row[0]: row[1:] for row in self._conn.execute("SELECT * FROM hashes")
+        }
+        self._dirty: dict[str, tuple] = {}
+
+    def get(self, ref: FileRef, kind: str) -> str | None:
+        row = self._dirty.get(ref.path) or self._rows.get(ref.path)
+        if row is None or row[0] != ref.size or row[1] != ref.mtime_ns:
+            return None
+        return row[2] if kind == "partial" else row[3]
+
+    def put(self, ref: FileRef, kind: str, value: str) -> None:
+        row = self._dirty.get(ref.path) or self._rows.get(ref.path)
+        if row is None or row[0] != ref.size or row[1] != ref.mtime_ns:
+            row = (ref.size, ref.mtime_ns, None, None)
+        partial, full = row[2], row[3]
+        if kind == "partial":
+            partial = value
+        else:
+            full = value
+        self._dirty[ref.path] = (ref.size, ref.mtime_ns, partial, full)
+
+    def commit(self) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+                ((path, *row) for path, row in self._dirty.items()),
+            )
+        self._rows.update(self._dirty)
+        self._dirty.clear()
+
+    def prune(self, refs: Iterable[FileRef]) -> int:
+        """
+        Drop rows for files not among refs or whose size or mtime changed.
+
+        Returns:
+            Number of rows removed
+        """
+        live = {ref.path: (ref.size, ref.mtime_ns) for ref in refs}
+        stale = [
+            path
+            for path, row in {**self._rows, **self._dirty}.items()
+            if live.get(path) != (row[0], row[1])
+        ]
+        with self._conn:
+            self._conn.executemany("DELETE FROM hashes WHERE path = ?", ((p,) for p in stale))
+        for path in stale:
+            self._rows.pop(path, None)
+            self._dirty.pop(path, None)
+        return len(stale)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _collect_files(assets_path: Path, min_size: int, workers: int) -> list[FileRef]:
+    def walk(folder: Path) -> list[FileRef]:
+        refs = []
+        for _, entry in iter_file_entries(folder):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if st.st_size >= min_size:
+                refs.append(FileRef(folder.name, entry.path, st.st_size, st.st_mtime_ns))
+        return refs
+
+    folders = list_asset_folders(assets_path)
+    if not folders:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(folders)))) as pool:
+        return [ref for refs in pool.map(walk, folders) for ref in refs]
+
+
+def _hash_groups(
+    groups: list[list[FileRef]],
+    kind: str,
+    func: Callable[[str], str | None],
+    cache: HashCache | None,
+    pool: ProcessPoolExecutor,
+) -> list[list[FileRef]]:
+    """Split every group by the given hash; groups of one are dropped."""
+    refs = [ref for group in groups for ref in group]
+    hashes: dict[str, str | None] = {}
+    todo = []
+    for ref in refs:
+        cached = cache.get(ref, kind) if cache is not None else None
+        if cached is None:
+            todo.append(ref)
+        else:
+            hashes[ref.path] = cached
+    for ref, value in zip(todo, pool.map(func, [r.path for r in todo], chunksize=16)):
+        hashes[ref.path] = value
+        if cache is not None and value is not None:
+            cache.put(ref, kind, value)
+
+    split: list[list[FileRef]] = []
+    for group in groups:
+        by_hash: dict[str, list[FileRef]] = defaultdict(list)
+        for ref in group:
+            value = hashes[ref.path]
+            if value is not None:
+                by_hash[value].append(ref)
+        split.extend(g for g in by_hash.values() if len(g) > 1)
+    return split
+
+
+def find_duplicates(
+    settings: Settings,
+    min_size: int = DEFAULT_MIN_SIZE,
+    workers: int | None = None,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Find files with identical content across all assets, _SUPERSEDED included.
+
+    Candidates are narrowed in three steps: equal size, then a partial hash
+    of head and tail, and only then a full content hash (xxh3 if xxhash is
+    installed, blake2b otherwise). Hashing runs on a process pool, and
+    hashes are cached by (path, size, mtime) under default_export_dir; rows
+    for files that were not seen again or have changed are pruned after a run.
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        min_size: Ignore files smaller than this many bytes
+        workers: Hashing processes; defaults to the CPU count
+        use_cache: Reuse and update the on-disk hash cache
+
+    Returns:
+        One row per duplicated file with Group, Asset, Path, Size_Bytes,
+        Superseded, Keep and Reclaimable_Bytes columns. In each group one
+        copy is kept: preferably one outside _SUPERSEDED, then the oldest.
+    """
+    workers = workers or os.cpu_count() or 1
+    refs = _collect_files(settings.assets_path, min_size, settings.scan_workers)
+
+    by_size: dict[int, list[FileRef]] = defaultdict(list)
+    for ref in refs:
+        by_size[ref.size].append(ref)
+    groups = [g for g in by_size.values() if len(g) > 1]
+
+    cache = HashCache(settings.default_export_dir / "hash_cache.sqlite") if use_cache else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            groups = _hash_groups(groups, "partial", partial_hash, cache, pool)
+            # Files no larger than two blocks were hashed completely already
+            small = [g for g in groups if g[0].size <= 2 * PARTIAL_BLOCK]
+            large = [g for g in groups if g[0].size > 2 * PARTIAL_BLOCK]
+            groups = small + _hash_groups(large, "full", full_hash, cache, pool)
+        if cache is not None:
+            cache.commit()
+            cache.prune(refs)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    rows = []
+    sep = os.sep
+    for number, group in enumerate(groups, start=1):
+        group = sorted(
+            group, key=lambda r: (f"{sep}{SUPERSEDED_DIR}{sep}" in r.path, r.mtime_ns, r.path)
+        )
+        for i, ref in enumerate(group):
+            rows.append(
+                {
+                    "Group": number,
+                    "Asset": ref.asset,
+                    "Path": ref.path,
+                    "Size_Bytes": ref.size,
+                    "Superseded": f"{sep}{SUPERSEDED_DIR}{sep}" in ref.path,
+                    "Keep": i == 0,
+                    "Reclaimable_Bytes": 0 if i == 0 else ref.size,
+                }
+            )
+    columns = ["Group", "Asset", "Path", "Size_Bytes", "Superseded", "Keep", "Reclaimable_Bytes"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def reclaimable_by_asset(duplicates: pd.DataFrame) -> pd.DataFrame:
+    """Summarize find_duplicates output into redundant copies and MB per asset."""
+    redundant = duplicates[~duplicates["Keep"]]
+    summary = redundant.groupby("Asset").agg(
+        Duplicate_Files=("Path", "count"),
+        Reclaimable_Bytes=("Reclaimable_Bytes", "sum"),
+    )
+    summary["Reclaimable_MB"] = (summary["Reclaimable_Bytes"] / (1024 * 1024)).round(2)
+    return summary.sort_values("Reclaimable_Bytes", ascending=False).reset_index()
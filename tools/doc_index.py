@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .documents import scan_documents_frame
+from .lifecycle_ops import Settings
+from .scanner import list_asset_folders
+
+PARTITION_FILE = "part-0.parquet"
+# Parquet metadata key of a partition's directory mtimes at scan time
+DIR_MTIMES_KEY = b"asset_dir_mtimes"
+
+_category = pa.dictionary(pa.int32(), pa.string())
+INDEX_SCHEMA = pa.schema(
+    [
+        ("Filename", pa.string()),
+        ("Folder", pa.string()),
+        ("Extension", _category),
+        ("Phase_Code", _category),
+        ("Doc_Type", _category),
+        ("Version", pa.string()),
+        ("Status", _category),
+        ("Size_Bytes", pa.int64()),
+        ("Modified", pa.timestamp("ns", tz="UTC")),
+        ("Convention_Valid", pa.bool_()),
+    ]
+)
+
+
+def _partition_dir(settings: Settings, asset_folder: str) -> Path:
+    # Hive-style partition; names are URI-encoded so "[SOLD]" etc. round-trip
+    return settings.document_index_path / f"Asset={quote(asset_folder, safe='')}"
+
+
+def write_asset_partition(
+    settings: Settings, asset_folder: str, df: pd.DataFrame | None = None
+) -> Path:
+    """
+    Scan one asset (unless df is given) and replace its index partition.
+
+    The mtime of every directory of the asset, taken before the scan, is
+    stored in the partition's Parquet metadata for _partition_is_current.
+    The partition file is swapped in atomically.
+    """
+    asset_path = settings.assets_path / asset_folder
+    dir_mtimes = _dir_mtimes(asset_path)
+    if df is None:
+        df = scan_documents_frame(asset_path)
+    part_dir = _partition_dir(settings, asset_folder)
+    part_dir.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df, schema=INDEX_SCHEMA, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), DIR_MTIMES_KEY: json.dumps(dir_mtimes)}
+    )
+    tmp_path = part_dir / f".{PARTITION_FILE}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, part_dir / PARTITION_FILE)
+    return part_dir / PARTITION_FILE
+
+
+def _dir_mtimes(asset_path: Path) -> dict[str, int]:
+    """mtime_ns of asset_path ("") and every directory below it, by relative path."""
+    mtimes = {}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(asset_path, rel)
+        try:
+            mtimes[rel] = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(os.path.join(rel, entry.name))
+        except OSError:
+            continue
+    return mtimes
+
+
+def _partition_is_current(asset_path: Path, part_file: Path) -> bool:
+    """
+    True if every directory recorded with the partition still has its
+    mtime. Like the scan cache, this relies on directory mtimes, which
+    change whenever an entry is created, deleted or renamed, so one stat
+    per recorded directory suffices and nothing is listed. Only the
+    Parquet footer of the partition is read.
+    """
+    raw = (pq.read_schema(part_file).metadata or {}).get(DIR_MTIMES_KEY)
+    if raw is None:
+        return False
+    for rel, mtime_ns in json.loads(raw).items():
+        try:
+            if os.stat(os.path.join(asset_path, rel)).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def build_document_index(
+    settings: Settings,
+    assets: list[str] | None = None,
+    max_workers: int | None = None,
+) -> Path:
+    """
+    Build or refresh the portfolio document index, one partition per asset.
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        assets: Asset folders to (re)index; all assets if omitted, in which
+            case partitions of assets that no longer exist are removed
+        max_workers: Concurrent asset scans; defaults to settings.scan_workers
+
+    Returns:
+        Path of the index dataset directory
+    """
+    if assets is None:
+        assets = [p.name for p in list_asset_folders(settings.assets_path)]
+        index_path = settings.document_index_path
+        if index_path.exists():
+            keep = {_partition_dir(settings, a).name for a in assets}
+            for part_dir in index_path.iterdir():
+                if part_dir.is_dir() and part_dir.name not in keep:
+                    shutil.rmtree(part_dir)
+
+    workers = max(1, min(max_workers or settings.scan_workers, len(assets) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="index") as pool:
+        list(pool.map(lambda a: write_asset_partition(settings, a), assets))
+
+    print(f"Indexed documents of {len(assets)} assets in {settings.document_index_path}")
+    return settings.document_index_path
+
+
+def read_document_index(
+    settings: Settings,
+    columns: list[str] | None = None,
+    assets: list[str] | None = None,
+    where: ds.Expression | None = None,
+) -> pd.DataFrame:
+    """
+    Read a slice of the document index.
+
+    Only the requested columns are read, and partitions of assets not in
+    assets are skipped without being opened. where is an optional
+    pyarrow.dataset expression, e.g. ds.field("Doc_Type") == "REP".
+    The Asset column is available as a partition column.
+    """
+    index_path = settings.document_index_path
+    if not index_path.exists():
+        return pd.DataFrame(columns=columns or ["Asset", *INDEX_SCHEMA.names])
+    dataset = ds.dataset(
+        index_path,
+        format="parquet",
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+        exclude_invalid_files=True,
+    )
+    expression = where
+    if assets is not None:
+        in_assets = ds.field("Asset").isin(assets)
+        expression = in_assets if expression is None else expression & in_assets
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def load_asset_documents(
+    settings: Settings, asset_folder: str, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Read one asset's partition, (re)building it first if it does not exist
+    yet or a folder of the asset changed since it was written.
+    """
+    part_file = _partition_dir(settings, asset_folder) / PARTITION_FILE
+    if not part_file.exists() or not _partition_is_current(
+        settings.assets_path / asset_folder, part_file
+    ):
+        write_asset_partition(settings, asset_folder)
+    return pq.read_table(part_file, columns=columns).to_pandas()
+
+
+def document_summary(
+    settings: Settings, by: list[str] | None = None, assets: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Document count and size per group, read from the index with only the
+    grouping columns and Size_Bytes loaded.
+    """
+    by = by or ["Asset", "Doc_Type"]
+    df = read_document_index(settings, columns=[*by, "Size_Bytes"], assets=assets)
+    summary = df.groupby(by, observed=True)["Size_Bytes"].agg(["count", "sum"])
+    summary.columns = ["Documents", "Total_Size_Bytes"]
+    summary["Total_Size_MB"] = (summary["Total_Size_Bytes"] / (1024 * 1024)).round(2)
+    return summary.reset_index()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import os
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
+from .instrumentation import instrumented
+from .lifecycle_ops import Settings
+from .naming import parse_document_names
+from .scanner import iter_asset_documents
+
+# Typed columns shared by the per-asset scan and the portfolio document index
+INDEX_COLUMNS = [
+    "Filename",
+    "Folder",
+    "Extension",
+    "Phase_Code",
+    "Doc_Type",
+    "Version",
+    "Status",
+    "Size_Bytes",
+    "Modified",
+    "Convention_Valid",
+]
+
+
+def scan_documents_frame(asset_path: Path) -> pd.DataFrame:
+    """
+    Scan one asset folder into the typed document frame used by the index.
+
+    _SUPERSEDED folders, status files and hidden files are skipped. Columns
+    are collected as plain lists rather than one dict per file, and file
+    names are parsed in one vectorized pass afterwards.
+    """
+    columns: dict[str, list] = {
+        name: [] for name in ["Filename", "Folder", "Size_Bytes", "Modified"]
+    }
+    for record in iter_asset_documents(asset_path):
+        columns["Filename"].append(record.filename)
+        columns["Folder"].append(record.folder)
+        columns["Size_Bytes"].append(record.size_bytes)
+        columns["Modified"].append(record.mtime)
+    return _typed_frame(columns)
+
+
+def _typed_frame(columns: dict[str, list]) -> pd.DataFrame:
+    filenames = pd.Series(columns["Filename"], dtype="string")
+    parsed = parse_document_names(filenames)
+    df = pd.DataFrame(
+        {
+            "Filename": filenames,
+            "Folder": pd.Series(columns["Folder"], dtype="string"),
+            "Extension": filenames.str.extract(r"(\.[^.]*)$", expand=False)
+            .fillna("")
+            .astype("category"),
+            "Phase_Code": parsed["Phase_Code"],
+            "Doc_Type": parsed["Doc_Type"],
+            "Version": parsed["Version"],
+            "Status": parsed["Status"],
+            "Size_Bytes": np.asarray(columns["Size_Bytes"], dtype="int64"),
+            "Modified": pd.to_datetime(
+                np.asarray(columns["Modified"], dtype="float64"), unit="s", utc=True
+            ),
+            "Convention_Valid": parsed["Convention_Valid"],
+        }
+    )
+    return df[INDEX_COLUMNS]
+
+
+def to_register(df: pd.DataFrame, asset_path: Path) -> pd.DataFrame:
+    """Convert a typed document frame into the document register layout."""
+    if df.empty:
+        return pd.DataFrame()
+    modified = df["Modified"].dt.tz_convert(tzlocal())
+    folder = df["Folder"].astype(str)
+    register = pd.DataFrame(
+        {
+            "Filename": df["Filename"].astype(str),
+            "Folder": folder,
+            "Full_Path": [
+                os.path.normpath(os.path.join(asset_path, f, n))
+                for f, n in zip(folder, df["Filename"].astype(str))
+            ],
+            "File_Size_MB": (df["Size_Bytes"] / (1024 * 1024)).round(3),
+            "Modified_Date": modified.dt.strftime("%Y-%m-%d"),
+            "Extension": df["Extension"].astype(str),
+            "Phase_Code": df["Phase_Code"],
+            "Doc_Type": df["Doc_Type"],
+            "Version": df["Version"],
+            "Status": df["Status"],
+            "Convention_Valid": df["Convention_Valid"],
+        }
+    )
+    return register
+
+
+@instrumented
+def scan_asset_documents(settings: Settings, asset_folder: str) -> pd.DataFrame:
+    """Scan all documents in an asset folder and create register"""
+    asset_path = settings.assets_path / asset_folder
+    if not asset_path.exists():
+        print(f"Asset not found: {asset_folder}")
+        return pd.DataFrame()
+
+    df = to_register(scan_documents_frame(asset_path), asset_path)
+    print(f"Scanned {len(df)} documents in {asset_folder}")
+    return df
+
+
+@instrumented
+def generate_document_register(
+    settings: Settings,
+    asset_folder: str,
+    output_file: Path | None = None,
+    use_index: bool = True,
+) -> pd.DataFrame:
+    """
+    Generate complete document register for an asset.
+
+    With use_index, the asset's slice of the document index is read instead
+    of rescanning the asset folder; the index partition is built on first use
+    and rebuilt whenever a folder of the asset changed since.
+    """
+    asset_path = settings.assets_path / asset_folder
+    if use_index:
+        from .doc_index import load_asset_documents
+
+        if not asset_path.exists():
+            print(f"Asset not found: {asset_folder}")
+            return pd.DataFrame()
+        df = to_register(load_asset_documents(settings, asset_folder), asset_path)
+    else:
+        df = scan_asset_documents(settings, asset_folder)
+
+    if df.empty:
+        return df
+
+    print(f"\nDocument Register Summary for {asset_folder}:")
+    print(f"Total Documents: {len(df)}")
+    print(f"Total Size: {df['File_Size_MB'].sum():.2f} MB")
+    print("\nBy Phase:")
+    print(df.groupby("Phase_Code", observed=True).size())
+    print("\nBy Document Type:")
+    print(df.groupby("Doc_Type", observed=True).size())
+    print("\nBy Status:")
+    print(df.groupby("Status", observed=True).size())
+
+    if output_file is None:
+        output_file = (
+            asset_path
+            / "00_ASSET_MASTER"
+            / "Document_Index"
+            / f"Document_Register_{datetime.now().strftime('%Y%m%d')}.csv"
+        )
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(output_file, index=False)
+    print(f"\nDocument register exported to: {output_file}")
+
+    return df
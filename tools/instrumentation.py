@@ -0,0 +1,500 @@
+"""
+Filesystem and operation instrumentation.
+
+Inside an `instrument()` block every os.scandir, stat (os.stat, os.lstat
+and DirEntry.stat) and open call of the process is timed, as is every
+call of a function decorated with @instrumented (the list, scan, transfer
+and report functions of lifecycle_ops, documents and reports):
+
+    with instrument(settings, sinks=[JsonLinesSink(path)]) as recorder:
+        list_assets(settings)
+    print_summary(recorder.summary())
+
+The recorder keeps latency histograms per call kind and per operation,
+directory and file rates, bytes moved by transfers and the slowest asset
+folders and directories. When the block ends, the recorder is handed to
+each sink. Outside a block the patched calls are not installed and
+@instrumented costs one global lookup per call.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Protocol
+import builtins
+import heapq
+import io
+import json
+import os
+import time
+
+if TYPE_CHECKING:
+    from .lifecycle_ops import Settings
+
+# Upper bounds (seconds) of the latency histogram buckets, 10 µs to 10 s
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+FS_CALLS = ("scandir", "stat", "open")
+DEFAULT_TOP_N = 10
+METRIC_PREFIX = "asset_ops"
+
+_active: Recorder | None = None
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus style, cumulative on export)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        # One extra bucket for values above the last bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, cumulative count) pairs, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, n in zip(self.bounds, self.counts):
+            total += n
+            pairs.append((repr(bound), total))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "total_s": round(self.sum, 4),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p90_ms": round(self.quantile(0.9) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Recorder:
+    """
+    Thread-safe collector behind an instrument() block.
+
+    Filesystem time is attributed to the asset folder a path lies in when
+    assets_path is given; directory listings are kept per directory. Times
+    are summed across threads, so with a thread pool they can exceed the
+    elapsed time of the block.
+    """
+
+    def __init__(self, assets_path: Path | None = None, top_n: int = DEFAULT_TOP_N):
+        self.top_n = top_n
+        self.started = datetime.now()
+        self._t0 = time.perf_counter()
+        self.finished: float | None = None
+        self.calls = {name: Histogram() for name in FS_CALLS}
+        self.operations: dict[str, Histogram] = defaultdict(Histogram)
+        self.counters: Counter = Counter()
+        self.asset_seconds: Counter = Counter()
+        self._folders: list[tuple[float, str, int]] = []
+        self._prefix = os.path.join(os.fspath(assets_path), "") if assets_path else None
+        self._lock = Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self._t0
+
+    def _asset_of(self, path) -> str | None:
+        if self._prefix is None or isinstance(path, int):
+            return None
+        path = os.fspath(path)
+        if isinstance(path, bytes) or not path.startswith(self._prefix):
+            return None
+        return path[len(self._prefix):].split(os.sep, 1)[0] or None
+
+    def observe_call(self, call: str, seconds: float, path=None) -> None:
+        asset = self._asset_of(path) if path is not None else None
+        with self._lock:
+            self.calls[call].observe(seconds)
+            if asset:
+                self.asset_seconds[asset] += seconds
+
+    def observe_listing(self, path, seconds: float, entries: int) -> None:
+        """One completed directory listing: opening plus reading all entries."""
+        asset = self._asset_of(path)
+        name = str(path) if isinstance(path, int) else os.fspath(path)
+        folder = (seconds, name, entries)
+        with self._lock:
+            self.calls["scandir"].observe(seconds)
+            self.counters["directories"] += 1
+            self.counters["entries"] += entries
+            if asset:
+                self.asset_seconds[asset] += seconds
+            if len(self._folders) < self.top_n:
+                heapq.heappush(self._folders, folder)
+            elif folder > self._folders[0]:
+                heapq.heapreplace(self._folders, folder)
+
+    def observe_operation(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.operations[name].observe(seconds)
+
+    def add(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += value
+
+    def summary(self) -> dict:
+        """Plain-dict view of everything recorded so far."""
+        elapsed = self.elapsed
+
+        def rate(n: int) -> float:
+            return round(n / elapsed, 1) if elapsed else 0.0
+
+        with self._lock:
+            return {
+                "started": self.started.isoformat(timespec="seconds"),
+                "elapsed_s": round(elapsed, 4),
+                "directories": self.counters["directories"],
+                "files": self.counters["files"],
+                "dirs_per_s": rate(self.counters["directories"]),
+                "files_per_s": rate(self.counters["files"]),
+                "bytes_moved": self.counters["bytes_moved"],
+                "counters": dict(sorted(self.counters.items())),
+                "latency": {name: h.summary() for name, h in self.calls.items()},
+                "operations": {
+                    name: h.summary() for name, h in sorted(self.operations.items())
+                },
+                "slowest_assets": [
+                    {"asset": a, "seconds": round(s, 4)}
+                    for a, s in self.asset_seconds.most_common(self.top_n)
+                ],
+                "slowest_folders": [
+                    {"path": p, "seconds": round(s, 4), "entries": n}
+                    for s, p, n in sorted(self._folders, reverse=True)
+                ],
+            }
+
+
+class _TimedEntry:
+    """DirEntry proxy that times stat() and counts files."""
+
+    __slots__ = ("_entry", "_recorder", "name", "path")
+
+    def __init__(self, entry: os.DirEntry, recorder: Recorder):
+        self._entry = entry
+        self._recorder = recorder
+        self.name = entry.name
+        self.path = entry.path
+
+    def __fspath__(self):
+        return self.path
+
+    def __repr__(self) -> str:
+        return repr(self._entry)
+
+    def inode(self) -> int:
+        return self._entry.inode()
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        result = self._entry.is_file(follow_symlinks=follow_symlinks)
+        if result:
+            self._recorder.add("files")
+        return result
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        start = time.perf_counter()
+        try:
+            return self._entry.stat(follow_symlinks=follow_symlinks)
+        finally:
+            self._recorder.observe_call("stat", time.perf_counter() - start, self.path)
+
+
+class _TimedScandir:
+    """
+    os.scandir iterator proxy. Only the time spent inside the iterator
+    (opening the directory and reading entries) is counted, not the time
+    the caller spends on each entry.
+    """
+
+    def __init__(self, it, path, recorder: Recorder, seconds: float):
+        self._it = it
+        self._path = path
+        self._recorder = recorder
+        self._seconds = seconds
+        self._entries = 0
+        self._done = False
+
+    def __enter__(self) -> _TimedScandir:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __iter__(self) -> _TimedScandir:
+        return self
+
+    def __next__(self) -> _TimedEntry:
+        start = time.perf_counter()
+        try:
+            entry = next(self._it)
+        except StopIteration:
+            self._seconds += time.perf_counter() - start
+            self._finish()
+            raise
+        self._seconds += time.perf_counter() - start
+        self._entries += 1
+        return _TimedEntry(entry, self._recorder)
+
+    def _finish(self) -> None:
+        if not self._done:
+            self._done = True
+            self._recorder.observe_listing(self._path, self._seconds, self._entries)
+
+    def close(self) -> None:
+        self._it.close()
+        self._finish()
+
+
+def _patch(recorder: Recorder) -> Callable[[], None]:
+    """Install the timing wrappers; returns the function that removes them."""
+    real = {
+        "scandir": os.scandir,
+        "stat": os.stat,
+        "lstat": os.lstat,
+        "os_open": os.open,
+        "open": builtins.open,
+    }
+
+    def scandir(path="."):
+        start = time.perf_counter()
+        it = real["scandir"](path)
+        return _TimedScandir(it, path, recorder, time.perf_counter() - start)
+
+    def timed(call: str, func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(path, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(path, *args, **kwargs)
+            finally:
+                recorder.observe_call(call, time.perf_counter() - start, path)
+
+        return wrapper
+
+    os.scandir = scandir
+    os.stat = timed("stat", real["stat"])
+    os.lstat = timed("stat", real["lstat"])
+    os.open = timed("open", real["os_open"])
+    builtins.open = io.open = timed("open", real["open"])
+
+    def restore() -> None:
+        os.scandir, os.stat, os.lstat = real["scandir"], real["stat"], real["lstat"]
+        os.open = real["os_open"]
+        builtins.open = io.open = real["open"]
+
+    return restore
+
+
+class Sink(Protocol):
+    def emit(self, recorder: Recorder) -> None: ...
+
+
+class MemorySink:
+    """Keeps the summary of every emitted recorder in memory."""
+
+    def __init__(self):
+        self.summaries: list[dict] = []
+
+    def emit(self, recorder: Recorder) -> None:
+        self.summaries.append(recorder.summary())
+
+    @property
+    def last(self) -> dict | None:
+        return self.summaries[-1] if self.summaries else None
+
+
+class JsonLinesSink:
+    """Appends each summary as one JSON line to a file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def emit(self, recorder: Recorder) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(recorder.summary()) + "\n")
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusTextSink:
+    """
+    Writes the metrics in the Prometheus text exposition format, for the
+    node_exporter textfile collector. The file is replaced atomically.
+    """
+
+    def __init__(self, path: Path, prefix: str = METRIC_PREFIX):
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def _histogram(
+        self, name: str, label: str, histograms: dict[str, Histogram], help_: str
+    ) -> list[str]:
+        metric = f"{self.prefix}_{name}"
+        lines = [f"# HELP {metric} {help_}", f"# TYPE {metric} histogram"]
+        for key, h in histograms.items():
+            tag = f'{label}="{_label(key)}"'
+            lines += [f'{metric}_bucket{{{tag},le="{le}"}} {n}' for le, n in h.cumulative()]
+            lines.append(f"{metric}_sum{{{tag}}} {h.sum!r}")
+            lines.append(f"{metric}_count{{{tag}}} {h.count}")
+        return lines
+
+    def render(self, recorder: Recorder) -> str:
+        with recorder._lock:
+            calls = dict(recorder.calls)
+            operations = dict(recorder.operations)
+            counters = dict(recorder.counters)
+            assets = recorder.asset_seconds.most_common(recorder.top_n)
+        lines = self._histogram("fs_call_seconds", "call", calls, "Latency of filesystem calls")
+        lines += self._histogram(
+            "operation_seconds", "operation", operations, "Duration of operations"
+        )
+        for name, value in sorted(counters.items()):
+            metric = f"{self.prefix}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        metric = f"{self.prefix}_asset_fs_seconds"
+        lines += [
+            f"# HELP {metric} Filesystem time of the slowest asset folders",
+            f"# TYPE {metric} gauge",
+        ]
+        lines += [f'{metric}{{asset="{_label(a)}"}} {s!r}' for a, s in assets]
+        return "\n".join(lines) + "\n"
+
+    def emit(self, recorder: Recorder) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(self.render(recorder), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+@contextmanager
+def instrument(
+    settings: Settings | None = None,
+    sinks: Iterable[Sink] = (),
+    top_n: int = DEFAULT_TOP_N,
+) -> Iterator[Recorder]:
+    """
+    Record filesystem calls and instrumented operations for the duration of
+    the block, then emit the recorder to every sink.
+
+    Args:
+        settings: Used to attribute filesystem time to asset folders
+        sinks: MemorySink, JsonLinesSink, PrometheusTextSink or any object
+            with an emit(recorder) method
+        top_n: Number of slowest assets and folders kept
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("instrument() blocks cannot be nested")
+    recorder = Recorder(settings.assets_path if settings is not None else None, top_n)
+    restore = _patch(recorder)
+    _active = recorder
+    try:
+        yield recorder
+    finally:
+        _active = None
+        restore()
+        recorder.finished = time.perf_counter()
+        for sink in sinks:
+            sink.emit(recorder)
+
+
+def instrumented(func: Callable) -> Callable:
+    """Record the duration of each call of func inside an instrument() block."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _active
+        if recorder is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            recorder.observe_operation(func.__name__, time.perf_counter() - start)
+
+    return wrapper
+
+
+def add_counter(counter: str, value: int = 1) -> None:
+    """Increment a counter of the active recorder, if any (e.g. bytes_moved)."""
+    recorder = _active
+    if recorder is not None:
+        recorder.add(counter, value)
+
+
+def print_summary(summary: dict) -> None:
+    """Print a recorder summary as a short text report."""
+    print(
+        f"{summary['elapsed_s']:.2f}s: {summary['directories']} directories "
+        f"({summary['dirs_per_s']}/s), {summary['files']} files ({summary['files_per_s']}/s), "
+        f"{summary['bytes_moved'] / 1024**2:.1f} MB moved"
+    )
+    sections = [("Filesystem calls", summary["latency"]), ("Operations", summary["operations"])]
+    for label, rows in sections:
+        if not any(h["count"] for h in rows.values()):
+            continue
+        print(f"{label}:")
+        for name, h in rows.items():
+            if h["count"]:
+                print(
+                    f"  {name:<28} n={h['count']:<8} total={h['total_s']:.3f}s "
+                    f"p50={h['p50_ms']}ms p99={h['p99_ms']}ms max={h['max_ms']}ms"
+                )
+    if summary["slowest_assets"]:
+        print("Slowest assets:")
+        for row in summary["slowest_assets"]:
+            print(f"  {row['asset']:<45} {row['seconds']:.3f}s")
+    if summary["slowest_folders"]:
+        print("Slowest folders:")
+        for row in summary["slowest_folders"]:
+            print(f"  {row['path']:<60} {row['seconds']:.4f}s ({row['entries']} entries)")
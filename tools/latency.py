@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+import asyncio
+import os
+import time
+
+if TYPE_CHECKING:
+    from .lifecycle_ops import Settings
+
+
+@contextmanager
+def inject_latency(scandir_delay: float, stat_delay: float = 0.0) -> Iterator[None]:
+    """
+    Add an artificial delay to every os.scandir (and optionally os.stat) call.
+
+    Simulates a network share on local disk: each directory listing costs
+    one round trip. The delay is a sleep, so it releases the GIL just like
+    real network I/O. Patches the os module for the duration of the block.
+    """
+    real_scandir, real_stat = os.scandir, os.stat
+
+    def slow_scandir(*args, **kwargs):
+        time.sleep(scandir_delay)
+        return real_scandir(*args, **kwargs)
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(stat_delay)
+        return real_stat(*args, **kwargs)
+
+    os.scandir = slow_scandir
+    if stat_delay:
+        os.stat = slow_stat
+    try:
+        yield
+    finally:
+        os.scandir, os.stat = real_scandir, real_stat
+
+
+def compare_scan_modes(
+    settings: Settings,
+    scandir_delay: float = 0.005,
+    stat_delay: float = 0.0,
+    concurrency: int | None = None,
+) -> dict:
+    """
+    Time the threaded and the async portfolio scan under injected latency.
+
+    Returns:
+        Dict with the delays, both timings in seconds, the speedup of the
+        async mode and whether both modes produced identical results
+    """
+    from .async_scan import scan_portfolio as scan_portfolio_async
+    from .scanner import scan_portfolio
+
+    with inject_latency(scandir_delay, stat_delay):
+        start = time.perf_counter()
+        threaded = scan_portfolio(settings.assets_path, max_workers=settings.scan_workers)
+        threaded_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = asyncio.run(scan_portfolio_async(settings, concurrency=concurrency))
+        async_s = time.perf_counter() - start
+
+    return {
+        "scandir_delay_s": scandir_delay,
+        "stat_delay_s": stat_delay,
+        "threaded_s": round(threaded_s, 3),
+        "async_s": round(async_s, 3),
+        "speedup": round(threaded_s / async_s, 2) if async_s else None,
+        "results_match": threaded == concurrent,
+    }
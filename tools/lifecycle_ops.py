@@ -1,135 +1,748 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Iterable, Mapping
 import os
-import subprocess
+import stat
 
 import pandas as pd
-from dotenv import load_dotenv
-
-
-@dataclass(frozen=True)
-class Settings:
-    fileserver_root: Path
-    assets_dir: str = "ASSETS"
-    templates_dir: str = "TEMPLATES"
-    default_export_dir: Path = Path(r".\\reports")
-
-    @property
-    def fileserver_path(self) -> Path:
-        return self.fileserver_root
-
-    @property
-    def assets_path(self) -> Path:
-        return self.fileserver_root / self.assets_dir
-
-    @property
-    def templates_path(self) -> Path:
-        return self.fileserver_root / self.templates_dir
-
-
-def load_settings(env_path: Path = Path(".env")) -> Settings:
-    load_dotenv(env_path)
-    env_root = os.environ.get("FILESERVER_ROOT")
-    if env_root:
-        root = Path(env_root)
-    else:
-        root = Path.home() / "AssetManagement"
-    assets_dir = os.environ.get("ASSETS_DIR", "ASSETS")
-    templates_dir = os.environ.get("TEMPLATES_DIR", "TEMPLATES")
-    export_dir = Path(os.environ.get("DEFAULT_EXPORT_DIR", r".\\reports"))
-    export_dir.mkdir(parents=True, exist_ok=True)
-    return Settings(
-        fileserver_root=root,
-        assets_dir=assets_dir,
-        templates_dir=templates_dir,
-        default_export_dir=export_dir,
-    )
 
-def create_fileserver_structure(settings: Settings) -> subprocess.CompletedProcess:
+from .archiver import archived_asset_rows, pack_archived_asset
+from .async_scan import scan_portfolio as scan_portfolio_async
+from .instrumentation import instrumented
+from .report_writer import DEFAULT_MAX_SHEET_ROWS, ReportWriter
+from .scan_cache import ScanCache
+from .scanner import (
+    PHASE_CODES,
+    STATUS_FILES,
+    SUPERSEDED_DIR,
+    AssetScan,
+    phase_from_status_name,
+    scan_asset,
+    scan_portfolio,
+)
+from .settings import Settings, load_settings
+from .status import current_status
+from .structure import (
+    DEFAULT_STRUCTURE_WORKERS,
+    LIFECYCLE_TEMPLATE,
+    StructurePlan,
+    apply_plans,
+    build_structure,
+    fileserver_files,
+    fileserver_tree,
+)
+from .template_manifest import load_template_manifest
+from .transfer import (
+    DEFAULT_TRANSFER_WORKERS,
+    TransferJournal,
+    TransferStats,
+    copy_tree,
+    move_tree,
+    print_progress,
+    remove_tree,
+)
+
+ARCHIVE_REASONS = ("SOLD", "DECOMMISSIONED", "CANCELLED")
+
+PIPELINE_STATUS_FILE = STATUS_FILES["01"]
+# Written into a new asset folder before its tree is created and removed
+# once its status file exists; marks a creation that may be completed
+CREATION_MARKER = ".asset_creating"
+
+# Phase folders set read-only when an asset enters each phase
+PHASE_LOCKED_FOLDERS = {
+    "02": ["01_PREFEASIBILITY"],
+    "03": [
+        "01_PREFEASIBILITY",
+        "02_FEASIBILITY",
+        "03_LAND_ACQUISITION",
+        "04_PERMITTING",
+        "05_DESIGN_ENGINEERING",
+        "06_FINANCING",
+    ],
+    "04": ["07_PROCUREMENT", "08_CONSTRUCTION", "09_COMMISSIONING_COD"],
+}
+
+# Columns expected by create_assets_bulk, named like create_new_asset's arguments
+ASSET_ROW_FIELDS = ("subco", "asset_type", "asset_id", "name", "location", "dev_pm")
+
+
+@instrumented
+def create_fileserver_structure(settings: Settings, dry_run: bool = False) -> StructurePlan:
     """
-    Run the create_fileserver_structure.ps1 PowerShell script with -RootPath set to assets_path.
-    
+    Create the fileserver structure (ASSETS, CORPORATE, TEMPLATES with the
+    asset lifecycle template and CSV templates, ARCHIVE) below fileserver_root.
+
+    Native port of scripts/create_fileserver_structure.ps1: runs headless on
+    any OS, lists each existing folder once and only creates what is missing.
+    Existing files are left untouched.
+
     Args:
-        settings: Settings object containing the assets_path configuration
-        
+        settings: Settings object containing the fileserver_root configuration
+        dry_run: Only print which folders and files would be created
+
     Returns:
-        CompletedProcess object with the result of the PowerShell execution
-    """
-    script_path = Path(__file__).parent.parent / "scripts" / "create_fileserver_structure.ps1"
-    fileserver_root = settings.fileserver_root
-    
-    command = [
-        "powershell.exe",
-        "-ExecutionPolicy", "Bypass",
-        "-File", str(script_path),
-        "-RootPath", str(fileserver_root)
-    ]
-    
-    result = subprocess.run(command, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        print(f"Error executing script: {result.stderr}")
-    else:
-        print(f"Script executed successfully: {result.stdout}")
-    
-    return result
+        StructurePlan with the folders and files that were (or would be) created
+    """
+    return build_structure(
+        settings.fileserver_root, fileserver_tree(), fileserver_files(), dry_run=dry_run
+    )
+
+
+def provision_asset(settings: Settings, asset_folder: str, dry_run: bool = False) -> StructurePlan:
+    """Create the lifecycle folder tree for an asset directly from the built-in spec."""
+    return build_structure(settings.assets_path / asset_folder, LIFECYCLE_TEMPLATE, dry_run=dry_run)
 
 
 def get_current_phase(asset_folder: Path) -> str:
     """
     Infer phase from _STATUS_XX_*.txt files in the asset root.
-    Returns '00' if none found.
+    Returns '00' if none found. Status files are read through the cache in
+    tools.status, so repeated calls only stat the folder.
     """
-    if not asset_folder.exists():
-        return "00"
-    phases: list[str] = []
-    for p in asset_folder.iterdir():
-        if p.is_file() and p.name.startswith("_STATUS_"):
-            try:
-                # Expected: _STATUS_01_*.txt
-                phase_num = p.name.split("_")[2][:2]
-                phases.append(phase_num)
-            except Exception:
-                pass
-    return max(phases) if phases else "00"
+    record = current_status(asset_folder)
+    return record.phase if record else "00"
 
 
 def get_folder_stats(folder: Path) -> dict:
-    total_size = 0
-    file_count = 0
-    for p in folder.rglob("*"):
-        if p.is_file():
-            file_count += 1
-            try:
-                total_size += p.stat().st_size
-            except OSError:
-                pass
-    return {"file_count": file_count, "total_size_bytes": total_size}
+    scan = scan_asset(folder)
+    return {"file_count": scan.file_count, "total_size_bytes": scan.total_size_bytes}
 
 
-def list_assets(settings: Settings) -> pd.DataFrame:
-    rows = []
+def open_scan_cache(settings: Settings) -> ScanCache:
+    """Open the incremental scan cache stored under default_export_dir."""
+    return ScanCache(settings.scan_cache_path)
+
+
+def _scan_assets(settings: Settings, max_workers: int | None, use_cache: bool) -> list:
+    workers = max_workers or settings.scan_workers
+    if not use_cache:
+        return scan_portfolio(settings.assets_path, max_workers=workers)
+    with open_scan_cache(settings) as cache:
+        return scan_portfolio(settings.assets_path, max_workers=workers, cache=cache)
+
+
+@instrumented
+def list_assets(
+    settings: Settings, max_workers: int | None = None, use_cache: bool = False
+) -> pd.DataFrame:
+    """
+    Build the asset overview from one parallel scandir walk per asset.
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        max_workers: Concurrent asset walks; defaults to settings.scan_workers
+        use_cache: Only re-list directories whose mtime changed since the
+            last cached scan (see open_scan_cache)
+
+    Returns:
+        DataFrame with asset, phase, file_count and total_size_mb columns
+    """
     ap = settings.assets_path
     if not ap.exists():
+        return _assets_frame([])
+    return _assets_frame(_scan_assets(settings, max_workers, use_cache))
+
+
+async def list_assets_async(settings: Settings, concurrency: int | None = None) -> pd.DataFrame:
+    """
+    Same DataFrame as list_assets, built by the asyncio scan engine.
+    Use from a running event loop, e.g. `df = await list_assets_async(s)` in Jupyter.
+    """
+    if not settings.assets_path.exists():
+        return _assets_frame([])
+    return _assets_frame(await scan_portfolio_async(settings, concurrency=concurrency))
+
+
+def _assets_frame(scans: list) -> pd.DataFrame:
+    if not scans:
         return pd.DataFrame(columns=["asset", "phase", "file_count", "total_size_mb"])
+    rows = [
+        {
+            "asset": scan.asset,
+            "phase": scan.phase,
+            "file_count": scan.file_count,
+            "total_size_mb": scan.total_size_mb,
+        }
+        for scan in scans
+    ]
+    return pd.DataFrame(rows)
+
 
-    for d in sorted([x for x in ap.iterdir() if x.is_dir()]):
-        phase = get_current_phase(d)
-        stats = get_folder_stats(d)
-        rows.append(
-            {
-                "asset": d.name,
-                "phase": phase,
-                "file_count": stats["file_count"],
-                "total_size_mb": round(stats["total_size_bytes"] / (1024 * 1024), 2),
-            }
-        )
+def parse_asset_folder_name(folder: str) -> dict | None:
+    """
+    Split a SUBCO_TYPEID_NAME_LOCATION folder name into its parts.
+    Returns None if the name has fewer than three parts.
+    """
+    parts = folder.split("_", 3)
+    if len(parts) < 3:
+        return None
+    type_id = parts[1]
+    return {
+        "Subcompany": parts[0],
+        "Asset_Type": "".join(c for c in type_id if c.isalpha()),
+        "Asset_ID": "".join(c for c in type_id if c.isdigit()),
+        "Asset_Name": parts[2],
+        "Location": parts[3] if len(parts) > 3 else "Unknown",
+    }
+
+
+@instrumented
+def discover_all_assets(
+    settings: Settings, max_workers: int | None = None, use_cache: bool = False
+) -> pd.DataFrame:
+    """
+    Full asset inventory with parsed folder names, phase and folder stats.
+
+    Same columns as the reference automation notebook's discover_all_assets,
+    but built on the parallel scanner and the optional scan cache.
+    """
+    rows = []
+    for scan in _scan_assets(settings, max_workers, use_cache):
+        parsed = parse_asset_folder_name(scan.asset)
+        if parsed is None:
+            continue
+        rows.append(inventory_row(scan, parsed))
     return pd.DataFrame(rows)
 
 
-def export_excel(df: pd.DataFrame, out_path: Path) -> Path:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_excel(out_path, index=False)
-    return out_path
+def inventory_row(scan: AssetScan, parsed: dict) -> dict:
+    """One discover_all_assets row from an asset scan and its parsed folder name."""
+    return {
+        "Asset_Folder": scan.asset,
+        **parsed,
+        "Current_Phase": scan.phase,
+        "Phase_Name": PHASE_CODES.get(scan.phase, "Unknown"),
+        "Folder_Path": str(scan.path),
+        "Total_Files": scan.file_count,
+        "Total_Size_MB": scan.total_size_mb,
+        "Last_Modified": (
+            datetime.fromtimestamp(scan.last_modified).strftime("%Y-%m-%d")
+            if scan.last_modified is not None
+            else None
+        ),
+    }
+
+
+@instrumented
+def copy_asset(
+    settings: Settings,
+    asset_folder: str,
+    dest_dir: Path,
+    workers: int = DEFAULT_TRANSFER_WORKERS,
+) -> TransferStats:
+    """
+    Copy an asset folder into dest_dir with the parallel transfer engine.
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        asset_folder: Name of the folder below ASSETS
+        dest_dir: Directory that receives the copy (dest_dir/asset_folder)
+        workers: Concurrent file/chunk copies
+
+    Returns:
+        TransferStats with file and byte totals and throughput
+
+    The copy is journaled next to the destination; rerunning an interrupted
+    copy skips the files that were already completed.
+    """
+    src = settings.assets_path / asset_folder
+    dst = dest_dir / asset_folder
+    if not src.is_dir():
+        raise FileNotFoundError(f"Asset not found: {asset_folder}")
+    journal = TransferJournal.for_destination(dst)
+    if dst.exists() and not journal.path.exists():
+        raise FileExistsError(f"Destination already exists: {dst}")
+    try:
+        stats = copy_tree(src, dst, workers=workers, progress=print_progress(), journal=journal)
+    finally:
+        journal.close()
+    journal.remove()
+    print(f"Copied {asset_folder} to {dst}: {stats.summary()}")
+    return stats
+
+
+@instrumented
+def move_asset(
+    settings: Settings,
+    asset_folder: str,
+    dest_dir: Path,
+    new_name: str | None = None,
+    workers: int = DEFAULT_TRANSFER_WORKERS,
+) -> TransferStats:
+    """
+    Move an asset folder into dest_dir, optionally renaming it.
+
+    A move within the same volume is a single rename; across volumes the
+    tree is copied in parallel, verified and then removed from ASSETS. An
+    interrupted cross-volume move resumes from its journal when rerun.
+    """
+    src = settings.assets_path / asset_folder
+    if not src.is_dir():
+        raise FileNotFoundError(f"Asset not found: {asset_folder}")
+    dst = dest_dir / (new_name or asset_folder)
+    stats = move_tree(src, dst, workers=workers, progress=print_progress())
+    print(f"Moved {asset_folder} to {dst}: {stats.summary()}")
+    return stats
+
+
+@instrumented
+def archive_asset(
+    settings: Settings,
+    asset_folder: str,
+    reason: str,
+    year: int | None = None,
+    workers: int = DEFAULT_TRANSFER_WORKERS,
+    pack: bool = False,
+) -> TransferStats:
+    """
+    Move an asset into its ARCHIVE year folder, tagged [SOLD], [DECOMMISSIONED]
+    or [CANCELLED] as described in docs/fileserver_structure.md.
+
+    With pack, the archived folder is then replaced by a single verified
+    .zpack file (see tools.archiver).
+    """
+    reason = reason.upper()
+    if reason not in ARCHIVE_REASONS:
+        raise ValueError(f"reason must be one of {', '.join(ARCHIVE_REASONS)}")
+    year = year or datetime.now().year
+    archived = f"{asset_folder}_[{reason}]"
+    year_dir = settings.archive_path / str(year)
+    stats = move_asset(settings, asset_folder, year_dir, new_name=archived, workers=workers)
+    if pack:
+        pack_archived_asset(settings, archived, year, workers=workers)
+    return stats
+
+
+def list_archived_assets(settings: Settings) -> pd.DataFrame:
+    """
+    Archived assets of all years, packed or still folders, with file count
+    and size. A packed asset is read from its index alone.
+    """
+    return pd.DataFrame(archived_asset_rows(settings))
+
+
+@instrumented
+def delete_asset(settings: Settings, asset_folder: str) -> bool:
+    """Delete an asset folder, including phase folders locked read-only."""
+    path = settings.assets_path / asset_folder
+    if not path.is_dir():
+        print(f"Asset not found: {asset_folder}")
+        return False
+    remove_tree(path)
+    print(f"Deleted asset: {asset_folder}")
+    return True
+
+
+def _pipeline_status_content(dev_pm: str, now: datetime) -> str:
+    return f"""STATUS: PIPELINE
+Phase Started: {now.strftime('%Y-%m-%d')}
+Responsible PM: {dev_pm}
+Target Completion: {(now + timedelta(days=90)).strftime('%Y-%m-%d')}
+
+Key Activities in Progress:
+1. Initial site identification
+2. Preliminary market research
+3. High-level feasibility assessment
+
+Next Milestones:
+- Site visit: {(now + timedelta(days=14)).strftime('%Y-%m-%d')}
+- Go/No-Go Decision: {(now + timedelta(days=60)).strftime('%Y-%m-%d')}
+
+Phase Closed: [Will be filled when moving to next phase]
+Last Updated: {now.strftime('%Y-%m-%d %H:%M:%S')}
+Updated By: Python Automation Script
+"""
+
+
+def _cell_text(value: object) -> str:
+    """
+    A spreadsheet cell as text: blank for empty (NaN or None) cells, and
+    whole numbers without the ".0" pandas gives them (12.0 -> "12").
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+@instrumented
+def create_assets_bulk(
+    settings: Settings,
+    rows: Iterable[Mapping] | pd.DataFrame,
+    workers: int = DEFAULT_STRUCTURE_WORKERS,
+) -> pd.DataFrame:
+    """
+    Create many assets at once from the cached template manifest.
+
+    All rows are validated first; the folder trees and template files of
+    every valid new asset are then created on one thread pool, and each
+    asset's _STATUS_01_PIPELINE.txt is written last, once its tree is
+    complete. A folder that still holds the creation marker of an
+    interrupted run is completed; any other existing folder is left
+    untouched and reported as exists.
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        rows: Mappings (or DataFrame rows) with subco, asset_type, asset_id,
+            name, location and dev_pm, e.g. from a pipeline spreadsheet;
+            empty cells count as missing. Read sheets with dtype=str to
+            keep leading zeros of asset IDs.
+        workers: Threads for creating folders and files
+
+    Returns:
+        DataFrame with Asset_Folder, Result (created, exists, invalid or
+        failed) and Error, one row per input row
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = rows.to_dict("records")
+    results: list[dict] = []
+    plans: dict[Path, StructurePlan] = {}
+    dev_pms: dict[Path, str] = {}
+    manifest = None
+
+    for row in rows:
+        values = {f: _cell_text(row.get(f)) for f in ASSET_ROW_FIELDS}
+        missing = [f for f, v in values.items() if not v]
+        asset_folder = "{subco}_{asset_type}{asset_id}_{name}_{location}".format(**values)
+        result = {"Asset_Folder": asset_folder, "Result": "created", "Error": None}
+        results.append(result)
+        asset_path = settings.assets_path / asset_folder
+        if missing:
+            result.update(Result="invalid", Error=f"Missing {', '.join(missing)}")
+        elif asset_path in plans:
+            result.update(Result="invalid", Error="Duplicate row")
+        elif (asset_path / PIPELINE_STATUS_FILE).exists():
+            result.update(Result="exists")
+        elif asset_path.exists() and not (asset_path / CREATION_MARKER).exists():
+            result.update(Result="exists", Error=f"Folder exists without {PIPELINE_STATUS_FILE}")
+        else:
+            manifest = manifest or load_template_manifest(settings)
+            plans[asset_path] = manifest.plan(asset_path)
+            dev_pms[asset_path] = values["dev_pm"]
+
+    failed: dict[Path, OSError] = {}
+    for asset_path in plans:
+        try:
+            asset_path.mkdir(parents=True, exist_ok=True)
+            (asset_path / CREATION_MARKER).touch()
+        except OSError as e:
+            failed[asset_path] = e
+    failed.update(apply_plans([p for a, p in plans.items() if a not in failed], workers))
+
+    now = datetime.now()
+    for asset_path, dev_pm in dev_pms.items():
+        if asset_path in failed:
+            continue
+        try:
+            (asset_path / PIPELINE_STATUS_FILE).write_text(_pipeline_status_content(dev_pm, now))
+            (asset_path / CREATION_MARKER).unlink()
+        except OSError as e:
+            failed[asset_path] = e
+
+    for result in results:
+        error = failed.get(settings.assets_path / result["Asset_Folder"])
+        if result["Result"] == "created" and error is not None:
+            result.update(Result="failed", Error=str(error))
+
+    df = pd.DataFrame(results, columns=["Asset_Folder", "Result", "Error"])
+    counts = df["Result"].value_counts()
+    print(
+        f"Assets created: {counts.get('created', 0)}, existing: {counts.get('exists', 0)}, "
+        f"invalid: {counts.get('invalid', 0)}, failed: {counts.get('failed', 0)}"
+    )
+    return df
+
+
+def create_new_asset(
+    settings: Settings,
+    subco: str,
+    asset_type: str,
+    asset_id: str,
+    name: str,
+    location: str,
+    dev_pm: str,
+) -> Path:
+    """
+    Create a new asset from TEMPLATES/ASSET_LIFECYCLE_TEMPLATE and write its
+    _STATUS_01_PIPELINE.txt.
+
+    The template is stamped from the cached template manifest (see
+    create_assets_bulk); a creation that was interrupted part-way is
+    completed by calling this again.
+    """
+    row = {
+        "subco": subco,
+        "asset_type": asset_type,
+        "asset_id": asset_id,
+        "name": name,
+        "location": location,
+        "dev_pm": dev_pm,
+    }
+    asset_folder = f"{subco}_{asset_type}{asset_id}_{name}_{location}"
+    asset_path = settings.assets_path / asset_folder
+    if (asset_path / PIPELINE_STATUS_FILE).exists():
+        print(f"Asset already exists: {asset_folder}")
+        return asset_path
+
+    print(f"Creating new asset: {asset_folder}")
+    result = create_assets_bulk(settings, [row]).iloc[0]
+    if result["Result"] != "created":
+        raise OSError(f"Could not create {asset_folder}: {result['Error']}")
+
+    print(f"Asset created successfully: {asset_path}")
+    return asset_path
+
+
+def _transition_status_content(new_phase: str, responsible_pm: str, now: datetime) -> str:
+    return f"""STATUS: {PHASE_CODES[new_phase].upper()}
+Phase Started: {now.strftime('%Y-%m-%d')}
+Responsible PM: {responsible_pm}
+Target Completion: TBD
+
+Key Activities in Progress:
+1. [To be updated]
+
+Next Milestones:
+- [To be updated]
+
+Phase Closed: [Will be filled when moving to next phase]
+Last Updated: {now.strftime('%Y-%m-%d %H:%M:%S')}
+Updated By: Python Automation Script
+"""
+
+
+def lock_read_only(path: Path) -> int:
+    """
+    Remove the write permission from a folder and everything below it.
+
+    Directories keep their read and execute bits so they stay browsable;
+    on Windows this sets the read-only attribute. Returns the number of
+    entries changed.
+    """
+    locked = 0
+    stack = [os.fspath(path)]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir():
+                    stack.append(entry.path)
+                mode = entry.stat().st_mode
+                if mode & 0o222:
+                    os.chmod(entry.path, stat.S_IMODE(mode) & ~0o222)
+                    locked += 1
+        mode = os.stat(current).st_mode
+        if mode & 0o222:
+            os.chmod(current, stat.S_IMODE(mode) & ~0o222)
+            locked += 1
+    return locked
+
+
+def is_read_only(path: str | os.PathLike) -> bool:
+    """True if path has no write permission, e.g. a phase folder locked by lock_read_only."""
+    return not os.stat(path).st_mode & 0o222
+
+
+@instrumented
+def transition_phases(
+    settings: Settings,
+    transitions: Iterable[tuple[str, str, str]],
+    workers: int | None = None,
+    strict: bool = False,
+) -> pd.DataFrame:
+    """
+    Move many assets to a new phase in one run.
+
+    Every (asset_folder, new_phase, responsible_pm) is validated first: the
+    asset must exist, appear once, and new_phase must be a known phase
+    after its current one. Then, on one thread pool, the current status
+    file of each asset is closed, the new one written, and the phase
+    folders completed by the transition are set read-only recursively
+    (each folder as a separate task).
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        transitions: (asset_folder, new_phase, responsible_pm) tuples
+        workers: Threads; defaults to settings.scan_workers
+        strict: Apply nothing if any transition is invalid
+
+    Returns:
+        DataFrame with Asset_Folder, From_Phase, To_Phase, Result (done,
+        invalid, skipped or failed), Locked_Entries and Error
+    """
+    transitions = [(a, str(p).zfill(2), pm) for a, p, pm in transitions]
+    workers = workers or settings.scan_workers
+
+    def validate(item: tuple[str, str, str]) -> dict:
+        asset_folder, new_phase, responsible_pm = item
+        row = {
+            "Asset_Folder": asset_folder,
+            "From_Phase": None,
+            "To_Phase": new_phase,
+            "Result": "done",
+            "Locked_Entries": 0,
+            "Error": None,
+            "_status_file": None,
+        }
+        asset_path = settings.assets_path / asset_folder
+        if new_phase not in PHASE_CODES:
+            row.update(Result="invalid", Error=f"Unknown phase {new_phase}")
+        elif not responsible_pm:
+            row.update(Result="invalid", Error="Missing responsible PM")
+        elif not asset_path.is_dir():
+            row.update(Result="invalid", Error="Asset not found")
+        else:
+            record = current_status(asset_path)
+            if record is not None:
+                row["From_Phase"], row["_status_file"] = record.phase, os.path.basename(record.path)
+            else:
+                row["From_Phase"] = "00"
+            if new_phase <= row["From_Phase"]:
+                row.update(Result="invalid", Error=f"Already in phase {row['From_Phase']}")
+        return row
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(validate, transitions))
+        seen: set[str] = set()
+        for row in rows:
+            if row["Asset_Folder"] in seen and row["Result"] == "done":
+                row.update(Result="invalid", Error="Duplicate asset in batch")
+            seen.add(row["Asset_Folder"])
+        if strict and any(row["Result"] == "invalid" for row in rows):
+            for row in rows:
+                if row["Result"] == "done":
+                    row.update(Result="skipped", Error="Batch has invalid transitions")
+
+        now = datetime.now()
+
+        def write_status(index: int) -> None:
+            row, (_, new_phase, responsible_pm) = rows[index], transitions[index]
+            asset_path = settings.assets_path / row["Asset_Folder"]
+            if row["_status_file"]:
+                with open(asset_path / row["_status_file"], "a") as f:
+                    f.write(f"\nPhase Closed: {now.strftime('%Y-%m-%d')}")
+                    f.write("\nClosed By: Python Automation Script")
+            (asset_path / STATUS_FILES[new_phase]).write_text(
+                _transition_status_content(new_phase, responsible_pm, now)
+            )
+
+        futures = {}
+        for i, row in enumerate(rows):
+            if row["Result"] != "done":
+                continue
+            asset_path = settings.assets_path / row["Asset_Folder"]
+            futures[pool.submit(write_status, i)] = row
+            for folder in PHASE_LOCKED_FOLDERS.get(row["To_Phase"], []):
+                if (asset_path / folder).is_dir():
+                    futures[pool.submit(lock_read_only, asset_path / folder)] = row
+
+        for future, row in futures.items():
+            try:
+                row["Locked_Entries"] += future.result() or 0
+            except OSError as e:
+                row.update(Result="failed", Error=row["Error"] or str(e))
+
+    df = pd.DataFrame(rows).drop(columns="_status_file")
+    counts = df["Result"].value_counts()
+    print(
+        f"Phase transitions done: {counts.get('done', 0)}, invalid: {counts.get('invalid', 0)}, "
+        f"skipped: {counts.get('skipped', 0)}, failed: {counts.get('failed', 0)}"
+    )
+    return df
+
+
+def transition_phase(
+    settings: Settings, asset_folder: str, new_phase: str, responsible_pm: str
+) -> bool:
+    """
+    Transition one asset to a new phase: close the current status file,
+    write the new one and lock the completed phase folders read-only.
+    See transition_phases for moving many assets at once.
+    """
+    result = transition_phases(settings, [(asset_folder, new_phase, responsible_pm)]).iloc[0]
+    if result["Result"] != "done":
+        print(f"Phase transition of {asset_folder} not applied: {result['Error']}")
+        return False
+    print(
+        f"Transitioned {asset_folder} from phase {result['From_Phase']} to {result['To_Phase']}"
+    )
+    return True
+
+
+@instrumented
+def manage_superseded_versions(
+    settings: Settings,
+    asset_folder: str,
+    phase_folder: str,
+    subfolder: str | None = None,
+    keep_latest: int = 1,
+) -> int:
+    """
+    Move older versions of each document in one folder to its _SUPERSEDED
+    subfolder.
+
+    Files are grouped by name without the last two parts (version and
+    status); groups containing a FINAL or APPROVED file are left alone and
+    the keep_latest most recently modified files of every other group stay.
+    Folders locked read-only by a phase transition are left alone.
+
+    Returns:
+        Number of files moved
+    """
+    target_path = settings.assets_path / asset_folder / phase_folder
+    if subfolder:
+        target_path = target_path / subfolder
+    if not target_path.is_dir():
+        print(f"Path not found: {target_path}")
+        return 0
+    if is_read_only(target_path):
+        print(f"Folder is locked read-only by a phase transition: {target_path}")
+        return 0
+
+    superseded_path = target_path / SUPERSEDED_DIR
+    superseded_path.mkdir(exist_ok=True)
+
+    # One listing; DirEntry supplies type and mtime without extra lookups
+    file_groups: dict[str, list[tuple[float, str]]] = {}
+    with os.scandir(target_path) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            parts = entry.name.split("_")
+            if len(parts) >= 5:
+                base_name = "_".join(parts[:-2])
+                file_groups.setdefault(base_name, []).append(
+                    (entry.stat().st_mtime, entry.name)
+                )
+
+    moved_count = 0
+    for files in file_groups.values():
+        if any("FINAL" in name or "APPROVED" in name for _, name in files):
+            continue
+        files.sort(reverse=True)
+        for _, name in files[keep_latest:]:
+            os.replace(target_path / name, superseded_path / name)
+            moved_count += 1
+            print(f"Moved to _SUPERSEDED: {name}")
+
+    print(f"Total files moved to _SUPERSEDED: {moved_count}")
+    return moved_count
+
+
+@instrumented
+def export_excel(
+    df: pd.DataFrame, out_path: Path, max_sheet_rows: int = DEFAULT_MAX_SHEET_ROWS
+) -> Path:
+    """
+    Stream df to a one-sheet workbook. Frames longer than max_sheet_rows are
+    written to a Parquet/CSV file next to it; that path is returned instead.
+    """
+    with ReportWriter(out_path, max_sheet_rows=max_sheet_rows) as writer:
+        return writer.write("Sheet1", df)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+
+import pandas as pd
+
+STATUS_CODES = ["DRAFT", "REVIEW", "REVISED", "FINAL", "APPROVED", "SIGNED"]
+
+# [SUBCO]_[TYPE][ID]_[PHASE]_[DOCTYPE]_[DESCRIPTION]_[DATE]_[VERSION]_[STATUS].ext
+# Date, version and status are optional in the pattern so that partially
+# conforming names still yield their leading fields; Convention_Valid is only
+# true when every field is present. Status is taken from its own position,
+# so a description such as "Final-Layout" is not mistaken for a status.
+DOCUMENT_NAME_PATTERN = re.compile(
+    r"^(?P<Subco>[A-Z]{2,4})"
+    r"_(?P<Asset_Type>[A-Z]{2,3})(?P<Asset_ID>\d{3})"
+    r"_(?P<Phase_Code>[A-Z]{2})"
+    r"_(?P<Doc_Type>[A-Z]{2,4})"
+    r"_(?P<Description>[^_.]+)"
+    r"(?:_(?P<Date>\d{8}))?"
+    r"(?:_(?P<Version>v\d{2,}))?"
+    r"(?:_(?P<Status>" + "|".join(STATUS_CODES) + r"))?"
+    r"(?P<Extension>\.[^._]+)?$"
+)
+
+NAME_FIELDS = list(DOCUMENT_NAME_PATTERN.groupindex)
+CATEGORY_FIELDS = ["Subco", "Asset_Type", "Asset_ID", "Phase_Code", "Doc_Type", "Status"]
+REQUIRED_FIELDS = [f for f in NAME_FIELDS if f != "Extension"]
+# Longest version ("v" and three digits) whose number fits Version_Number's
+# Int16; longer versions still match but get a null number
+MAX_VERSION_LENGTH = 4
+
+
+def _parse_with_pandas(names: pd.Series) -> pd.DataFrame:
+    parts = names.astype("string").str.extract(DOCUMENT_NAME_PATTERN)
+    result = pd.DataFrame(index=names.index)
+    for field in CATEGORY_FIELDS:
+        result[field] = parts[field].astype("category")
+    result["Description"] = parts["Description"]
+    result["Doc_Date"] = pd.to_datetime(parts["Date"], format="%Y%m%d", errors="coerce")
+    result["Version"] = parts["Version"]
+    digits = parts["Version"].where(parts["Version"].str.len() <= MAX_VERSION_LENGTH).str.slice(1)
+    result["Version_Number"] = pd.to_numeric(digits, errors="coerce").astype("Int16")
+    valid = parts[REQUIRED_FIELDS].notna().all(axis=1).astype(bool)
+    result["Convention_Valid"] = valid & result["Doc_Date"].notna()
+    return result
+
+
+def _parse_with_arrow(names: pd.Series, pa, pc) -> pd.DataFrame:
+    # Same pattern, evaluated by RE2 in C++; the typed columns are derived
+    # with Arrow kernels so no per-name Python code runs at all
+    array = pa.array(names, type=pa.string(), from_pandas=True)
+    matched = pc.extract_regex(array, DOCUMENT_NAME_PATTERN.pattern)
+    fields = {}
+    for field in NAME_FIELDS:
+        values = pc.struct_field(matched, field)
+        # RE2 reports optional groups that did not take part as ""
+        fields[field] = pc.if_else(pc.equal(values, ""), None, values)
+
+    doc_date = pc.strptime(fields["Date"], format="%Y%m%d", unit="s", error_is_null=True)
+    version = fields["Version"]
+    in_range = pc.less_equal(pc.utf8_length(version), MAX_VERSION_LENGTH)
+    version_number = pc.cast(
+        pc.utf8_slice_codeunits(pc.if_else(in_range, version, None), 1), pa.int16()
+    )
+    valid = pc.is_valid(doc_date)
+    for field in REQUIRED_FIELDS:
+        valid = pc.and_(valid, pc.is_valid(fields[field]))
+
+    columns = {f: pc.dictionary_encode(fields[f]).to_pandas() for f in CATEGORY_FIELDS}
+    columns["Description"] = fields["Description"].to_pandas(types_mapper=_string_mapper)
+    columns["Doc_Date"] = doc_date.to_pandas()
+    columns["Version"] = fields["Version"].to_pandas(types_mapper=_string_mapper)
+    columns["Version_Number"] = pd.array(version_number.to_pandas(), dtype="Int16")
+    columns["Convention_Valid"] = valid.fill_null(False).to_pandas()
+    return pd.DataFrame(columns).set_axis(names.index)
+
+
+def _string_mapper(arrow_type):
+    return pd.StringDtype()
+
+
+def parse_document_names(names: pd.Series) -> pd.DataFrame:
+    """
+    Parse a column of file names against the document naming convention.
+
+    Args:
+        names: File names (not paths)
+
+    Returns:
+        DataFrame aligned with names, with categorical code columns, a
+        datetime Doc_Date, an Int16 Version_Number, the Description and
+        Version strings and a boolean Convention_Valid column
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return _parse_with_pandas(names)
+    return _parse_with_arrow(names, pa, pc)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import pandas as pd
+
+from .lifecycle_ops import (
+    PHASE_CODES,
+    Settings,
+    inventory_row,
+    open_scan_cache,
+    parse_asset_folder_name,
+)
+from .scanner import list_asset_folders, scan_asset
+from .status import current_status
+
+# Columns of discover_all_assets, by the cheapest stage that can filter them
+NAME_COLUMNS = ("Asset_Folder", "Subcompany", "Asset_Type", "Asset_ID", "Asset_Name", "Location")
+PHASE_COLUMNS = ("Current_Phase", "Phase_Name")
+SCAN_COLUMNS = ("Folder_Path", "Total_Files", "Total_Size_MB", "Last_Modified")
+INVENTORY_COLUMNS = NAME_COLUMNS + PHASE_COLUMNS + SCAN_COLUMNS
+
+
+def _matcher(value: Any) -> Callable[[Any], bool]:
+    """Equality for a scalar, membership for a list/tuple/set, else a predicate."""
+    if callable(value):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        allowed = set(value)
+        return lambda v: v in allowed
+    return lambda v: v == value
+
+
+class AssetQuery:
+    """
+    Lazy query over the asset inventory, with the columns of discover_all_assets.
+
+    Nothing is read until collect(). Filters are then applied in the
+    cheapest stage that can answer them: folder-name columns from one
+    listing of ASSETS, phase columns from the (cached) status files of the
+    remaining assets, and only the assets left after that are walked for
+    file counts and sizes. A criterion is a value, a list of allowed values
+    or a predicate:
+
+        AssetQuery(s).where(Subcompany="AEN", Asset_Type="PV", Current_Phase="03").collect()
+        AssetQuery(s).where(Location=["Crete", "Patras"], Total_Size_MB=lambda mb: mb > 500)
+    """
+
+    def __init__(self, settings: Settings, criteria: dict[str, Any] | None = None):
+        self.settings = settings
+        self.criteria = dict(criteria or {})
+
+    def where(self, **criteria: Any) -> AssetQuery:
+        """A new query with the given column criteria added."""
+        unknown = set(criteria) - set(INVENTORY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown asset columns: {sorted(unknown)}")
+        return AssetQuery(self.settings, {**self.criteria, **criteria})
+
+    def _stage(self, columns: tuple[str, ...]) -> list[tuple[str, Callable[[Any], bool]]]:
+        return [(c, _matcher(v)) for c, v in self.criteria.items() if c in columns]
+
+    def explain(self) -> str:
+        """Which criteria are answered by which stage."""
+        lines = []
+        for label, columns in [
+            ("folder names", NAME_COLUMNS),
+            ("status files", PHASE_COLUMNS),
+            ("folder scan", SCAN_COLUMNS),
+        ]:
+            used = [c for c in self.criteria if c in columns]
+            lines.append(f"{label:13s} {', '.join(used) if used else '-'}")
+        return "\n".join(lines)
+
+    def candidates(self) -> list[tuple[str, dict]]:
+        """
+        (folder name, parsed name fields) of the assets that pass the name and
+        phase criteria, without walking any asset.
+        """
+        name_filters = self._stage(NAME_COLUMNS)
+        rows = []
+        for folder in list_asset_folders(self.settings.assets_path):
+            parsed = parse_asset_folder_name(folder.name)
+            if parsed is None:
+                continue
+            fields = {"Asset_Folder": folder.name, **parsed}
+            if all(match(fields[c]) for c, match in name_filters):
+                rows.append((folder.name, parsed))
+
+        phase_filters = self._stage(PHASE_COLUMNS)
+        if not phase_filters or not rows:
+            return rows
+
+        def phase_ok(row: tuple[str, dict]) -> bool:
+            record = current_status(self.settings.assets_path / row[0])
+            phase = record.phase if record else "00"
+            fields = {"Current_Phase": phase, "Phase_Name": PHASE_CODES.get(phase, "Unknown")}
+            return all(match(fields[c]) for c, match in phase_filters)
+
+        with ThreadPoolExecutor(max_workers=self.settings.scan_workers) as pool:
+            keep = list(pool.map(phase_ok, rows))
+        return [row for row, ok in zip(rows, keep) if ok]
+
+    def collect(self, use_cache: bool = False) -> pd.DataFrame:
+        """
+        Run the query.
+
+        Args:
+            use_cache: Reuse unchanged directories from the scan cache for
+                the assets that are walked
+
+        Returns:
+            DataFrame with the discover_all_assets columns for the matching
+            assets; the columns are present even when nothing matches
+        """
+        rows = self.candidates()
+        assets_path = self.settings.assets_path
+        workers = max(1, min(self.settings.scan_workers, len(rows)))
+
+        def scan_all(cache) -> list:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(
+                    pool.map(lambda row: scan_asset(assets_path / row[0], cache=cache), rows)
+                )
+
+        if use_cache:
+            with open_scan_cache(self.settings) as cache:
+                scans = scan_all(cache)
+        else:
+            scans = scan_all(None)
+
+        scan_filters = self._stage(PHASE_COLUMNS + SCAN_COLUMNS)
+        result = []
+        for (_, parsed), scan in zip(rows, scans):
+            row = inventory_row(scan, parsed)
+            if all(match(row[c]) for c, match in scan_filters):
+                result.append(row)
+        print(f"Query matched {len(result)} assets ({len(rows)} scanned)")
+        return pd.DataFrame(result, columns=list(INVENTORY_COLUMNS))
+
+    def names(self) -> list[str]:
+        """Matching folder names; walks assets only if scan columns are filtered."""
+        if self._stage(SCAN_COLUMNS):
+            df = self.collect()
+            return df["Asset_Folder"].tolist() if not df.empty else []
+        return [name for name, _ in self.candidates()]
+
+
+def find_assets(settings: Settings, **criteria: Any) -> pd.DataFrame:
+    """
+    Assets matching the given column criteria; see AssetQuery.
+
+    Example:
+        find_assets(settings, Asset_Type="PV", Phase_Name="Operational")
+    """
+    return AssetQuery(settings).where(**criteria).collect()
+
+
+def find_assets_by_criteria(assets_df: pd.DataFrame, **criteria: Any) -> pd.DataFrame:
+    """
+    Filter an already built inventory (e.g. from discover_all_assets) with
+    one boolean mask instead of a copy per column. Unknown columns are
+    ignored, as in the reference notebook.
+    """
+    mask = pd.Series(True, index=assets_df.index)
+    for column, value in criteria.items():
+        if column not in assets_df.columns:
+            continue
+        if callable(value):
+            mask &= assets_df[column].map(value).astype(bool)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            mask &= assets_df[column].isin(value)
+        else:
+            mask &= assets_df[column] == value
+    return assets_df[mask]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:  # optional, faster than openpyxl's write-only mode
+    xlsxwriter = None
+
+from .settings import DEFAULT_MAX_SHEET_ROWS
+
+CHUNK_ROWS = 50_000
+
+
+def _column_values(column: pd.Series) -> list:
+    """Python values Excel writers accept: None for missing, naive datetimes."""
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        column = column.dt.tz_localize(None)
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        values = column.dt.to_pydatetime()
+        return [None if v is pd.NaT else v for v in values]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype(object)
+    missing = column.isna().to_numpy()
+    values = column.to_numpy(dtype=object)
+    if missing.any():
+        # to_numpy may return a read-only view of the column's own array
+        values = values.copy()
+        values[missing] = None
+    return values.tolist()
+
+
+def iter_rows(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[tuple]:
+    """Yield the rows of df as tuples, converting one chunk of rows at a time."""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start : start + chunk_rows]
+        yield from zip(*(_column_values(chunk[c]) for c in chunk.columns))
+
+
+class ReportWriter:
+    """
+    Streaming multi-sheet .xlsx writer.
+
+    Rows are written as they are produced and not kept in memory: with
+    xlsxwriter installed in its constant_memory mode, otherwise through
+    openpyxl's write-only workbook. A sheet with more than max_sheet_rows
+    rows is written next to the workbook as Parquet (CSV without pyarrow)
+    and the workbook gets a one-line sheet pointing to that file.
+
+        with ReportWriter(path) as writer:
+            writer.write("Asset_Inventory", assets_df)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_sheet_rows: int = DEFAULT_MAX_SHEET_ROWS,
+        spill_format: str | None = None,
+    ):
+        self.path = Path(path)
+        self.max_sheet_rows = max_sheet_rows
+        if spill_format is None:
+            spill_format = "parquet" if find_spec("pyarrow") is not None else "csv"
+        self.spill_format = spill_format
+        self.spilled: dict[str, Path] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if xlsxwriter is not None:
+            self._book = xlsxwriter.Workbook(
+                self.path,
+                {"constant_memory": True, "default_date_format": "yyyy-mm-dd hh:mm:ss"},
+            )
+            self._bold = self._book.add_format({"bold": True})
+        else:
+            from openpyxl import Workbook
+
+            self._book = Workbook(write_only=True)
+
+    def __enter__(self) -> ReportWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_rows(self, sheet_name: str, header: list[str], rows) -> None:
+        if xlsxwriter is not None:
+            sheet = self._book.add_worksheet(sheet_name)
+            sheet.write_row(0, 0, header, self._bold)
+            for r, row in enumerate(rows, start=1):
+                sheet.write_row(r, 0, row)
+            return
+
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+
+        sheet = self._book.create_sheet(sheet_name)
+        bold = Font(bold=True)
+        cells = []
+        for name in header:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font = bold
+            cells.append(cell)
+        sheet.append(cells)
+        for row in rows:
+            sheet.append(row)
+
+    def _spill(self, sheet_name: str, df: pd.DataFrame) -> Path:
+        target = self.path.with_name(f"{self.path.stem}_{sheet_name}.{self.spill_format}")
+        if self.spill_format == "parquet":
+            df.to_parquet(target, index=False)
+        else:
+            df.to_csv(target, index=False)
+        self.spilled[sheet_name] = target
+        return target
+
+    def write(self, sheet_name: str, df: pd.DataFrame, index: bool = False) -> Path:
+        """
+        Add df as a sheet, or as a side file if it is too long.
+
+        Returns:
+            The workbook path, or the side file the rows went to
+        """
+        if index:
+            df = df.reset_index()
+        if len(df) > self.max_sheet_rows:
+            target = self._spill(sheet_name, df)
+            self._write_rows(
+                sheet_name,
+                ["Rows", "Written_To"],
+                [(len(df), target.name)],
+            )
+            print(f"{sheet_name}: {len(df)} rows written to {target}")
+            return target
+        self._write_rows(sheet_name, [str(c) for c in df.columns], iter_rows(df))
+        return self.path
+
+    def close(self) -> None:
+        if xlsxwriter is not None:
+            self._book.close()
+        else:
+            self._book.save(self.path)
+
+
+def write_report(
+    path: Path,
+    sheets: dict[str, pd.DataFrame],
+    max_sheet_rows: int = DEFAULT_MAX_SHEET_ROWS,
+) -> dict[str, Path]:
+    """
+    Write several frames as sheets of one workbook.
+
+    Returns:
+        The sheets that were written to side files, by sheet name
+    """
+    with ReportWriter(path, max_sheet_rows=max_sheet_rows) as writer:
+        for name, df in sheets.items():
+            writer.write(name, df)
+    return writer.spilled
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from .instrumentation import instrumented
+from .report_writer import DEFAULT_MAX_SHEET_ROWS, ReportWriter
+
+if TYPE_CHECKING:
+    from .lifecycle_ops import Settings
+
+
+def portfolio_summaries(assets_df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    The summary sheets of the portfolio report from a single grouped pass.
+
+    The inventory is grouped once by type, phase and subcompany; the
+    per-column summaries and the type/phase matrix are then folded from that
+    small frame instead of grouping the inventory again for each.
+    """
+    keys = ["Asset_Type", "Phase_Name", "Subcompany"]
+    cube = (
+        assets_df.groupby(keys, dropna=False, observed=True)
+        .agg(
+            Count=("Asset_Folder", "count"),
+            Rows=("Asset_Folder", "size"),
+            Total_Files=("Total_Files", "sum"),
+            Total_Size_MB=("Total_Size_MB", "sum"),
+        )
+        .reset_index()
+    )
+    sheets = {}
+    for column, sheet in [
+        ("Asset_Type", "Summary_by_Type"),
+        ("Phase_Name", "Summary_by_Phase"),
+        ("Subcompany", "Summary_by_Subcompany"),
+    ]:
+        sheets[sheet] = (
+            cube.groupby(column)[["Count", "Total_Files", "Total_Size_MB"]].sum().reset_index()
+        )
+    matrix = cube.pivot_table(
+        index="Asset_Type", columns="Phase_Name", values="Rows", aggfunc="sum", fill_value=0
+    )
+    matrix.columns.name = None
+    sheets["Type_Phase_Matrix"] = matrix.astype("int64").reset_index()
+    return sheets
+
+
+@instrumented
+def export_portfolio_report(
+    assets_df: pd.DataFrame,
+    output_excel: Path,
+    duplicates: pd.DataFrame | None = None,
+    max_sheet_rows: int = DEFAULT_MAX_SHEET_ROWS,
+) -> Path:
+    """
+    Export comprehensive portfolio report to Excel with multiple sheets.
+
+    Summaries come from one grouped pass (portfolio_summaries) and the
+    workbook is streamed by ReportWriter; row-level sheets longer than
+    max_sheet_rows go to a Parquet/CSV file next to it.
+
+    Args:
+        assets_df: Inventory as returned by discover_all_assets
+        output_excel: Target .xlsx path
+        duplicates: Optional find_duplicates output; adds a duplicate file
+            list and a reclaimable-bytes-per-asset sheet
+        max_sheet_rows: Longest sheet kept inside the workbook
+    """
+    from .dedup import reclaimable_by_asset
+
+    with ReportWriter(output_excel, max_sheet_rows=max_sheet_rows) as writer:
+        writer.write("Asset_Inventory", assets_df)
+        for sheet, df in portfolio_summaries(assets_df).items():
+            writer.write(sheet, df)
+        if duplicates is not None:
+            writer.write("Duplicate_Files", duplicates)
+            writer.write("Reclaimable_by_Asset", reclaimable_by_asset(duplicates))
+
+    print(f"Portfolio report exported to: {output_excel}")
+    return output_excel
+
+
+@instrumented
+def generate_asset_report(
+    settings: Settings, asset_folder: str, output_file: Path | None = None
+) -> Path | None:
+    """
+    Export a single-asset report: a Summary sheet with the parsed folder
+    name, phase and folder stats, a Document_Register sheet and per-phase
+    document counts.
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        asset_folder: Asset folder name below assets_path
+        output_file: Target .xlsx path; defaults to
+            default_export_dir/Asset_Report_<asset>_<YYYYMMDD>.xlsx
+
+    Returns:
+        Path of the written report, or None if the asset does not exist
+    """
+    from .documents import scan_asset_documents
+    from .lifecycle_ops import PHASE_CODES, parse_asset_folder_name
+    from .scanner import scan_asset
+
+    asset_path = settings.assets_path / asset_folder
+    if not asset_path.is_dir():
+        print(f"Asset not found: {asset_folder}")
+        return None
+
+    scan = scan_asset(asset_path)
+    summary = {
+        "Asset_Folder": asset_folder,
+        **(parse_asset_folder_name(asset_folder) or {}),
+        "Current_Phase": scan.phase,
+        "Phase_Name": PHASE_CODES.get(scan.phase, "Unknown"),
+        "Total_Files": scan.file_count,
+        "Total_Size_MB": scan.total_size_mb,
+        "Last_Modified": (
+            datetime.fromtimestamp(scan.last_modified).strftime("%Y-%m-%d")
+            if scan.last_modified is not None
+            else None
+        ),
+    }
+    register = scan_asset_documents(settings, asset_folder)
+
+    if output_file is None:
+        output_file = (
+            settings.default_export_dir
+            / f"Asset_Report_{asset_folder}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
+    with ReportWriter(output_file, max_sheet_rows=settings.report_max_sheet_rows) as writer:
+        writer.write("Summary", pd.DataFrame(list(summary.items()), columns=["Field", "Value"]))
+        writer.write("Document_Register", register)
+        if not register.empty:
+            by_phase = register.groupby("Phase_Code", observed=True).agg(
+                Documents=("Filename", "count"), Size_MB=("File_Size_MB", "sum")
+            )
+            writer.write("By_Phase", by_phase, index=True)
+
+    print(f"Asset report exported to: {output_file}")
+    return output_file
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable
+import sqlite3
+
+import pandas as pd
+
+from .lifecycle_ops import PHASE_CODES, Settings, _scan_assets, parse_asset_folder_name
+from .scanner import AssetScan
+
+ASSET_TYPE_NAMES = {
+    "PV": "Solar Photovoltaic",
+    "WF": "Wind Farm",
+    "HTL": "Hotel",
+    "DC": "Data Center",
+    "HF": "Hydroponic Farm",
+}
+
+DIMENSIONS = ["Asset_Type", "Phase_Name", "Subcompany", "Month"]
+_DIM_SQL = "asset_type, phase_name, subcompany, month"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    asset TEXT PRIMARY KEY,
+    asset_type TEXT NOT NULL,
+    phase_name TEXT NOT NULL,
+    subcompany TEXT NOT NULL,
+    month TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    last_modified REAL
+);
+CREATE TABLE IF NOT EXISTS cube (
+    asset_type TEXT NOT NULL,
+    phase_name TEXT NOT NULL,
+    subcompany TEXT NOT NULL,
+    month TEXT NOT NULL,
+    assets INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    PRIMARY KEY (asset_type, phase_name, subcompany, month)
+);
+CREATE TABLE IF NOT EXISTS history (
+    period TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    phase_name TEXT NOT NULL,
+    subcompany TEXT NOT NULL,
+    assets INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    PRIMARY KEY (period, asset_type, phase_name, subcompany)
+);
+"""
+
+_ADD = f"""
+INSERT INTO cube ({_DIM_SQL}, assets, files, size_bytes) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT ({_DIM_SQL}) DO UPDATE SET
+    assets = assets + excluded.assets,
+    files = files + excluded.files,
+    size_bytes = size_bytes + excluded.size_bytes
+"""
+
+
+def _asset_row(scan: AssetScan) -> tuple | None:
+    parsed = parse_asset_folder_name(scan.asset)
+    if parsed is None:
+        return None
+    month = (
+        datetime.fromtimestamp(scan.last_modified).strftime("%Y-%m")
+        if scan.last_modified is not None
+        else ""
+    )
+    return (
+        scan.asset,
+        parsed["Asset_Type"],
+        PHASE_CODES.get(scan.phase, "Unknown"),
+        parsed["Subcompany"],
+        month,
+        scan.file_count,
+        scan.total_size_bytes,
+        scan.last_modified,
+    )
+
+
+class RollupCube:
+    """
+    Materialized rollup of the asset inventory over asset type x phase x
+    subcompany x month of last modification, stored in SQLite.
+
+    apply() takes asset scans and only touches the cube cells of assets
+    whose row changed: the old contribution is subtracted and the new one
+    added. Each apply also stores the cube (without the month) as the
+    history row set of the current month, which trend() reads.
+    Dashboard queries run against these small tables, not the inventory.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> RollupCube:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def apply(
+        self, scans: Iterable[AssetScan], complete: bool = False, period: str | None = None
+    ) -> int:
+        """
+        Fold asset scans into the cube.
+
+        Args:
+            scans: Current AssetScan of some or all assets
+            complete: scans covers the whole portfolio; assets missing from
+                it are removed from the cube
+            period: History period to record (YYYY-MM); defaults to this month
+
+        Returns:
+            Number of assets added, changed or removed
+        """
+        old = {row[0]: row for row in self._conn.execute("SELECT * FROM assets")}
+        new = {}
+        for scan in scans:
+            row = _asset_row(scan)
+            if row is not None:
+                new[row[0]] = row
+        changed = [row for asset, row in new.items() if old.get(asset) != row]
+        removed = [old[a] for a in old if a not in new] if complete else []
+        outdated = [old[row[0]] for row in changed if row[0] in old] + removed
+
+        with self._conn:
+            self._conn.executemany(_ADD, ((*r[1:5], -1, -r[5], -r[6]) for r in outdated))
+            self._conn.executemany(_ADD, ((*r[1:5], 1, r[5], r[6]) for r in changed))
+            self._conn.execute("DELETE FROM cube WHERE assets = 0")
+            self._conn.executemany("DELETE FROM assets WHERE asset = ?", ((r[0],) for r in removed))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", changed
+            )
+            period = period or date.today().strftime("%Y-%m")
+            self._conn.execute("DELETE FROM history WHERE period = ?", (period,))
+            self._conn.execute(
+                """
+                INSERT INTO history
+                SELECT ?, asset_type, phase_name, subcompany,
+                       SUM(assets), SUM(files), SUM(size_bytes)
+                FROM cube GROUP BY asset_type, phase_name, subcompany
+                """,
+                (period,),
+            )
+        return len(changed) + len(removed)
+
+    def frame(self, by: list[str] | None = None) -> pd.DataFrame:
+        """
+        The cube rolled up to the given dimensions (all of DIMENSIONS by default).
+
+        Returns:
+            DataFrame with the dimension columns, Count, Total_Files and
+            Total_Size_MB
+        """
+        by = by or DIMENSIONS
+        unknown = set(by) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimensions: {sorted(unknown)}")
+        columns = ", ".join(d.lower() for d in by)
+        df = pd.read_sql_query(
+            f"""
+            SELECT {columns}, SUM(assets) AS Count, SUM(files) AS Total_Files,
+                   SUM(size_bytes) AS Size_Bytes
+            FROM cube GROUP BY {columns} ORDER BY {columns}
+            """,
+            self._conn,
+        )
+        df.columns = [*by, "Count", "Total_Files", "Size_Bytes"]
+        df["Total_Size_MB"] = (df.pop("Size_Bytes") / (1024 * 1024)).round(2)
+        return df
+
+    def matrix(self) -> pd.DataFrame:
+        """Asset counts by type (rows) and phase (columns)."""
+        df = self.frame(["Asset_Type", "Phase_Name"])
+        matrix = df.pivot(index="Asset_Type", columns="Phase_Name", values="Count")
+        matrix.columns.name = None
+        return matrix.fillna(0).astype("int64")
+
+    def recent_activity(self, days: int = 30, now: datetime | None = None) -> dict:
+        """Assets, and their files, modified in the last `days` days."""
+        cutoff = ((now or datetime.now()) - timedelta(days=days)).timestamp()
+        assets, files = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(files), 0) FROM assets WHERE last_modified > ?",
+            (cutoff,),
+        ).fetchone()
+        return {f"assets_modified_{days}d": assets, f"files_modified_{days}d": files}
+
+    def trend(self, by: str | None = None, metric: str = "Total_Size_MB") -> pd.DataFrame:
+        """
+        Month-end history of a metric (Count, Total_Files or Total_Size_MB).
+
+        Returns:
+            DataFrame indexed by period (YYYY-MM) with one column per value
+            of `by` (Asset_Type, Phase_Name or Subcompany), or a single
+            Total column
+        """
+        column = {"Count": "assets", "Total_Files": "files", "Total_Size_MB": "size_bytes"}[metric]
+        group = by.lower() if by else "'Total'"
+        if by not in (None, "Asset_Type", "Phase_Name", "Subcompany"):
+            raise ValueError(f"Unknown dimension: {by}")
+        df = pd.read_sql_query(
+            f"SELECT period, {group} AS key, SUM({column}) AS value "
+            f"FROM history GROUP BY period, key ORDER BY period",
+            self._conn,
+        )
+        if metric == "Total_Size_MB":
+            df["value"] = (df["value"] / (1024 * 1024)).round(2)
+        trend = df.pivot(index="period", columns="key", values="value").fillna(0)
+        trend.columns.name = None
+        return trend
+
+    def dashboard(self, recent_days: int = 30) -> dict:
+        """Portfolio metrics in the layout of the reference generate_portfolio_dashboard."""
+        metrics: dict = {}
+        totals = self.frame(["Asset_Type"])
+        metrics["total_assets"] = int(totals["Count"].sum())
+        metrics["total_size_gb"] = round(totals["Total_Size_MB"].sum() / 1024, 2)
+        metrics["total_files"] = int(totals["Total_Files"].sum())
+        for key, column in [
+            ("by_type", "Asset_Type"),
+            ("by_phase", "Phase_Name"),
+            ("by_subcompany", "Subcompany"),
+        ]:
+            df = totals if column == "Asset_Type" else self.frame([column])
+            metrics[key] = (
+                df.rename(columns={"Count": "Asset_Folder"}).set_index(column).to_dict("index")
+            )
+        metrics["type_phase_matrix"] = self.matrix().to_dict()
+        metrics["recent_activity"] = self.recent_activity(recent_days)
+        return metrics
+
+
+def open_rollup(settings: Settings) -> RollupCube:
+    """Open the rollup cube stored under default_export_dir."""
+    return RollupCube(settings.default_export_dir / "rollup.sqlite")
+
+
+def refresh_rollup(
+    settings: Settings, max_workers: int | None = None, use_cache: bool = True
+) -> int:
+    """
+    Scan the portfolio (through the scan cache by default, so unchanged
+    folders are not listed again) and fold the result into the cube.
+
+    Returns:
+        Number of assets whose cube contribution changed
+    """
+    scans = _scan_assets(settings, max_workers, use_cache)
+    with open_rollup(settings) as cube:
+        changed = cube.apply(scans, complete=True)
+    print(f"Rollup updated: {changed} assets changed")
+    return changed
+
+
+def print_dashboard(metrics: dict) -> None:
+    """Print a dashboard dict as returned by RollupCube.dashboard."""
+    print("\n" + "=" * 80)
+    print(" PORTFOLIO DASHBOARD")
+    print("=" * 80)
+    print("\nOVERALL STATISTICS:")
+    print(f"  Total Assets: {metrics['total_assets']}")
+    print(f"  Total Files: {metrics['total_files']:,}")
+    print(f"  Total Storage: {metrics['total_size_gb']:.2f} GB")
+    for title, key in [
+        ("BY ASSET TYPE", "by_type"),
+        ("BY PHASE", "by_phase"),
+        ("BY SUBCOMPANY", "by_subcompany"),
+    ]:
+        print(f"\n{title}:")
+        for name, data in metrics[key].items():
+            label = ASSET_TYPE_NAMES.get(name, name) if key == "by_type" else name
+            print(
+                f"  {label:30} {int(data['Asset_Folder']):3} assets | "
+                f"{int(data['Total_Files']):6,} files | "
+                f"{data['Total_Size_MB'] / 1024:6.2f} GB"
+            )
+    recent = metrics["recent_activity"]
+    # Keys carry the window, e.g. assets_modified_30d (see recent_activity)
+    days = next(
+        (k[len("assets_modified_") : -1] for k in recent if k.startswith("assets_modified_")), "30"
+    )
+    print(f"\nRECENT ACTIVITY (Last {days} days):")
+    print(f"  Assets Modified: {recent.get(f'assets_modified_{days}d', 0)}")
+    print(f"  Files Modified: {recent.get(f'files_modified_{days}d', 0):,}")
+    print("\n" + "=" * 80 + "\n")
+
+
+def visualize_portfolio(cube: RollupCube, output_path: Path | None = None):
+    """
+    Draw the four dashboard charts (assets by type, assets by phase, storage
+    by type, phase distribution by type) from the cube. Requires matplotlib.
+
+    Returns:
+        The matplotlib Figure
+    """
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError("visualize_portfolio requires matplotlib") from None
+    by_type = cube.frame(["Asset_Type"])
+    by_phase = cube.frame(["Phase_Name"]).sort_values("Count", ascending=False)
+    matrix = cube.matrix()
+    type_labels = [ASSET_TYPE_NAMES.get(t, t) for t in by_type["Asset_Type"]]
+
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle("Asset Portfolio Dashboard", fontsize=16, fontweight="bold")
+
+    axes[0, 0].pie(by_type["Count"], labels=type_labels, autopct="%1.1f%%")
+    axes[0, 0].set_title("Assets by Type")
+
+    axes[0, 1].bar(by_phase["Phase_Name"], by_phase["Count"])
+    axes[0, 1].tick_params(axis="x", labelrotation=45)
+    axes[0, 1].set_title("Assets by Phase")
+    axes[0, 1].set_ylabel("Number of Assets")
+
+    axes[1, 0].bar(type_labels, by_type["Total_Size_MB"] / 1024)
+    axes[1, 0].tick_params(axis="x", labelrotation=45)
+    axes[1, 0].set_title("Storage by Asset Type")
+    axes[1, 0].set_ylabel("Storage (GB)")
+
+    matrix.plot(kind="bar", stacked=True, ax=axes[1, 1])
+    axes[1, 1].set_title("Phase Distribution by Asset Type")
+    axes[1, 1].set_xlabel("Asset Type")
+    axes[1, 1].set_ylabel("Number of Assets")
+    axes[1, 1].legend(title="Phase", bbox_to_anchor=(1.05, 1), loc="upper left")
+    axes[1, 1].set_xticklabels(
+        [ASSET_TYPE_NAMES.get(t, t) for t in matrix.index], rotation=45, ha="right"
+    )
+
+    fig.tight_layout()
+    if output_path:
+        fig.savefig(output_path, dpi=300, bbox_inches="tight")
+        print(f"Dashboard saved to: {output_path}")
+    return fig
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple
+import sqlite3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    total_size INTEGER NOT NULL,
+    last_modified REAL,
+    phase TEXT,
+    subdirs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_root ON dirs (root);
+"""
+
+
+class DirRecord(NamedTuple):
+    """Aggregates of the files directly inside one directory."""
+
+    path: str
+    root: str
+    mtime_ns: int
+    file_count: int
+    total_size: int
+    last_modified: float | None
+    phase: str | None
+    subdirs: tuple[str, ...]
+
+
+class ScanCache:
+    """
+    On-disk cache of per-directory scan aggregates, keyed on directory mtime.
+
+    A directory's mtime changes whenever an entry is created, deleted or
+    renamed inside it, so a directory whose mtime matches the cached value
+    does not need to be listed again: its own file totals and the names of
+    its subdirectories are reused, and only the subdirectories are stat'ed.
+    Files rewritten in place without a rename are not detected until their
+    directory changes; use a cold scan (or clear()) when that matters.
+
+    All rows are loaded into memory on open and written back in one
+    transaction by commit(), so scan workers never touch the connection.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+        self._lock = Lock()
+        self._records: dict[str, DirRecord] = {}
+        self._scanned: dict[str, dict[str, DirRecord]] = {}
+        for row in self._conn.execute("SELECT * FROM dirs"):
+            record = DirRecord(*row[:7], tuple(row[7].split("\n")) if row[7] else ())
+            self._records[record.path] = record
+
+    def __enter__(self) -> ScanCache:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, path: str, mtime_ns: int) -> DirRecord | None:
+        """Return the cached record for path if its mtime is unchanged."""
+        record = self._records.get(path)
+        if record is not None and record.mtime_ns == mtime_ns:
+            return record
+        return None
+
+    def update(self, root: str, records: list[DirRecord]) -> None:
+        """Register the complete set of directories seen below one root."""
+        with self._lock:
+            self._scanned[root] = {r.path: r for r in records}
+
+    def commit(self, keep_roots: set[str] | None = None) -> None:
+        """
+        Persist pending scan results.
+
+        Directories that were not seen again below a rescanned root are
+        dropped. If keep_roots is given, rows of any other root are dropped
+        as well (used after a full portfolio scan to forget removed assets).
+        """
+        with self._lock:
+            scanned, self._scanned = self._scanned, {}
+        stale: list[str] = []
+        for path, record in self._records.items():
+            seen = scanned.get(record.root)
+            if seen is not None and path not in seen:
+                stale.append(path)
+            elif keep_roots is not None and record.root not in keep_roots:
+                stale.append(path)
+        changed = [
+            record
+            for seen in scanned.values()
+            for path, record in seen.items()
+            if self._records.get(path) != record
+        ]
+
+        with self._conn:
+            self._conn.executemany("DELETE FROM dirs WHERE path = ?", ((p,) for p in stale))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((*r[:7], "\n".join(r.subdirs)) for r in changed),
+            )
+        for path in stale:
+            self._records.pop(path, None)
+        for record in changed:
+            self._records[record.path] = record
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM dirs")
+        self._records.clear()
+
+    def close(self) -> None:
+        self._conn.close()
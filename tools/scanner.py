@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+import os
+
+from .scan_cache import DirRecord, ScanCache
+
+STATUS_PREFIX = "_STATUS_"
+PHASE_CODES = {
+    "01": "Pipeline",
+    "02": "Under Development",
+    "03": "Under Construction",
+    "04": "Operational",
+}
+# Status file of each phase, as named in docs/fileserver_structure.md
+STATUS_FILES = {
+    "01": "_STATUS_01_PIPELINE.txt",
+    "02": "_STATUS_02_UNDER_DEVELOPMENT.txt",
+    "03": "_STATUS_03_UNDER_CONSTRUCTION.txt",
+    "04": "_STATUS_04_OPERATIONAL.txt",
+}
+SUPERSEDED_DIR = "_SUPERSEDED"
+DEFAULT_SCAN_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class AssetScan:
+    """Aggregates collected for one asset folder in a single walk."""
+
+    asset: str
+    path: Path
+    phase: str = "00"
+    file_count: int = 0
+    total_size_bytes: int = 0
+    last_modified: float | None = None
+
+    @property
+    def total_size_mb(self) -> float:
+        return round(self.total_size_bytes / (1024 * 1024), 2)
+
+
+class DocumentRecord(NamedTuple):
+    """One document found below an asset folder."""
+
+    asset: str
+    folder: str
+    filename: str
+    size_bytes: int
+    mtime: float
+
+
+def phase_from_status_name(name: str) -> str | None:
+    """
+    Return the two-digit phase of a _STATUS_XX_*.txt file name.
+    Returns None if the name is not a status file.
+    """
+    if not name.startswith(STATUS_PREFIX):
+        return None
+    parts = name.split("_")
+    if len(parts) < 3 or not parts[2][:2].isdigit():
+        return None
+    return parts[2][:2]
+
+
+def list_asset_folders(assets_path: Path) -> list[Path]:
+    """Return the asset folders directly below assets_path, sorted by path."""
+    if not assets_path.exists():
+        return []
+    with os.scandir(assets_path) as it:
+        return sorted(Path(e.path) for e in it if e.is_dir())
+
+
+def iter_file_entries(
+    top: str | os.PathLike, skip_dir: Callable[[str], bool] | None = None
+) -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yield (directory, entry) for every file below top, depth first.
+
+    Directories for which skip_dir(name) is true are not entered. Symlinked
+    directories are not followed and unreadable directories are skipped.
+    """
+    stack = [os.fspath(top)]
+    while stack:
+        current = stack.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if skip_dir is None or not skip_dir(entry.name):
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield current, entry
+                except OSError:
+                    continue
+
+
+def iter_asset_documents(asset_folder: Path) -> Iterator[DocumentRecord]:
+    """
+    Yield a DocumentRecord per document below asset_folder as the walk runs.
+
+    _SUPERSEDED folders, status files and hidden files are skipped; folder
+    is relative to the asset folder.
+    """
+    top = os.fspath(asset_folder)
+    asset = asset_folder.name
+    for directory, entry in iter_file_entries(top, skip_dir=lambda n: n == SUPERSEDED_DIR):
+        name = entry.name
+        if name.startswith("_STATUS") or name.startswith("."):
+            continue
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        yield DocumentRecord(
+            asset, os.path.relpath(directory, top), name, st.st_size, st.st_mtime
+        )
+
+
+def list_dir(path: str, is_top: bool, mtime_ns: int | None = None) -> DirRecord | None:
+    """
+    List one directory and aggregate the files directly inside it.
+
+    The directory is stat'ed for its mtime unless mtime_ns is given.
+    Returns None if the directory cannot be read.
+    """
+    try:
+        if mtime_ns is None:
+            mtime_ns = os.stat(path).st_mtime_ns
+        it = os.scandir(path)
+    except OSError:
+        return None
+    phases: list[str] = []
+    subdirs: list[str] = []
+    file_count = 0
+    total_size = 0
+    last_modified: float | None = None
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                    continue
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            file_count += 1
+            total_size += st.st_size
+            if last_modified is None or st.st_mtime > last_modified:
+                last_modified = st.st_mtime
+            if is_top:
+                phase = phase_from_status_name(entry.name)
+                if phase:
+                    phases.append(phase)
+    return DirRecord(
+        path=path,
+        root="",
+        mtime_ns=mtime_ns,
+        file_count=file_count,
+        total_size=total_size,
+        last_modified=last_modified,
+        phase=max(phases) if phases else None,
+        subdirs=tuple(subdirs),
+    )
+
+
+def scan_asset(asset_folder: Path, cache: ScanCache | None = None) -> AssetScan:
+    """
+    Walk an asset folder once with os.scandir and collect phase, file count,
+    total size and last-modified time.
+
+    The stat data of each DirEntry is reused, so every file costs at most one
+    stat call (none on Windows, where the listing already carries it).
+    Unreadable folders and files are skipped.
+
+    With a cache, directories whose mtime is unchanged are not listed again;
+    their cached totals are reused and only their subdirectories are visited.
+    """
+    top = os.fspath(asset_folder)
+    records: list[DirRecord] = []
+    stack = [top]
+    while stack:
+        current = stack.pop()
+        record = None
+        # Without a cache the directory mtime is never used, so skip its stat
+        mtime_ns = 0
+        if cache is not None:
+            try:
+                mtime_ns = os.stat(current).st_mtime_ns
+            except OSError:
+                continue
+            record = cache.lookup(current, mtime_ns)
+        if record is None:
+            record = list_dir(current, current == top, mtime_ns)
+            if record is None:
+                continue
+            record = record._replace(root=top)
+        records.append(record)
+        stack.extend(os.path.join(current, name) for name in record.subdirs)
+
+    if cache is not None:
+        cache.update(top, records)
+    return summarize_records(asset_folder, records)
+
+
+def summarize_records(asset_folder: Path, records: list[DirRecord]) -> AssetScan:
+    """Combine the per-directory records of one asset into an AssetScan."""
+    top = os.fspath(asset_folder)
+    modified = [r.last_modified for r in records if r.last_modified is not None]
+    phase = next((r.phase for r in records if r.path == top), None)
+    return AssetScan(
+        asset=asset_folder.name,
+        path=asset_folder,
+        phase=phase or "00",
+        file_count=sum(r.file_count for r in records),
+        total_size_bytes=sum(r.total_size for r in records),
+        last_modified=max(modified) if modified else None,
+    )
+
+
+def iter_portfolio(
+    assets_path: Path,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
+    cache: ScanCache | None = None,
+) -> Iterator[AssetScan]:
+    """
+    Scan every asset folder below assets_path on a bounded thread pool and
+    yield each AssetScan, in sorted folder order, as soon as it is ready.
+
+    Args:
+        assets_path: The ASSETS directory of the file server
+        max_workers: Upper bound on concurrent asset walks
+        cache: Optional ScanCache; it is committed once all assets are scanned
+    """
+    folders = list_asset_folders(assets_path)
+    if folders:
+        workers = max(1, min(max_workers, len(folders)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as pool:
+            yield from pool.map(partial(scan_asset, cache=cache), folders)
+    if cache is not None:
+        cache.commit(keep_roots={os.fspath(f) for f in folders})
+
+
+def scan_portfolio(
+    assets_path: Path,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
+    cache: ScanCache | None = None,
+) -> list[AssetScan]:
+    """
+    Scan every asset folder below assets_path on a bounded thread pool.
+
+    Returns:
+        One AssetScan per asset folder, in sorted folder order
+    """
+    return list(iter_portfolio(assets_path, max_workers=max_workers, cache=cache))
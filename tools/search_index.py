@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+import os
+import re
+import sqlite3
+import time
+
+import pandas as pd
+
+from .naming import parse_document_names
+from .scanner import SUPERSEDED_DIR, list_asset_folders
+
+if TYPE_CHECKING:
+    from .lifecycle_ops import Settings
+
+# docs_fts indexes every relative path by trigram, so any substring of three
+# or more characters is found without a table scan. The triggers keep it in
+# step with docs.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    asset TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_asset ON dirs (asset);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    asset TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    phase_code TEXT,
+    doc_type TEXT,
+    status TEXT,
+    version TEXT,
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_dir ON docs (dir);
+CREATE INDEX IF NOT EXISTS docs_asset ON docs (asset);
+CREATE INDEX IF NOT EXISTS docs_doc_type ON docs (doc_type);
+CREATE INDEX IF NOT EXISTS docs_phase_code ON docs (phase_code);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    path, content='docs', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS docs_insert AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts (rowid, path) VALUES (new.id, new.path);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_delete AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts (docs_fts, rowid, path) VALUES ('delete', old.id, old.path);
+END;
+"""
+
+RESULT_COLUMNS = [
+    "Asset",
+    "Path",
+    "Folder",
+    "Filename",
+    "Phase_Code",
+    "Doc_Type",
+    "Status",
+    "Version",
+    "Size_Bytes",
+    "Modified",
+]
+DEFAULT_SEARCH_LIMIT = 1000
+
+# Shortest literal the trigram index can look up
+_MIN_TRIGRAM = 3
+_WILDCARDS = re.compile(r"[*?]")
+
+
+def _walk_asset(
+    assets_path: str, asset: str, known: dict[str, tuple[int, tuple[str, ...]]]
+) -> tuple[list[str], dict[str, tuple[int, tuple[str, ...], list[tuple[str, int, int]]]]]:
+    """
+    Visit every directory of one asset; only directories whose mtime
+    differs from the index are listed.
+
+    Returns:
+        (seen, changed): relative paths of all directories, and for each
+        listed directory its mtime, subdirectories and (name, size,
+        mtime_ns) of its files
+    """
+    seen: list[str] = []
+    changed = {}
+    stack = [asset]
+    while stack:
+        rel = stack.pop()
+        current = os.path.join(assets_path, rel)
+        try:
+            mtime_ns = os.stat(current).st_mtime_ns
+        except OSError:
+            continue
+        cached = known.get(rel)
+        if cached is not None and cached[0] == mtime_ns:
+            subdirs = cached[1]
+        else:
+            subdirs, files = [], []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name != SUPERSEDED_DIR:
+                                    subdirs.append(entry.name)
+                            elif entry.is_file() and not entry.name.startswith("."):
+                                st = entry.stat()
+                                files.append((entry.name, st.st_size, st.st_mtime_ns))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            subdirs = tuple(subdirs)
+            changed[rel] = (mtime_ns, subdirs, files)
+        seen.append(rel)
+        stack.extend(f"{rel}/{name}" for name in subdirs)
+    return seen, changed
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class SearchIndex:
+    """
+    Local index of every document path below ASSETS, for substring,
+    prefix and wildcard search without touching the file server.
+
+    Paths are stored relative to ASSETS with "/" separators, together with
+    the Phase_Code, Doc_Type, Status and Version parsed from the file name.
+    update() lists only directories whose mtime changed since the last
+    update, like the scan cache; files rewritten in place keep their old
+    size and date until their directory changes. _SUPERSEDED folders and
+    hidden files are not indexed.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> SearchIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def update(
+        self, assets_path: Path, assets: list[str] | None = None, workers: int = 8
+    ) -> dict:
+        """
+        Bring the index up to date with the file server.
+
+        Args:
+            assets_path: The ASSETS directory
+            assets: Asset folders to refresh; all assets if omitted, in which
+                case assets that no longer exist are dropped from the index
+            workers: Concurrent asset walks
+
+        Returns:
+            Dict with the number of directories visited and listed and the
+            documents added and removed
+        """
+        top = os.fspath(assets_path)
+        full = assets is None
+        if full:
+            assets = [p.name for p in list_asset_folders(assets_path)]
+        known: dict[str, dict[str, tuple[int, tuple[str, ...]]]] = {a: {} for a in assets}
+        for path, asset, mtime_ns, subdirs in self._conn.execute(
+            "SELECT path, asset, mtime_ns, subdirs FROM dirs"
+        ):
+            if asset in known:
+                known[asset][path] = (mtime_ns, tuple(subdirs.split("/")) if subdirs else ())
+
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="search") as pool:
+            walks = list(pool.map(lambda a: _walk_asset(top, a, known[a]), assets))
+
+        stale_dirs = [
+            path
+            for asset, (seen, _) in zip(assets, walks)
+            for path in known[asset].keys() - set(seen)
+        ]
+        changed = {path: listing for _, listed in walks for path, listing in listed.items()}
+        files = [
+            (f"{path}/{name}", path, name, size, mtime_ns)
+            for path, (_, _, listing) in changed.items()
+            for name, size, mtime_ns in listing
+        ]
+        parsed = parse_document_names(pd.Series([f[2] for f in files], dtype="string"))
+        fields = parsed[["Phase_Code", "Doc_Type", "Status", "Version"]].astype(object)
+        fields = fields.where(fields.notna(), None).itertuples(index=False, name=None)
+
+        with self._conn:
+            before = len(self)
+            if full:
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS live (asset TEXT PRIMARY KEY)")
+                self._conn.execute("DELETE FROM live")
+                self._conn.executemany("INSERT INTO live VALUES (?)", ((a,) for a in assets))
+                self._conn.execute("DELETE FROM docs WHERE asset NOT IN (SELECT asset FROM live)")
+                self._conn.execute("DELETE FROM dirs WHERE asset NOT IN (SELECT asset FROM live)")
+            gone = stale_dirs + list(changed)
+            self._conn.executemany("DELETE FROM docs WHERE dir = ?", ((p,) for p in gone))
+            self._conn.executemany("DELETE FROM dirs WHERE path = ?", ((p,) for p in stale_dirs))
+            removed = before - len(self)
+            self._conn.executemany(
+                "INSERT INTO docs (path, asset, dir, name, phase_code, doc_type, status, version,"
+                " size_bytes, mtime_ns) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (path, d.split("/", 1)[0], d, name, *parsed_fields, size, mtime_ns)
+                    for (path, d, name, size, mtime_ns), parsed_fields in zip(files, fields)
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)",
+                (
+                    (path, path.split("/", 1)[0], mtime_ns, "/".join(subdirs))
+                    for path, (mtime_ns, subdirs, _) in changed.items()
+                ),
+            )
+        return {
+            "Assets": len(assets),
+            "Dirs_Visited": sum(len(seen) for seen, _ in walks),
+            "Dirs_Listed": len(changed),
+            "Docs_Written": len(files),
+            "Docs_Deleted": removed,
+        }
+
+    def search(
+        self,
+        query: str,
+        asset: str | None = None,
+        phase: str | None = None,
+        doc_type: str | None = None,
+        limit: int | None = DEFAULT_SEARCH_LIMIT,
+    ) -> pd.DataFrame:
+        """
+        Find documents by path, case-insensitively.
+
+        A query without wildcards matches any part of the relative path,
+        e.g. "Grid_Connection" or "_PV0". With * and ? it is matched like
+        Windows Search against the whole file name or asset folder name,
+        e.g. "*_PV*", "AEN_*" or "_STATUS_04*". Literal runs of three or more
+        characters are looked up in the trigram index first.
+
+        Args:
+            query: Substring or wildcard pattern; "" or "*" matches everything
+            asset: Only documents of this asset folder
+            phase: Only documents with this Phase_Code (e.g. "FS")
+            doc_type: Only documents with this Doc_Type (e.g. "REP")
+            limit: Maximum number of rows, in path order; None for all
+
+        Returns:
+            DataFrame with RESULT_COLUMNS
+        """
+        clauses, params = [], []
+        if _WILDCARDS.search(query):
+            literals = [run for run in _WILDCARDS.split(query) if run]
+            pattern = "".join(
+                "%" if c == "*" else "_" if c == "?" else _like_escape(c) for c in query
+            )
+            clauses.append("(name LIKE ? ESCAPE '\\' OR asset LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        else:
+            literals = [query] if query else []
+            if 0 < len(query) < _MIN_TRIGRAM:
+                clauses.append("path LIKE ? ESCAPE '\\'")
+                params.append(f"%{_like_escape(query)}%")
+        trigram_runs = [run for run in literals if len(run) >= _MIN_TRIGRAM]
+        if trigram_runs:
+            clauses.append("id IN (SELECT rowid FROM docs_fts WHERE docs_fts MATCH ?)")
+            params.append(" AND ".join(_fts_phrase(run) for run in trigram_runs))
+        for column, value in [("asset", asset), ("phase_code", phase), ("doc_type", doc_type)]:
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        sql = (
+            # Folder relative to the asset, "." for files directly inside it
+            "SELECT asset, path,"
+            " CASE WHEN instr(dir, '/') THEN substr(dir, instr(dir, '/') + 1) ELSE '.' END,"
+            " name, phase_code, doc_type, status, version, size_bytes, mtime_ns FROM docs"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY path"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._conn.execute(sql, params).fetchall()
+
+        df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+        df["Modified"] = pd.to_datetime(df["Modified"].astype("int64"), unit="ns")
+        return df
+
+
+def open_search_index(settings: Settings) -> SearchIndex:
+    """Open the search index under default_export_dir."""
+    return SearchIndex(settings.search_index_path)
+
+
+def update_search_index(
+    settings: Settings, assets: list[str] | None = None, workers: int | None = None
+) -> dict:
+    """Refresh the search index from the file server (incrementally)."""
+    start = time.perf_counter()
+    with open_search_index(settings) as index:
+        result = index.update(settings.assets_path, assets, workers or settings.scan_workers)
+        total = len(index)
+    print(
+        f"Search index updated in {time.perf_counter() - start:.2f}s: "
+        f"{result['Dirs_Listed']}/{result['Dirs_Visited']} folders listed, "
+        f"{result['Docs_Written']} documents written, {result['Docs_Deleted']} deleted, {total} indexed"
+    )
+    return result
+
+
+def search_documents(
+    settings: Settings,
+    query: str,
+    asset: str | None = None,
+    phase: str | None = None,
+    doc_type: str | None = None,
+    limit: int | None = DEFAULT_SEARCH_LIMIT,
+) -> pd.DataFrame:
+    """Search the index (see SearchIndex.search); the file server is not read."""
+    with open_search_index(settings) as index:
+        return index.search(query, asset=asset, phase=phase, doc_type=doc_type, limit=limit)
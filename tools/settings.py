@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import os
+
+from .scanner import DEFAULT_SCAN_WORKERS
+
+# Defaults of the scan and report settings. They live here rather than in
+# async_scan and report_writer so that loading settings does not import
+# asyncio, pandas or an Excel writer.
+DEFAULT_SCAN_CONCURRENCY = 32
+# Rows per sheet above which a report sheet is written to a side file
+# instead; Excel itself stops at 1,048,576 rows
+DEFAULT_MAX_SHEET_ROWS = 250_000
+
+
+@dataclass(frozen=True)
+class Settings:
+    fileserver_root: Path
+    assets_dir: str = "ASSETS"
+    templates_dir: str = "TEMPLATES"
+    archive_dir: str = "ARCHIVE"
+    default_export_dir: Path = Path(r".\\reports")
+    scan_workers: int = DEFAULT_SCAN_WORKERS
+    scan_concurrency: int = DEFAULT_SCAN_CONCURRENCY
+    report_max_sheet_rows: int = DEFAULT_MAX_SHEET_ROWS
+    # Additional shares (e.g. one per subcompany) for the sharded scan
+    fileserver_roots: tuple[Path, ...] = ()
+
+    @property
+    def fileserver_path(self) -> Path:
+        return self.fileserver_root
+
+    @property
+    def all_roots(self) -> tuple[Path, ...]:
+        """fileserver_root followed by the other fileserver_roots."""
+        return (self.fileserver_root,) + tuple(
+            r for r in self.fileserver_roots if r != self.fileserver_root
+        )
+
+    @property
+    def assets_path(self) -> Path:
+        return self.fileserver_root / self.assets_dir
+
+    @property
+    def templates_path(self) -> Path:
+        return self.fileserver_root / self.templates_dir
+
+    @property
+    def archive_path(self) -> Path:
+        return self.fileserver_root / self.archive_dir
+
+    @property
+    def scan_cache_path(self) -> Path:
+        return self.default_export_dir / "scan_cache.sqlite"
+
+    @property
+    def document_index_path(self) -> Path:
+        return self.default_export_dir / "document_index"
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.default_export_dir / "snapshots"
+
+    @property
+    def search_index_path(self) -> Path:
+        return self.default_export_dir / "search_index.sqlite"
+
+
+def load_settings(env_path: Path = Path(".env")) -> Settings:
+    from dotenv import load_dotenv
+
+    load_dotenv(env_path)
+    env_root = os.environ.get("FILESERVER_ROOT")
+    # Separated like PATH: ";" on Windows, ":" elsewhere
+    roots = tuple(
+        Path(p) for p in os.environ.get("FILESERVER_ROOTS", "").split(os.pathsep) if p.strip()
+    )
+    if env_root:
+        root = Path(env_root)
+    elif roots:
+        root = roots[0]
+    else:
+        root = Path.home() / "AssetManagement"
+    assets_dir = os.environ.get("ASSETS_DIR", "ASSETS")
+    templates_dir = os.environ.get("TEMPLATES_DIR", "TEMPLATES")
+    archive_dir = os.environ.get("ARCHIVE_DIR", "ARCHIVE")
+    export_dir = Path(os.environ.get("DEFAULT_EXPORT_DIR", r".\\reports"))
+    scan_workers = int(os.environ.get("SCAN_WORKERS", DEFAULT_SCAN_WORKERS))
+    scan_concurrency = int(os.environ.get("SCAN_CONCURRENCY", DEFAULT_SCAN_CONCURRENCY))
+    report_max_sheet_rows = int(os.environ.get("REPORT_MAX_SHEET_ROWS", DEFAULT_MAX_SHEET_ROWS))
+    export_dir.mkdir(parents=True, exist_ok=True)
+    return Settings(
+        fileserver_root=root,
+        assets_dir=assets_dir,
+        templates_dir=templates_dir,
+        archive_dir=archive_dir,
+        default_export_dir=export_dir,
+        scan_workers=scan_workers,
+        scan_concurrency=scan_concurrency,
+        report_max_sheet_rows=report_max_sheet_rows,
+        fileserver_roots=roots,
+    )
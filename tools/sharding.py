@@ -0,0 +1,430 @@
+"""
+Sharded portfolio scan across several file server roots and worker processes.
+
+The assets of every root in settings.all_roots are split into shards by
+root and folder-name prefix (the subcompany code), and each shard is
+scanned in its own worker process. Workers run either in a local process
+pool or anywhere that can reach a shared queue directory:
+
+    python -m tools.sharding worker --queue \\\\FileServer\\scan-queue   (on each host)
+    python -m tools.sharding scan --queue \\\\FileServer\\scan-queue --out inventory.csv
+
+The per-shard rows are merged into one inventory with the columns of
+discover_all_assets plus Fileserver_Root.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import groupby
+from pathlib import Path
+from threading import Event, Thread
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import time
+import uuid
+
+import pandas as pd
+
+from .lifecycle_ops import inventory_row, parse_asset_folder_name
+from .scanner import DEFAULT_SCAN_WORKERS, list_asset_folders, scan_asset
+from .settings import Settings, load_settings
+
+DEFAULT_SHARD_ASSETS = 25
+# A claimed shard whose claim file has not been touched for this long is
+# handed to another worker; workers touch it every HEARTBEAT_SECONDS
+DEFAULT_LEASE_SECONDS = 300.0
+HEARTBEAT_SECONDS = 30.0
+POLL_SECONDS = 0.2
+DONE_MARKER = "DONE"
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A group of asset folders of one root, scanned by one worker."""
+
+    shard_id: str
+    root: str
+    assets_dir: str
+    prefix: str
+    assets: tuple[str, ...]
+
+    @property
+    def assets_path(self) -> Path:
+        return Path(self.root) / self.assets_dir
+
+    @classmethod
+    def from_json(cls, text: str) -> Shard:
+        data = json.loads(text)
+        return cls(**{**data, "assets": tuple(data["assets"])})
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def plan_shards(settings: Settings, max_assets: int = DEFAULT_SHARD_ASSETS) -> list[Shard]:
+    """
+    Split the assets of all roots into shards.
+
+    Assets are grouped by root and by the folder-name prefix before the
+    first "_"; groups larger than max_assets are cut into equal parts.
+
+    Returns:
+        Shards, largest first
+    """
+    shards = []
+    for root in settings.all_roots:
+        names = [p.name for p in list_asset_folders(root / settings.assets_dir)]
+        for prefix, group in groupby(names, key=lambda n: n.split("_", 1)[0]):
+            group = list(group)
+            parts = -(-len(group) // max_assets)
+            size = -(-len(group) // parts)
+            for start in range(0, len(group), size):
+                shards.append(
+                    Shard(
+                        shard_id=f"{len(shards):04d}",
+                        root=os.fspath(root),
+                        assets_dir=settings.assets_dir,
+                        prefix=prefix,
+                        assets=tuple(group[start : start + size]),
+                    )
+                )
+    return sorted(shards, key=lambda s: -len(s.assets))
+
+
+def run_shard(
+    shard: Shard, threads: int = DEFAULT_SCAN_WORKERS, local_root: str | None = None
+) -> dict:
+    """
+    Scan the assets of one shard on a thread pool.
+
+    Args:
+        shard: The shard to scan
+        threads: Concurrent asset walks inside this worker
+        local_root: Path of shard.root as seen from this host, if different
+
+    Returns:
+        Dict with shard_id, host, pid, seconds and the inventory rows
+    """
+    start = time.perf_counter()
+    assets_path = Path(local_root or shard.root) / shard.assets_dir
+    folders = [assets_path / name for name in shard.assets]
+    folders = [f for f in folders if f.is_dir()]
+    with ThreadPoolExecutor(max_workers=max(1, min(threads, len(folders) or 1))) as pool:
+        scans = list(pool.map(scan_asset, folders))
+    rows = []
+    for scan in scans:
+        parsed = parse_asset_folder_name(scan.asset)
+        if parsed is not None:
+            rows.append({**inventory_row(scan, parsed), "Fileserver_Root": shard.root})
+    return {
+        "shard_id": shard.shard_id,
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "seconds": round(time.perf_counter() - start, 3),
+        "rows": rows,
+    }
+
+
+class WorkQueue:
+    """
+    Shard queue in a shared directory, usable from several hosts.
+
+    Each run is a folder with pending/, claimed/ and results/. A worker
+    claims a shard by renaming its file from pending/ to claimed/, which
+    only one worker can win, keeps the claim file's mtime fresh while it
+    works and writes the result to results/ atomically; a shard that fails
+    gets a result with an error instead, which the coordinator reports.
+    Claims that go stale (a worker died) are moved back to pending/ by the
+    coordinator.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def submit(self, shards: list[Shard]) -> str:
+        """Queue the shards as a new run; returns the run id."""
+        run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        run = self.path / run_id
+        for name in ("pending", "claimed", "results"):
+            (run / name).mkdir(parents=True)
+        for shard in shards:
+            tmp = run / f".{shard.shard_id}.tmp"
+            tmp.write_text(shard.to_json(), encoding="utf-8")
+            os.replace(tmp, run / "pending" / f"{shard.shard_id}.json")
+        return run_id
+
+    def claim(self) -> tuple[Path, Shard] | None:
+        """Take one pending shard of any open run; None if there is none."""
+        for run in sorted(p for p in self.path.iterdir() if p.is_dir()):
+            if (run / DONE_MARKER).exists():
+                continue
+            try:
+                pending = sorted(os.listdir(run / "pending"))
+            except OSError:
+                continue
+            for name in pending:
+                claimed = run / "claimed" / name
+                try:
+                    os.rename(run / "pending" / name, claimed)
+                    # rename keeps the mtime from submit; start the lease now
+                    os.utime(claimed)
+                    return claimed, Shard.from_json(claimed.read_text(encoding="utf-8"))
+                except OSError:
+                    # Taken by another worker, or the run was just removed
+                    continue
+        return None
+
+    def complete(self, claimed: Path, result: dict) -> None:
+        results = claimed.parent.parent / "results"
+        tmp = results / f".{claimed.name}.tmp"
+        tmp.write_text(json.dumps(result), encoding="utf-8")
+        os.replace(tmp, results / claimed.name)
+        claimed.unlink(missing_ok=True)
+
+    def requeue_stale(self, run_id: str, lease: float) -> int:
+        """Move claims older than lease seconds back to pending."""
+        run = self.path / run_id
+        moved = 0
+        for claimed in (run / "claimed").iterdir():
+            try:
+                if time.time() - claimed.stat().st_mtime > lease:
+                    os.rename(claimed, run / "pending" / claimed.name)
+                    moved += 1
+            except OSError:
+                continue
+        return moved
+
+    def results(self, run_id: str) -> dict[str, dict]:
+        results = {}
+        for path in (self.path / run_id / "results").glob("*.json"):
+            results[path.stem] = json.loads(path.read_text(encoding="utf-8"))
+        return results
+
+    def close(self, run_id: str) -> None:
+        """Mark the run done for workers still polling, then remove it."""
+        run = self.path / run_id
+        (run / DONE_MARKER).touch()
+        shutil.rmtree(run, ignore_errors=True)
+
+
+def _heartbeat(path: Path, stop: Event) -> None:
+    while not stop.wait(HEARTBEAT_SECONDS):
+        try:
+            os.utime(path)
+        except OSError:
+            return
+
+
+def work_queue(
+    queue_dir: Path,
+    idle_timeout: float | None = None,
+    threads: int = DEFAULT_SCAN_WORKERS,
+    root_map: dict[str, str] | None = None,
+) -> int:
+    """
+    Worker loop: claim and scan shards from a WorkQueue.
+
+    Args:
+        queue_dir: The shared queue directory
+        idle_timeout: Exit after this many seconds without work; None to
+            keep polling forever
+        threads: Concurrent asset walks per shard
+        root_map: Root paths as written by the coordinator mapped to the
+            same shares as mounted on this host
+
+    Returns:
+        Number of shards scanned
+    """
+    queue = WorkQueue(queue_dir)
+    root_map = root_map or {}
+    done = 0
+    idle_since = time.monotonic()
+    while True:
+        claim = queue.claim()
+        if claim is None:
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                return done
+            time.sleep(POLL_SECONDS)
+            continue
+        claimed, shard = claim
+        stop = Event()
+        Thread(target=_heartbeat, args=(claimed, stop), daemon=True).start()
+        try:
+            result = run_shard(shard, threads, root_map.get(shard.root))
+            queue.complete(claimed, result)
+            done += 1
+        except Exception as e:
+            print(f"Shard {shard.shard_id} failed: {e}", file=sys.stderr)
+            failure = {
+                "shard_id": shard.shard_id,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "error": f"{type(e).__name__}: {e}",
+                "rows": [],
+            }
+            try:
+                queue.complete(claimed, failure)
+            except OSError:
+                # The claim goes stale and the coordinator requeues the shard
+                pass
+        finally:
+            stop.set()
+        idle_since = time.monotonic()
+
+
+def _merge(results: list[dict]) -> pd.DataFrame:
+    rows = [row for result in results for row in result["rows"]]
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    return df.sort_values(["Fileserver_Root", "Asset_Folder"], ignore_index=True)
+
+
+def _run_on_queue(
+    settings: Settings,
+    shards: list[Shard],
+    queue_dir: Path,
+    local_workers: int,
+    timeout: float | None,
+    lease: float,
+) -> list[dict]:
+    queue = WorkQueue(queue_dir)
+    run_id = queue.submit(shards)
+    ctx = multiprocessing.get_context()
+    processes = [
+        ctx.Process(target=work_queue, args=(queue_dir, None, settings.scan_workers), daemon=True)
+        for _ in range(local_workers)
+    ]
+    for process in processes:
+        process.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            results = queue.results(run_id)
+            failed = {k: r["error"] for k, r in results.items() if "error" in r}
+            if failed:
+                raise RuntimeError(f"Shards failed: {failed}")
+            if len(results) == len(shards):
+                return list(results.values())
+            if deadline is not None and time.monotonic() > deadline:
+                missing = sorted({s.shard_id for s in shards} - results.keys())
+                raise TimeoutError(f"Shards not scanned within {timeout}s: {missing}")
+            queue.requeue_stale(run_id, lease)
+            time.sleep(POLL_SECONDS)
+    finally:
+        queue.close(run_id)
+        # Local workers poll until stopped, so they can pick up requeued shards
+        for process in processes:
+            process.terminate()
+            process.join()
+
+
+def scan_sharded(
+    settings: Settings,
+    workers: int | None = None,
+    max_assets: int = DEFAULT_SHARD_ASSETS,
+    queue_dir: Path | None = None,
+    local_workers: int = 0,
+    timeout: float | None = None,
+    lease: float = DEFAULT_LEASE_SECONDS,
+) -> pd.DataFrame:
+    """
+    Scan every root in settings.all_roots shard by shard and merge the
+    results into one inventory.
+
+    Args:
+        settings: Settings with the roots to scan
+        workers: Local worker processes (without queue_dir); defaults to
+            the CPU count
+        max_assets: Largest number of assets per shard
+        queue_dir: Shared queue directory; shards are then scanned by
+            `python -m tools.sharding worker` processes on any host
+        local_workers: Worker processes to start here in queue mode
+        timeout: Give up after this many seconds in queue mode
+        lease: Seconds after which a silent worker's shard is requeued
+
+    Returns:
+        DataFrame with the discover_all_assets columns and Fileserver_Root,
+        sorted by root and asset folder
+
+    In queue mode a shard that fails on its worker raises RuntimeError
+    naming the shard and the error.
+    """
+    start = time.perf_counter()
+    shards = plan_shards(settings, max_assets)
+    if queue_dir is not None:
+        results = _run_on_queue(settings, shards, queue_dir, local_workers, timeout, lease)
+        where = f"queue {queue_dir}"
+    else:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(shards) or 1))
+        threads = max(1, settings.scan_workers // workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_shard, shards, [threads] * len(shards)))
+        where = f"{workers} processes"
+    df = _merge(results)
+    print(
+        f"Scanned {len(df)} assets of {len(settings.all_roots)} roots in {len(shards)} shards "
+        f"on {where} in {time.perf_counter() - start:.2f}s"
+    )
+    return df
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.sharding", description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("--env", type=Path, default=Path(".env"), help="settings file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="scan shards from a queue directory")
+    worker.add_argument("--queue", type=Path, required=True)
+    worker.add_argument("--idle-timeout", type=float, help="exit after this many idle seconds")
+    worker.add_argument(
+        "--root-map",
+        action="append",
+        default=[],
+        metavar="COORDINATOR_ROOT=LOCAL_ROOT",
+        help="where a root is mounted on this host",
+    )
+
+    scan = commands.add_parser("scan", help="plan, run and merge a sharded scan")
+    scan.add_argument("--workers", type=int, help="local processes (without --queue)")
+    scan.add_argument("--max-assets", type=int, default=DEFAULT_SHARD_ASSETS)
+    scan.add_argument("--queue", type=Path, help="shared queue directory for remote workers")
+    scan.add_argument("--local-workers", type=int, default=0)
+    scan.add_argument("--timeout", type=float)
+    scan.add_argument("--out", type=Path, help="CSV path for the merged inventory")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.env)
+    if args.command == "worker":
+        root_map = dict(item.split("=", 1) for item in args.root_map)
+        done = work_queue(args.queue, args.idle_timeout, settings.scan_workers, root_map)
+        print(f"Scanned {done} shards")
+        return 0
+
+    df = scan_sharded(
+        settings,
+        workers=args.workers,
+        max_assets=args.max_assets,
+        queue_dir=args.queue,
+        local_workers=args.local_workers,
+        timeout=args.timeout,
+    )
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(args.out, index=False)
+        print(f"Inventory written to: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .lifecycle_ops import Settings
+from .scanner import iter_file_entries, list_asset_folders
+from .status import current_status
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_CHECKPOINT_EVERY = 30
+COMPRESSION = "zstd"
+
+# Row operations of a delta; a full snapshot stores every row as "A"
+ADDED, CHANGED, REMOVED = "A", "C", "D"
+
+# Level -> (key column, compared columns)
+LEVELS = {
+    "files": ("Path", ["Size_Bytes", "Mtime_NS"]),
+    "assets": ("Asset", ["Phase", "File_Count", "Size_Bytes"]),
+}
+
+
+def _scan_files(asset_path: Path, assets_path: str) -> tuple[list[str], list[int], list[int]]:
+    paths, sizes, mtimes = [], [], []
+    for _, entry in iter_file_entries(asset_path):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        paths.append(os.path.relpath(entry.path, assets_path).replace(os.sep, "/"))
+        sizes.append(st.st_size)
+        mtimes.append(st.st_mtime_ns)
+    return paths, sizes, mtimes
+
+
+def scan_inventory(settings: Settings, workers: int | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Collect the current file and asset state of the portfolio.
+
+    Every file below every asset (including _SUPERSEDED) is listed, with one
+    concurrent scandir walk per asset.
+
+    Returns:
+        (files, assets): files has Path (relative to ASSETS, "/"-separated),
+        Asset, Size_Bytes and Mtime_NS; assets has Asset, Phase, File_Count
+        and Size_Bytes
+    """
+    folders = list_asset_folders(settings.assets_path)
+    top = os.fspath(settings.assets_path)
+    with ThreadPoolExecutor(max_workers=workers or settings.scan_workers) as pool:
+        scans = list(pool.map(lambda f: _scan_files(f, top), folders))
+        phases = list(pool.map(current_status, folders))
+
+    counts = [len(paths) for paths, _, _ in scans]
+    names = [f.name for f in folders]
+    files = pd.DataFrame(
+        {
+            "Path": pd.Series([p for paths, _, _ in scans for p in paths], dtype="string"),
+            "Asset": pd.Series(np.repeat(names, counts), dtype="string"),
+            "Size_Bytes": np.fromiter((s for _, sizes, _ in scans for s in sizes), "int64", sum(counts)),
+            "Mtime_NS": np.fromiter((m for _, _, mtimes in scans for m in mtimes), "int64", sum(counts)),
+        }
+    )
+    assets = pd.DataFrame(
+        {
+            "Asset": pd.Series(names, dtype="string"),
+            "Phase": pd.Series([r.phase if r else "00" for r in phases], dtype="string"),
+            "File_Count": np.asarray(counts, dtype="int64"),
+            "Size_Bytes": np.asarray(
+                [sum(sizes) for _, sizes, _ in scans], dtype="int64"
+            ),
+        }
+    )
+    return files, assets
+
+
+def diff_states(old: pd.DataFrame, new: pd.DataFrame, level: str) -> pd.DataFrame:
+    """
+    Rows added, changed or removed between two states of one level.
+
+    Returns:
+        The new rows of added and changed keys and the old rows of removed
+        keys, with an Op column (A, C or D)
+    """
+    key, compared = LEVELS[level]
+    in_old = new[key].isin(old[key]).to_numpy()
+    in_new = old[key].isin(new[key]).to_numpy()
+    # Inner join only, so int64 columns are never widened to float by NaN
+    both = new[in_old].merge(old[in_new], on=key, suffixes=("", "_old"))
+    changed = np.logical_or.reduce(
+        [(both[c] != both[f"{c}_old"]).to_numpy(dtype=bool) for c in compared]
+    )
+    delta = pd.concat(
+        [
+            new[~in_old].assign(Op=ADDED),
+            both.loc[changed, list(new.columns)].assign(Op=CHANGED),
+            old[~in_new].assign(Op=REMOVED),
+        ],
+        ignore_index=True,
+    )
+    return delta.sort_values(key, ignore_index=True)
+
+
+def _apply_delta(state: pd.DataFrame, delta: pd.DataFrame, level: str) -> pd.DataFrame:
+    key, _ = LEVELS[level]
+    kept = state[~state[key].isin(delta[key])]
+    upserts = delta.loc[delta["Op"] != REMOVED].drop(columns="Op")
+    return pd.concat([kept, upserts], ignore_index=True).sort_values(key, ignore_index=True)
+
+
+class SnapshotStore:
+    """
+    Inventory snapshots stored as deltas against the previous snapshot.
+
+    Each snapshot is a folder with files.parquet and assets.parquet. Every
+    checkpoint_every-th snapshot holds the full state; the others hold only
+    the added, changed (new values) and removed rows, so storage grows with
+    churn rather than portfolio size and rebuilding any state reads at most
+    one checkpoint plus checkpoint_every - 1 deltas. manifest.json lists the
+    snapshots with their totals and change counts.
+    """
+
+    def __init__(self, root: Path, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        self.root = Path(root)
+        self.checkpoint_every = checkpoint_every
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = self.root / MANIFEST_FILE
+        self._entries: list[dict] = (
+            json.loads(manifest.read_text(encoding="utf-8")) if manifest.exists() else []
+        )
+
+    def _save_manifest(self) -> None:
+        tmp = self.root / (MANIFEST_FILE + ".tmp")
+        tmp.write_text(json.dumps(self._entries, indent=1), encoding="utf-8")
+        os.replace(tmp, self.root / MANIFEST_FILE)
+
+    def snapshots(self) -> pd.DataFrame:
+        """One row per snapshot: Snapshot, Taken, Kind, totals and change counts."""
+        return pd.DataFrame(self._entries)
+
+    def _index_at(self, at: date | datetime | str | None) -> int:
+        if not self._entries:
+            raise LookupError("No snapshots recorded")
+        if at is None:
+            return len(self._entries) - 1
+        if isinstance(at, str):
+            at = datetime.fromisoformat(at) if "T" in at or " " in at else date.fromisoformat(at)
+        if not isinstance(at, datetime):
+            at = datetime(at.year, at.month, at.day, 23, 59, 59)
+        taken = [datetime.fromisoformat(e["Taken"]) for e in self._entries]
+        index = int(np.searchsorted(np.array(taken, dtype="datetime64[us]"), np.datetime64(at), "right")) - 1
+        if index < 0:
+            raise LookupError(f"No snapshot at or before {at}")
+        return index
+
+    def _read(self, index: int, level: str) -> pd.DataFrame:
+        return pd.read_parquet(self.root / self._entries[index]["Snapshot"] / f"{level}.parquet")
+
+    def state(self, at: date | datetime | str | None = None, level: str = "assets") -> pd.DataFrame:
+        """
+        Rebuild the files or assets state of the last snapshot taken at or
+        before `at` (a date means the end of that day; None means the latest).
+        """
+        index = self._index_at(at)
+        start = max(i for i in range(index + 1) if self._entries[i]["Kind"] == "full")
+        state = self._read(start, level).drop(columns="Op")
+        for i in range(start + 1, index + 1):
+            state = _apply_delta(state, self._read(i, level), level)
+        return state
+
+    def diff(
+        self,
+        start: date | datetime | str,
+        end: date | datetime | str | None = None,
+        level: str = "files",
+    ) -> pd.DataFrame:
+        """Rows added, changed or removed between the snapshots at start and end."""
+        return diff_states(self.state(start, level), self.state(end, level), level)
+
+    def record(
+        self, files: pd.DataFrame, assets: pd.DataFrame, taken: datetime | None = None
+    ) -> dict:
+        """
+        Store a new snapshot of the given state (as returned by scan_inventory).
+
+        Returns:
+            The manifest entry of the snapshot
+        """
+        # Snapshots are named and stored to the second
+        taken = (taken or datetime.now()).replace(microsecond=0)
+        if self._entries and taken <= datetime.fromisoformat(self._entries[-1]["Taken"]):
+            raise ValueError(
+                "Snapshots must be recorded in chronological order, at most one per second"
+            )
+        full = len(self._entries) % self.checkpoint_every == 0
+        frames = {"files": files, "assets": assets}
+        entry = {
+            "Snapshot": taken.strftime("%Y%m%dT%H%M%S"),
+            "Taken": taken.isoformat(timespec="seconds"),
+            "Kind": "full" if full else "delta",
+            "Assets": len(assets),
+            "Files": len(files),
+            "Size_Bytes": int(files["Size_Bytes"].sum()),
+        }
+        folder = self.root / entry["Snapshot"]
+        tmp = folder.with_name(folder.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        for level, frame in frames.items():
+            key, _ = LEVELS[level]
+            if self._entries:
+                delta = diff_states(self.state(None, level), frame, level)
+            else:
+                delta = frame.assign(Op=ADDED)
+            ops = delta["Op"].value_counts()
+            prefix = "File" if level == "files" else "Asset"
+            for op, label in [(ADDED, "Added"), (CHANGED, "Changed"), (REMOVED, "Removed")]:
+                entry[f"{prefix}s_{label}"] = int(ops.get(op, 0))
+            if full:
+                delta = frame.sort_values(key, ignore_index=True).assign(Op=ADDED)
+            delta.to_parquet(tmp / f"{level}.parquet", index=False, compression=COMPRESSION)
+        os.replace(tmp, folder)
+        self._entries.append(entry)
+        self._save_manifest()
+        return entry
+
+    def growth(self) -> pd.DataFrame:
+        """Totals and change counts per snapshot, from the manifest alone."""
+        df = self.snapshots()
+        if df.empty:
+            return df
+        df["Size_GB"] = (df["Size_Bytes"] / 1024**3).round(3)
+        df["Files_Delta"] = df["Files"].diff()
+        df["Size_GB_Delta"] = df["Size_GB"].diff().round(3)
+        return df
+
+
+def open_snapshot_store(settings: Settings) -> SnapshotStore:
+    """Open the snapshot store under default_export_dir."""
+    return SnapshotStore(settings.snapshot_path)
+
+
+def take_snapshot(settings: Settings, workers: int | None = None) -> dict:
+    """Scan the portfolio and record it as a new snapshot."""
+    files, assets = scan_inventory(settings, workers)
+    entry = open_snapshot_store(settings).record(files, assets)
+    print(
+        f"Snapshot {entry['Snapshot']} ({entry['Kind']}): {entry['Files']} files in "
+        f"{entry['Assets']} assets"
+    )
+    return entry
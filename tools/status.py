@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+import os
+
+from .scanner import PHASE_CODES, list_asset_folders, phase_from_status_name
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .lifecycle_ops import Settings
+
+TIMELINE_COLUMNS = [
+    "Asset_Folder",
+    "Phase",
+    "Phase_Number",
+    "Start_Date",
+    "End_Date",
+    "Status",
+    "Responsible_PM",
+    "Days_In_Phase",
+    "Last_Updated",
+]
+
+
+def _parse_date(value: str) -> date | None:
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def _parse_datetime(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        day = _parse_date(value)
+        return datetime(day.year, day.month, day.day) if day else None
+
+
+class StatusRecord:
+    """The fields of one _STATUS_XX_*.txt file that the timeline queries use."""
+
+    __slots__ = ("asset", "phase", "status", "started", "closed", "pm", "last_updated", "path")
+
+    def __init__(
+        self,
+        asset: str,
+        phase: str,
+        path: str,
+        status: str | None = None,
+        started: date | None = None,
+        closed: date | None = None,
+        pm: str | None = None,
+        last_updated: datetime | None = None,
+    ):
+        self.asset = asset
+        self.phase = phase
+        self.path = path
+        self.status = status
+        self.started = started
+        self.closed = closed
+        self.pm = pm
+        self.last_updated = last_updated
+
+    def __repr__(self) -> str:
+        return (
+            f"StatusRecord(asset={self.asset!r}, phase={self.phase!r}, "
+            f"started={self.started}, closed={self.closed}, pm={self.pm!r})"
+        )
+
+    @property
+    def phase_name(self) -> str:
+        return PHASE_CODES.get(self.phase, "Unknown")
+
+    @property
+    def is_active(self) -> bool:
+        return self.closed is None
+
+    def days_in_phase(self, as_of: date | None = None) -> int | None:
+        """Days from the phase start to its close, or to as_of (today) while active."""
+        if self.started is None:
+            return None
+        return ((self.closed or as_of or date.today()) - self.started).days
+
+    @classmethod
+    def parse(cls, path: str | os.PathLike, asset: str, phase: str) -> StatusRecord:
+        """
+        Read a status file in one pass over its lines.
+
+        Placeholders such as "[Date]" parse as None. A file can carry several
+        "Phase Closed:" lines (the template placeholder, then the date
+        appended when the asset moved on); the last real date wins.
+        """
+        record = cls(asset, phase, os.fspath(path))
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, sep, value = line.partition(":")
+                if not sep:
+                    continue
+                key, value = key.strip(), value.strip()
+                if key == "STATUS":
+                    record.status = value
+                elif key == "Phase Started":
+                    record.started = _parse_date(value)
+                elif key == "Phase Closed":
+                    record.closed = _parse_date(value) or record.closed
+                elif key == "Responsible PM":
+                    record.pm = value
+                elif key == "Last Updated":
+                    record.last_updated = _parse_datetime(value)
+        return record
+
+
+class StatusCache:
+    """
+    In-memory cache of parsed status files.
+
+    The status file names of an asset are reused while the mtime of the
+    asset folder is unchanged (creating or renaming a file changes it), and
+    a parsed file is reused while its size and mtime are unchanged. A warm
+    lookup therefore costs one stat per asset folder and status file and
+    opens nothing.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._names: dict[str, tuple[int, tuple[tuple[str, str], ...]]] = {}
+        self._records: dict[str, tuple[int, int, StatusRecord]] = {}
+
+    def _status_names(self, asset_path: str) -> tuple[tuple[str, str], ...]:
+        mtime_ns = os.stat(asset_path).st_mtime_ns
+        cached = self._names.get(asset_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        names = []
+        with os.scandir(asset_path) as it:
+            for entry in it:
+                phase = phase_from_status_name(entry.name)
+                if phase and entry.is_file():
+                    names.append((phase, entry.name))
+        names = tuple(sorted(names))
+        with self._lock:
+            self._names[asset_path] = (mtime_ns, names)
+        return names
+
+    def asset_records(self, asset_path: Path) -> list[StatusRecord]:
+        """Status records of one asset folder, sorted by phase."""
+        top = os.fspath(asset_path)
+        try:
+            names = self._status_names(top)
+        except OSError:
+            return []
+        records = []
+        for phase, name in names:
+            path = os.path.join(top, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            cached = self._records.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                records.append(cached[2])
+                continue
+            record = StatusRecord.parse(path, asset_path.name, phase)
+            with self._lock:
+                self._records[path] = (st.st_mtime_ns, st.st_size, record)
+            records.append(record)
+        return records
+
+    def clear(self) -> None:
+        with self._lock:
+            self._names.clear()
+            self._records.clear()
+
+
+_cache = StatusCache()
+
+
+def asset_status(asset_path: Path) -> list[StatusRecord]:
+    """Parsed status files of one asset folder, sorted by phase (cached)."""
+    return _cache.asset_records(asset_path)
+
+
+def current_status(asset_path: Path) -> StatusRecord | None:
+    """Status record of the highest phase reached, or None without status files."""
+    records = _cache.asset_records(asset_path)
+    return records[-1] if records else None
+
+
+def portfolio_status(settings: Settings, workers: int | None = None) -> dict[str, list[StatusRecord]]:
+    """Status records of every asset folder, looked up concurrently."""
+    folders = list_asset_folders(settings.assets_path)
+    with ThreadPoolExecutor(max_workers=workers or settings.scan_workers) as pool:
+        return dict(zip((f.name for f in folders), pool.map(_cache.asset_records, folders)))
+
+
+def _timeline_row(record: StatusRecord, as_of: date) -> dict:
+    return {
+        "Asset_Folder": record.asset,
+        "Phase": record.phase_name,
+        "Phase_Number": record.phase,
+        "Start_Date": record.started,
+        "End_Date": record.closed,
+        "Status": "Active" if record.is_active else "Closed",
+        "Responsible_PM": record.pm,
+        "Days_In_Phase": record.days_in_phase(as_of),
+        "Last_Updated": record.last_updated,
+    }
+
+
+def get_asset_timeline(
+    settings: Settings, asset_folder: str, as_of: date | None = None
+) -> pd.DataFrame:
+    """
+    Phase timeline of one asset from its status files.
+
+    Returns:
+        DataFrame with one row per phase, columns as in TIMELINE_COLUMNS
+    """
+    import pandas as pd
+
+    as_of = as_of or date.today()
+    records = asset_status(settings.assets_path / asset_folder)
+    return pd.DataFrame([_timeline_row(r, as_of) for r in records], columns=TIMELINE_COLUMNS)
+
+
+def portfolio_timeline(
+    settings: Settings, as_of: date | None = None, workers: int | None = None
+) -> pd.DataFrame:
+    """
+    Phase timelines of all assets in one frame.
+
+    Returns:
+        DataFrame with one row per asset and phase, columns as in
+        TIMELINE_COLUMNS
+    """
+    import pandas as pd
+
+    as_of = as_of or date.today()
+    rows = [
+        _timeline_row(record, as_of)
+        for records in portfolio_status(settings, workers).values()
+        for record in records
+    ]
+    return pd.DataFrame(rows, columns=TIMELINE_COLUMNS)
+
+
+def days_in_current_phase(
+    settings: Settings, as_of: date | None = None, workers: int | None = None
+) -> pd.DataFrame:
+    """
+    How long each asset has been in its current phase.
+
+    Returns:
+        DataFrame with one row per asset that has a status file, longest
+        first, columns as in TIMELINE_COLUMNS
+    """
+    import pandas as pd
+
+    as_of = as_of or date.today()
+    rows = [
+        _timeline_row(records[-1], as_of)
+        for records in portfolio_status(settings, workers).values()
+        if records
+    ]
+    df = pd.DataFrame(rows, columns=TIMELINE_COLUMNS)
+    return df.sort_values("Days_In_Phase", ascending=False, ignore_index=True)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Union
+import csv
+import os
+import types
+import typing
+
+from .scanner import (
+    AssetScan,
+    DocumentRecord,
+    iter_asset_documents,
+    iter_portfolio,
+    list_asset_folders,
+)
+
+if TYPE_CHECKING:
+    from .lifecycle_ops import Settings
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def iter_assets(
+    settings: Settings, max_workers: int | None = None, use_cache: bool = False
+) -> Iterator[AssetScan]:
+    """
+    Yield one AssetScan per asset as soon as its walk finishes.
+
+    Asset folders are still scanned in parallel; results come back in
+    sorted folder order without the whole portfolio being held in memory.
+    """
+    workers = max_workers or settings.scan_workers
+    if not use_cache:
+        yield from iter_portfolio(settings.assets_path, max_workers=workers)
+        return
+    from .scan_cache import ScanCache
+
+    with ScanCache(settings.scan_cache_path) as cache:
+        yield from iter_portfolio(settings.assets_path, max_workers=workers, cache=cache)
+
+
+def iter_documents(settings: Settings, asset_folder: str) -> Iterator[DocumentRecord]:
+    """Yield the documents of one asset while its folder is being walked."""
+    yield from iter_asset_documents(settings.assets_path / asset_folder)
+
+
+def iter_portfolio_documents(
+    settings: Settings, assets: Iterable[str] | None = None
+) -> Iterator[DocumentRecord]:
+    """Yield the documents of every asset (or of the given assets), asset by asset."""
+    if assets is None:
+        assets = (p.name for p in list_asset_folders(settings.assets_path))
+    for asset_folder in assets:
+        yield from iter_documents(settings, asset_folder)
+
+
+def _field_names(record: Any) -> list[str]:
+    if is_dataclass(record):
+        return [f.name for f in fields(record)]
+    return list(record._fields)
+
+
+def _batches(records: Iterable[Any], batch_size: int) -> Iterator[list[Any]]:
+    it = iter(records)
+    while batch := list(islice(it, batch_size)):
+        yield batch
+
+
+def write_csv_batches(
+    records: Iterable[Any], out_path: Path, batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Stream NamedTuple or dataclass records to a CSV file in fixed-size batches.
+
+    Returns:
+        Number of records written
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for batch in _batches(records, batch_size):
+            names = _field_names(batch[0])
+            if written == 0:
+                writer.writerow(names)
+            writer.writerows([getattr(r, n) for n in names] for r in batch)
+            written += len(batch)
+    return written
+
+
+def write_parquet_batches(
+    records: Iterable[Any],
+    out_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    schema: Any = None,
+) -> int:
+    """
+    Stream NamedTuple or dataclass records to a Parquet file, one row group
+    per batch. Path values are written as strings.
+
+    The file schema is schema (a pyarrow.Schema) if given, else derived
+    from the record type's annotations, else inferred from the first batch
+    with all-None columns typed as strings. A file is written even when
+    there are no records.
+
+    Returns:
+        Number of records written
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    writer = None
+    try:
+        for batch in _batches(records, batch_size):
+            names = _field_names(batch[0])
+            columns = {}
+            for name in names:
+                values = [getattr(r, name) for r in batch]
+                if any(isinstance(v, os.PathLike) for v in values):
+                    values = [None if v is None else os.fspath(v) for v in values]
+                columns[name] = values
+            table = pa.table(columns)
+            if writer is None:
+                schema = schema or _record_schema(batch[0], pa) or _promote_nulls(table.schema, pa)
+                writer = pq.ParquetWriter(out_path, schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+            written += len(batch)
+        if writer is None:
+            # No records: still write a valid (empty) file for readers
+            writer = pq.ParquetWriter(out_path, schema or pa.schema([]), compression="zstd")
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def _record_schema(record: Any, pa) -> Any:
+    """
+    Arrow schema from the type annotations of a NamedTuple or dataclass
+    record (str, int, float, bool or Path, optionally | None); None if a
+    field has any other annotation.
+    """
+    arrow_types = {
+        str: pa.string(),
+        int: pa.int64(),
+        float: pa.float64(),
+        bool: pa.bool_(),
+        Path: pa.string(),
+    }
+    try:
+        hints = typing.get_type_hints(type(record))
+    except Exception:
+        return None
+    schema_fields = []
+    for name in _field_names(record):
+        hint = hints.get(name)
+        if typing.get_origin(hint) in (Union, types.UnionType):
+            args = [a for a in typing.get_args(hint) if a is not type(None)]
+            hint = args[0] if len(args) == 1 else None
+        if hint not in arrow_types:
+            return None
+        schema_fields.append(pa.field(name, arrow_types[hint]))
+    return pa.schema(schema_fields)
+
+
+def _promote_nulls(schema, pa):
+    # A column that is all None in the first batch would be typed null and
+    # reject the values of later batches
+    return pa.schema(
+        [f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in schema]
+    )
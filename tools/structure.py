@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+import os
+
+DEFAULT_STRUCTURE_WORKERS = 16
+FILES_DIR = Path(__file__).parent / "fileserver_files"
+
+# A tree is a dict of folder name -> subtree; an empty dict is a leaf folder.
+# Ported from scripts/create_fileserver_structure.ps1.
+
+
+def _folders(*names: str) -> dict:
+    return {name: {} for name in names}
+
+
+LIFECYCLE_TEMPLATE: dict = {
+    "00_ASSET_MASTER": _folders(
+        "Asset_Summary_Sheet",
+        "Key_Contacts_Directory",
+        "Timeline_Milestones",
+        "Quick_Financial_Summary",
+        "Document_Index",
+    ),
+    "01_PREFEASIBILITY": _folders(
+        "Site_Identification", "Preliminary_Assessment", "Market_Overview", "Go_No-Go_Decision"
+    ),
+    "02_FEASIBILITY": _folders(
+        "Site_Assessment",
+        "Technical_Feasibility",
+        "Market_Analysis",
+        "Financial_Model_Development",
+        "Risk_Assessment",
+        "Feasibility_Report",
+    ),
+    "03_LAND_ACQUISITION": _folders(
+        "Title_Search_Due_Diligence",
+        "Negotiations",
+        "Contracts_Agreements",
+        "Surveys_Maps",
+        "Legal_Documentation",
+    ),
+    "04_PERMITTING": {
+        "Environmental_Permits": _folders("EIA_Studies", "Applications", "Approvals"),
+        **_folders(
+            "Building_Construction_Permits",
+            "Grid_Connection_Permits",
+            "Operating_Licenses",
+            "Authority_Correspondence",
+            "Permit_Register",
+        ),
+    },
+    "05_DESIGN_ENGINEERING": {
+        "Electrical_Design": _folders("Single_Line_Diagrams", "Layout_Plans", "Calculations"),
+        "Civil_Structural": _folders("Foundation_Design", "Roads_Access", "Drainage"),
+        **_folders(
+            "Mechanical_HVAC", "Technical_Specifications", "Design_Reviews", "As_Designed_Drawings"
+        ),
+    },
+    "06_FINANCING": _folders(
+        "Financing_Strategy",
+        "Lender_Documentation",
+        "Term_Sheets",
+        "Financial_Close_Documents",
+        "Sponsor_Equity",
+        "Financial_Model_Final",
+    ),
+    "07_PROCUREMENT": _folders(
+        "Procurement_Strategy",
+        "RFQ_RFP_Documents",
+        "Bids_Proposals",
+        "Technical_Evaluations",
+        "Commercial_Evaluations",
+        "Contracts_Awarded",
+        "Purchase_Orders",
+    ),
+    "08_CONSTRUCTION": {
+        "Construction_Schedule": {},
+        "Progress_Reports": _folders("Weekly", "Monthly"),
+        "Site_Documentation": _folders("Photos", "Videos", "Site_Diaries"),
+        "QA_QC": _folders("Inspection_Reports", "Test_Results", "NCR_Corrective_Actions"),
+        "Safety_HSE": _folders("Safety_Plans", "Incident_Reports", "Safety_Meetings"),
+        **_folders("Change_Orders", "As_Built_Drawings"),
+    },
+    "09_COMMISSIONING_COD": {
+        **_folders("Commissioning_Plan", "Test_Procedures"),
+        "Test_Reports": _folders("String_Testing", "System_Testing", "Performance_Testing"),
+        **_folders(
+            "Punch_List",
+            "Completion_Certificates",
+            "COD_Documentation",
+            "Warranty_Certificates",
+            "O&M_Manuals",
+            "Training_Materials",
+        ),
+    },
+    "10_OPERATIONS": {
+        "Asset_Information": _folders(
+            "As_Built_Drawings", "Equipment_Manuals", "Asset_Register", "System_Diagrams"
+        ),
+        "Maintenance_Strategy": _folders(
+            "Preventive_Maintenance_Plans", "Maintenance_Procedures", "Spare_Parts_Strategy"
+        ),
+        "Performance_Monitoring": _folders(
+            "KPI_Tracking", "Availability_Analysis", "Performance_Ratio", "Benchmarking"
+        ),
+        "Compliance_Regulatory": _folders(
+            "Environmental_Monitoring", "Safety_Audits", "Regulatory_Reporting", "Inspection_Visits"
+        ),
+    },
+    "11_CONTRACTS_LEGAL": {
+        "Development_Phase": _folders(
+            "Land_Agreements", "Development_Agreements", "Consultant_Contracts"
+        ),
+        "Construction_Phase": _folders(
+            "EPC_Contract", "Equipment_Supply_Contracts", "Construction_Insurance"
+        ),
+        "Operations_Phase": _folders(
+            "O&M_Contract", "PPA_Offtake_Agreement", "Service_Agreements", "Operations_Insurance"
+        ),
+        "Financing_Agreements": _folders(
+            "Loan_Agreements", "Equity_Agreements", "Security_Documents"
+        ),
+        "Contract_Register": {},
+    },
+    "12_FINANCIAL": {
+        "Development_Phase": _folders(
+            "Development_Budget", "Capex_Tracking", "Development_Invoices", "Payment_Certificates"
+        ),
+        "Construction_Phase": _folders(
+            "Construction_Budget",
+            "Cash_Flow_Projections",
+            "Construction_Invoices",
+            "Draw_Requests",
+            "Cost_Reports",
+        ),
+        "Operations_Phase": {
+            "Operating_Budget": {},
+            "Revenue": _folders("Production_Revenue", "Invoices_to_Offtaker"),
+            "OPEX": _folders("O&M_Costs", "Insurance", "Land_Lease", "Other_Operating_Costs"),
+            **_folders("Capital_Improvements", "Annual_Financial_Statements"),
+        },
+        **_folders("Financial_Models", "Tax_Accounting", "Audit_Documents"),
+    },
+    "13_CORRESPONDENCE": {
+        **_folders("Development_Phase", "Construction_Phase", "Operations_Phase"),
+        "Meeting_Minutes": _folders(
+            "Project_Meetings", "Technical_Meetings", "Stakeholder_Meetings"
+        ),
+    },
+    "14_DECOMMISSIONING": _folders(
+        "Decommissioning_Plan", "Environmental_Restoration", "Equipment_Disposal", "Site_Closure"
+    ),
+}
+
+CORPORATE_DEPARTMENTS: dict = {
+    "FINANCE": _folders("Consolidated_Reports", "Tax_Corporate", "Audit_Records", "Treasury"),
+    "HR": _folders("Org_Charts", "Policies", "Training", "Recruitment"),
+    "LEGAL": _folders(
+        "Corporate_Governance", "Insurance_Corporate", "Master_Agreements", "Compliance"
+    ),
+    "STRATEGY": _folders(
+        "Business_Plans", "Market_Research", "Board_Materials", "Investor_Relations"
+    ),
+    "IT_SYSTEMS": _folders("Documentation", "Procedures", "Licenses", "Support"),
+}
+
+CSV_TEMPLATES = [
+    "Asset_Summary_Sheet_Template.csv",
+    "Construction_Budget_Tracker_Template.csv",
+    "Master_Permit_Register_Template.csv",
+    "Preventive_Maintenance_Log_Template.csv",
+    "Warranty_Register_Template.csv",
+]
+
+
+def fileserver_tree(today: date | None = None) -> dict:
+    """Complete folder tree of a fileserver root; ARCHIVE holds the last three years."""
+    year = (today or date.today()).year
+    return {
+        "ASSETS": {},
+        "CORPORATE": CORPORATE_DEPARTMENTS,
+        "TEMPLATES": {
+            "ASSET_LIFECYCLE_TEMPLATE": LIFECYCLE_TEMPLATE,
+            **_folders("DOCUMENT_TEMPLATES", "SYSTEM_DOCUMENTATION", "FORMS_CHECKLISTS", "EXCEL_TEMPLATES"),
+        },
+        "ARCHIVE": _folders(*(str(year - n) for n in range(3))),
+    }
+
+
+def fileserver_files(today: date | None = None) -> dict[str, str]:
+    """Files of a fileserver root as relative path -> content."""
+    def read(name: str) -> str:
+        return (FILES_DIR / name).read_text(encoding="utf-8")
+
+    readme = read("README.txt").replace("{date}", (today or date.today()).isoformat())
+    template = os.path.join("TEMPLATES", "ASSET_LIFECYCLE_TEMPLATE")
+    files = {name: readme for name in ["README.txt", os.path.join("ASSETS", "README.txt")]}
+    files[os.path.join(template, "README.txt")] = readme
+    files[os.path.join(template, "_STATUS_TEMPLATE.txt")] = read("_STATUS_TEMPLATE.txt")
+    for name in CSV_TEMPLATES:
+        files[os.path.join("TEMPLATES", "EXCEL_TEMPLATES", name)] = read(name)
+    return files
+
+
+@dataclass
+class StructurePlan:
+    """Directories and files missing below root, in creation order."""
+
+    root: Path
+    missing_dirs: list[str] = field(default_factory=list)
+    missing_files: dict[str, str | bytes] = field(default_factory=dict)
+    existing_dirs: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing_dirs and not self.missing_files
+
+    def diff(self) -> str:
+        """One '+ path' line per missing entry; directories end with a separator."""
+        lines = [f"+ {rel}{os.sep}" for rel in self.missing_dirs]
+        lines.extend(f"+ {rel}" for rel in self.missing_files)
+        return "\n".join(lines)
+
+
+def _list_names(path: str) -> set[str] | None:
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except FileNotFoundError:
+        return None
+
+
+def _missing_below(rel: str, tree: dict, out: list[str]) -> None:
+    for name, subtree in tree.items():
+        child = os.path.join(rel, name)
+        out.append(child)
+        _missing_below(child, subtree, out)
+
+
+def plan_structure(
+    root: Path,
+    tree: dict,
+    files: dict[str, str] | None = None,
+    workers: int = DEFAULT_STRUCTURE_WORKERS,
+) -> StructurePlan:
+    """
+    Compare a tree (and files) with what exists below root.
+
+    Every existing directory of the tree is listed exactly once, one tree
+    level at a time with the listings of a level running concurrently.
+    Missing subtrees are not listed at all: everything below a missing
+    directory is missing too.
+    """
+    root = Path(root)
+    plan = StructurePlan(root=root)
+    listings: dict[str, set[str]] = {}
+    missing: list[str] = []
+
+    level = [("", tree)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while level:
+            names = list(pool.map(_list_names, [os.path.join(root, rel) for rel, _ in level]))
+            next_level = []
+            for (rel, subtree), present in zip(level, names):
+                if present is None:
+                    if rel:
+                        missing.append(rel)
+                    _missing_below(rel, subtree, missing)
+                    continue
+                plan.existing_dirs += 1
+                listings[rel] = present
+                for name, child_tree in subtree.items():
+                    child = os.path.join(rel, name)
+                    if name in present:
+                        next_level.append((child, child_tree))
+                    else:
+                        missing.append(child)
+                        _missing_below(child, child_tree, missing)
+            level = next_level
+
+    plan.missing_dirs = sorted(missing)
+    for rel, content in (files or {}).items():
+        parent, name = os.path.split(rel)
+        if name not in listings.get(parent, ()):
+            plan.missing_files[rel] = content
+    return plan
+
+
+def apply_plans(
+    plans: list[StructurePlan], workers: int = DEFAULT_STRUCTURE_WORKERS
+) -> dict[Path, OSError]:
+    """
+    Create the missing directories and files of several plans on one pool.
+
+    The work is split into one task per top-level subtree of every plan;
+    a task creates its directories parents-first and then writes its
+    files. Handing every single mkdir to the pool would cost more in thread
+    hand-offs than the mkdir itself on a local disk. File contents may be
+    str (written as UTF-8) or bytes.
+
+    Returns:
+        The first error of every plan that failed, keyed by plan root; the
+        remaining entries of a failed plan are skipped
+    """
+    failed: dict[Path, OSError] = {}
+    tasks: dict[tuple[Path, str], tuple[list[str], list[tuple[str, str | bytes]]]] = {}
+    for plan in plans:
+        for rel in sorted(plan.missing_dirs):
+            top = rel.split(os.sep, 1)[0]
+            tasks.setdefault((plan.root, top), ([], []))[0].append(rel)
+        for rel, content in plan.missing_files.items():
+            top = rel.split(os.sep, 1)[0] if os.sep in rel else ""
+            tasks.setdefault((plan.root, top), ([], []))[1].append((rel, content))
+
+    def run(item: tuple[tuple[Path, str], tuple[list, list]]) -> None:
+        (root, _), (dirs, files) = item
+        if root in failed:
+            return
+        try:
+            os.makedirs(root, exist_ok=True)
+            for rel in dirs:
+                try:
+                    os.mkdir(os.path.join(root, rel))
+                except FileExistsError:
+                    pass
+            for rel, content in files:
+                path = os.path.join(root, rel)
+                if isinstance(content, bytes):
+                    with open(path, "wb") as f:
+                        f.write(content)
+                else:
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(content)
+        except OSError as e:
+            failed.setdefault(root, e)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, tasks.items()))
+    return failed
+
+
+def apply_structure(plan: StructurePlan, workers: int = DEFAULT_STRUCTURE_WORKERS) -> StructurePlan:
+    """Create the missing directories and files of a plan (see apply_plans)."""
+    failed = apply_plans([plan], workers)
+    if failed:
+        raise failed[plan.root]
+    return plan
+
+
+def build_structure(
+    root: Path,
+    tree: dict,
+    files: dict[str, str] | None = None,
+    dry_run: bool = False,
+    workers: int = DEFAULT_STRUCTURE_WORKERS,
+) -> StructurePlan:
+    """
+    Create whatever part of tree and files is missing below root.
+
+    Args:
+        root: Directory the tree is rooted at (created if missing)
+        tree: Nested dict of folder names, e.g. LIFECYCLE_TEMPLATE
+        files: Relative path -> content of files to create if missing;
+            existing files are never overwritten
+        dry_run: Only print the diff of what would be created
+        workers: Threads for listing and creating
+
+    Returns:
+        The StructurePlan that was (or, with dry_run, would be) applied
+    """
+    plan = plan_structure(root, tree, files, workers)
+    if plan.complete:
+        print(f"Structure complete: {root} ({plan.existing_dirs} folders)")
+        return plan
+    if dry_run:
+        print(f"Would create below {root}:")
+        print(plan.diff())
+        return plan
+    apply_structure(plan, workers)
+    print(
+        f"Created {len(plan.missing_dirs)} folders and {len(plan.missing_files)} files "
+        f"below {root}"
+    )
+    return plan
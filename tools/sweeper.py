@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrumented
+from .lifecycle_ops import Settings, is_read_only
+from .naming import parse_document_names
+from .scanner import SUPERSEDED_DIR, iter_asset_documents, list_asset_folders
+
+# A document with a file in one of these statuses is never swept
+PROTECTED_STATUSES = ("FINAL", "APPROVED")
+DEFAULT_BATCH_SIZE = 500
+
+PLAN_COLUMNS = [
+    "Asset_Folder",
+    "Folder",
+    "Filename",
+    "Doc_Key",
+    "Version_Number",
+    "Latest_Version",
+    "Size_Bytes",
+]
+
+_KEY_FIELDS = ["Subco", "Asset_Type", "Asset_ID", "Phase_Code", "Doc_Type", "Description"]
+
+
+def _scan_asset(asset_path: Path) -> tuple[list[str], list[str], list[int]]:
+    folders, names, sizes = [], [], []
+    for record in iter_asset_documents(asset_path):
+        folders.append(record.folder)
+        names.append(record.filename)
+        sizes.append(record.size_bytes)
+    return folders, names, sizes
+
+
+@instrumented
+def plan_superseded_sweep(
+    settings: Settings, keep_latest: int = 1, workers: int | None = None
+) -> pd.DataFrame:
+    """
+    Plan which document versions to move to _SUPERSEDED across the portfolio.
+
+    Every asset is listed once, concurrently (one scandir walk each,
+    _SUPERSEDED folders skipped), and all file names are parsed in one
+    vectorized pass. Files are grouped per folder by document key (the
+    naming-convention fields up to the description, plus the extension)
+    and ranked by version number, then document date; the keep_latest
+    highest versions stay. Documents with a FINAL or APPROVED file,
+    names without a version and folders locked read-only by a phase
+    transition are left alone.
+
+    Returns:
+        DataFrame of the files to move, columns as in PLAN_COLUMNS
+    """
+    folders = list_asset_folders(settings.assets_path)
+    with ThreadPoolExecutor(max_workers=workers or settings.scan_workers) as pool:
+        scans = list(pool.map(_scan_asset, folders))
+
+    counts = [len(names) for _, names, _ in scans]
+    filenames = pd.Series([n for _, names, _ in scans for n in names], dtype="string")
+    if filenames.empty:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+    parsed = parse_document_names(filenames)
+    df = pd.DataFrame(
+        {
+            "Asset_Folder": np.repeat([f.name for f in folders], counts),
+            "Folder": [f for folder_list, _, _ in scans for f in folder_list],
+            "Filename": filenames,
+            "Size_Bytes": np.fromiter(
+                (s for _, _, sizes in scans for s in sizes), dtype="int64", count=len(filenames)
+            ),
+            "Version_Number": parsed["Version_Number"],
+            "Doc_Date": parsed["Doc_Date"],
+            "Status": parsed["Status"],
+        }
+    )
+    versioned = parsed[_KEY_FIELDS].notna().all(axis=1) & parsed["Version_Number"].notna()
+    df = df[versioned.to_numpy()]
+    if df.empty:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+
+    part = {f: parsed.loc[df.index, f].astype("string") for f in _KEY_FIELDS}
+    extension = df["Filename"].str.extract(r"(\.[^.]*)$", expand=False).fillna("")
+    doc_key = (part["Subco"] + "_" + part["Asset_Type"] + part["Asset_ID"]).str.cat(
+        [part[f] for f in _KEY_FIELDS[3:]], sep="_"
+    )
+    df = df.assign(Doc_Key=doc_key + extension)
+
+    groups = ["Asset_Folder", "Folder", "Doc_Key"]
+    protected = df["Status"].isin(PROTECTED_STATUSES).groupby(
+        [df[g] for g in groups]
+    ).transform("any")
+    df = df[~protected].sort_values(
+        groups + ["Version_Number", "Doc_Date"], ascending=[True, True, True, False, False]
+    )
+    grouped = df.groupby(groups, sort=False)
+    df = df.assign(Latest_Version=grouped["Version_Number"].transform("max"))
+    plan = df[grouped.cumcount() >= keep_latest]
+
+    folder_keys = plan[["Asset_Folder", "Folder"]].drop_duplicates()
+    locked = {
+        (asset, folder)
+        for asset, folder in folder_keys.itertuples(index=False)
+        if is_read_only(settings.assets_path / asset / folder)
+    }
+    if locked:
+        keys = pd.Series(list(zip(plan["Asset_Folder"], plan["Folder"])), index=plan.index)
+        plan = plan[~keys.isin(locked)]
+        print(f"Skipped {len(locked)} folders locked read-only by a phase transition")
+    return plan[PLAN_COLUMNS].reset_index(drop=True)
+
+
+def sweep_by_asset(plan: pd.DataFrame) -> pd.DataFrame:
+    """Files and MB to be moved per asset, largest first."""
+    if plan.empty:
+        return pd.DataFrame(columns=["Asset_Folder", "Files", "Size_MB"])
+    summary = plan.groupby("Asset_Folder", as_index=False).agg(
+        Files=("Filename", "count"), Size_Bytes=("Size_Bytes", "sum")
+    )
+    summary["Size_MB"] = (summary.pop("Size_Bytes") / (1024 * 1024)).round(2)
+    return summary.sort_values("Size_MB", ascending=False, ignore_index=True)
+
+
+def _move_batch(assets_path: Path, batch: pd.DataFrame) -> list[str | None]:
+    errors: list[str | None] = []
+    made: set[str] = set()
+    for asset, folder, name in zip(batch["Asset_Folder"], batch["Folder"], batch["Filename"]):
+        source_dir = os.path.join(assets_path, asset, folder)
+        target_dir = os.path.join(source_dir, SUPERSEDED_DIR)
+        try:
+            if target_dir not in made:
+                os.makedirs(target_dir, exist_ok=True)
+                made.add(target_dir)
+            os.replace(os.path.join(source_dir, name), os.path.join(target_dir, name))
+            errors.append(None)
+        except OSError as e:
+            errors.append(str(e))
+    return errors
+
+
+@instrumented
+def sweep_superseded_versions(
+    settings: Settings,
+    keep_latest: int = 1,
+    dry_run: bool = True,
+    max_files: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    Move superseded document versions to _SUPERSEDED for every asset.
+
+    The plan comes from plan_superseded_sweep. With dry_run (the default)
+    nothing is moved and the plan is summarized per asset. Otherwise the
+    moves run in batches of whole folders on a thread pool; max_files caps
+    the run, e.g. for a nightly job with a fixed time budget.
+
+    Args:
+        settings: Settings object containing the assets_path configuration
+        keep_latest: Versions of each document to keep in place
+        dry_run: Only plan and report
+        max_files: Move at most this many files
+        batch_size: Files per batch (a folder is never split across batches)
+        workers: Threads for scanning and moving; defaults to settings.scan_workers
+
+    Returns:
+        The plan with a Result column (planned, moved or failed) and Error
+    """
+    workers = workers or settings.scan_workers
+    plan = plan_superseded_sweep(settings, keep_latest=keep_latest, workers=workers)
+    if max_files is not None:
+        plan = plan.head(max_files)
+    total_mb = plan["Size_Bytes"].sum() / (1024 * 1024) if not plan.empty else 0.0
+    print(
+        f"Superseded sweep: {len(plan)} files, {total_mb:.2f} MB "
+        f"in {plan['Asset_Folder'].nunique()} assets"
+    )
+    plan = plan.assign(Result="planned", Error=None)
+    if dry_run or plan.empty:
+        if not plan.empty:
+            print(sweep_by_asset(plan).to_string(index=False))
+        return plan
+
+    # The plan is sorted by folder; cut it into batches at folder boundaries
+    bounds, batch_start, pos = [], 0, 0
+    for size in plan.groupby(["Asset_Folder", "Folder"], sort=False).size():
+        if pos > batch_start and pos - batch_start + size > batch_size:
+            bounds.append((batch_start, pos))
+            batch_start = pos
+        pos += size
+    bounds.append((batch_start, pos))
+    batches = [plan.iloc[a:b] for a, b in bounds]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda b: _move_batch(settings.assets_path, b), batches)
+        errors = [e for batch_errors in results for e in batch_errors]
+
+    plan["Error"] = errors
+    plan["Result"] = np.where(plan["Error"].isna(), "moved", "failed")
+    failed = int((plan["Result"] == "failed").sum())
+    print(f"Moved {len(plan) - failed} files to _SUPERSEDED in {len(batches)} batches, {failed} failed")
+    return plan
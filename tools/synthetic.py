@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+import math
+import os
+import random
+
+from .scanner import STATUS_FILES, STATUS_PREFIX, SUPERSEDED_DIR
+from .structure import LIFECYCLE_TEMPLATE
+
+# Two-letter document phase code used for files stored in each phase folder
+PHASE_FOLDER_CODES = {
+    "00_ASSET_MASTER": "PF",
+    "01_PREFEASIBILITY": "PF",
+    "02_FEASIBILITY": "FS",
+    "03_LAND_ACQUISITION": "LA",
+    "04_PERMITTING": "PM",
+    "05_DESIGN_ENGINEERING": "DE",
+    "06_FINANCING": "FN",
+    "07_PROCUREMENT": "PR",
+    "08_CONSTRUCTION": "CN",
+    "09_COMMISSIONING_COD": "CM",
+    "10_OPERATIONS": "OP",
+    "11_CONTRACTS_LEGAL": "OP",
+    "12_FINANCIAL": "FN",
+    "13_CORRESPONDENCE": "OP",
+    "14_DECOMMISSIONING": "DC",
+}
+
+SUBCOMPANIES = ["AEN", "BGP", "GRH", "DHO", "EAG"]
+ASSET_TYPES = ["PV", "WF", "HTL", "DC", "HF"]
+LOCATIONS = ["Athens", "Crete", "Patras", "Piraeus", "Santorini", "Thessaloniki"]
+DOC_TYPES = ["FST", "CNT", "PER", "FIN", "TEC", "REP", "COR", "LEG"]
+STATUSES = ["DRAFT", "REVIEW", "REVISED", "FINAL", "APPROVED"]
+EXTENSIONS = [".pdf", ".pdf", ".docx", ".xlsx", ".dwg"]
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Shape of a generated portfolio.
+
+    depth 1 puts documents in the phase folders of the lifecycle template,
+    depth 2 in their first-level subfolders and every further level adds
+    `fanout` Part_N folders below those. File
+    sizes are log-normal around size_median_kb. With sparse, files get their
+    size by truncation instead of written content, which keeps generation
+    fast and disk usage low; metadata scans cannot tell the difference.
+    """
+
+    assets: int = 50
+    depth: int = 2
+    fanout: int = 2
+    files_per_folder: int = 4
+    versions_per_document: int = 2
+    size_median_kb: float = 256.0
+    size_sigma: float = 1.0
+    size_max_mb: float = 64.0
+    superseded_share: float = 0.2
+    sparse: bool = True
+    seed: int = 42
+
+
+def asset_folder_names(count: int, seed: int = 42) -> list[str]:
+    """Distinct SUBCO_TYPEID_NAME_LOCATION folder names."""
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        subco = SUBCOMPANIES[i % len(SUBCOMPANIES)]
+        asset_type = ASSET_TYPES[(i // len(SUBCOMPANIES)) % len(ASSET_TYPES)]
+        names.append(
+            f"{subco}_{asset_type}{i % 1000:03d}_Synthetic-{i:05d}_{rng.choice(LOCATIONS)}"
+        )
+    return names
+
+
+def _leaf_folders(depth: int, fanout: int) -> list[tuple[str, str]]:
+    """(relative folder, document phase code) for every folder that holds files."""
+    leaves = []
+    for phase_folder, subfolders in LIFECYCLE_TEMPLATE.items():
+        code = PHASE_FOLDER_CODES.get(phase_folder, "OP")
+        if depth <= 1:
+            leaves.append((phase_folder, code))
+            continue
+        level = [os.path.join(phase_folder, sub) for sub in subfolders]
+        for _ in range(depth - 2):
+            level = [os.path.join(f, f"Part_{n}") for f in level for n in range(1, fanout + 1)]
+        leaves.extend((f, code) for f in level)
+    return leaves
+
+
+def _file_size(rng: random.Random, spec: SyntheticSpec) -> int:
+    size = rng.lognormvariate(math.log(spec.size_median_kb * 1024), spec.size_sigma)
+    return max(1, min(int(size), int(spec.size_max_mb * 1024 * 1024)))
+
+
+def _write_file(path: str, size: int, sparse: bool, mtime: float) -> None:
+    with open(path, "wb") as f:
+        if sparse:
+            f.truncate(size)
+        else:
+            f.write(os.urandom(size))
+    os.utime(path, (mtime, mtime))
+
+
+def _generate_asset(
+    asset_path: Path,
+    leaves: list[tuple[str, str]],
+    spec: SyntheticSpec,
+    rng: random.Random,
+) -> dict:
+    subco, type_id = asset_path.name.split("_")[:2]
+    base_date = date(2023, 1, 1) + timedelta(days=rng.randrange(700))
+    files = superseded = total_bytes = 0
+
+    phase = rng.choice(list(STATUS_FILES))
+    os.makedirs(asset_path, exist_ok=True)
+    for n, code in enumerate(c for c in STATUS_FILES if c <= phase):
+        status = STATUS_FILES[code][len(STATUS_PREFIX) + 3 : -4].replace("_", " ")
+        started = base_date + timedelta(days=120 * n)
+        closed = f"Phase Closed: {started + timedelta(days=120):%Y-%m-%d}\n" if code < phase else ""
+        (asset_path / STATUS_FILES[code]).write_text(
+            f"STATUS: {status}\nPhase Started: {started:%Y-%m-%d}\n{closed}"
+        )
+
+    doc_number = 0
+    for folder, phase_code in leaves:
+        folder_path = os.path.join(asset_path, folder)
+        os.makedirs(folder_path, exist_ok=True)
+        made_superseded = False
+        for i in range(spec.files_per_folder):
+            version = i % spec.versions_per_document + 1
+            if version == 1:
+                doc_number += 1
+                doc_type = rng.choice(DOC_TYPES)
+                ext = rng.choice(EXTENSIONS)
+                doc_date = base_date + timedelta(days=rng.randrange(365))
+            status = "FINAL" if version == spec.versions_per_document and rng.random() < 0.3 else (
+                rng.choice(STATUSES[:3])
+            )
+            name = (
+                f"{subco}_{type_id}_{phase_code}_{doc_type}_Document-{doc_number:04d}"
+                f"_{doc_date:%Y%m%d}_v{version:02d}_{status}{ext}"
+            )
+            target = folder_path
+            if rng.random() < spec.superseded_share:
+                target = os.path.join(folder_path, SUPERSEDED_DIR)
+                if not made_superseded:
+                    os.makedirs(target, exist_ok=True)
+                    made_superseded = True
+                superseded += 1
+            size = _file_size(rng, spec)
+            mtime = (doc_date - date(1970, 1, 1)).total_seconds() + version * 86400
+            _write_file(os.path.join(target, name), size, spec.sparse, mtime)
+            files += 1
+            total_bytes += size
+
+    return {"files": files, "superseded_files": superseded, "bytes": total_bytes}
+
+
+def generate_fileserver(root: Path, spec: SyntheticSpec = SyntheticSpec(), workers: int = 8) -> dict:
+    """
+    Generate a synthetic fileserver (ASSETS, TEMPLATES, ARCHIVE, CORPORATE)
+    below root, following the lifecycle template and the document naming
+    convention. Assets are generated concurrently; the result is
+    deterministic for a given spec.
+
+    Returns:
+        Dict with the spec and the number of assets, lifecycle folders, files,
+        superseded files and bytes generated
+    """
+    root = Path(root)
+    for top in ["ASSETS", "CORPORATE", "TEMPLATES", "ARCHIVE"]:
+        (root / top).mkdir(parents=True, exist_ok=True)
+
+    leaves = _leaf_folders(spec.depth, spec.fanout)
+    template = root / "TEMPLATES" / "ASSET_LIFECYCLE_TEMPLATE"
+    for folder, _ in leaves:
+        (template / folder).mkdir(parents=True, exist_ok=True)
+
+    names = asset_folder_names(spec.assets, spec.seed)
+
+    def build(item: tuple[int, str]) -> dict:
+        i, name = item
+        rng = random.Random(spec.seed * 1_000_003 + i)
+        return _generate_asset(root / "ASSETS" / name, leaves, spec, rng)
+
+    totals = {"files": 0, "superseded_files": 0, "bytes": 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for counts in pool.map(build, enumerate(names)):
+            for key, value in counts.items():
+                totals[key] += value
+
+    folders = set()
+    for folder, _ in leaves:
+        while folder:
+            folders.add(folder)
+            folder = os.path.dirname(folder)
+    return {
+        "spec": asdict(spec),
+        "assets": spec.assets,
+        "lifecycle_folders": spec.assets * len(folders),
+        **totals,
+    }
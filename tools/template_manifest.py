@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+import base64
+import hashlib
+import json
+import os
+
+from .structure import StructurePlan
+
+if TYPE_CHECKING:
+    from .lifecycle_ops import Settings
+
+TEMPLATE_NAME = "ASSET_LIFECYCLE_TEMPLATE"
+MANIFEST_FILE = "template_manifest.json"
+MANIFEST_VERSION = 1
+VALIDATE_WORKERS = 16
+
+_manifests: dict[Path, TemplateManifest] = {}
+_manifests_lock = Lock()
+
+
+@dataclass(frozen=True)
+class ManifestFile:
+    rel: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    data: bytes = field(repr=False)
+
+
+@dataclass
+class TemplateManifest:
+    """
+    Snapshot of a template folder: every directory with its mtime and every
+    file with its content and SHA-256. Stamping a new asset from it needs no
+    access to the template at all.
+    """
+
+    template_path: Path
+    dirs: dict[str, int] = field(default_factory=dict)
+    files: list[ManifestFile] = field(default_factory=list)
+
+    def is_current(self, workers: int = VALIDATE_WORKERS) -> bool:
+        """
+        Check the snapshot against the template with one stat per entry, run
+        concurrently. Adding, removing or renaming anything changes the mtime
+        of its directory; edited files change their own size or mtime.
+        """
+        root = self.template_path
+
+        def dir_ok(item: tuple[str, int]) -> bool:
+            rel, mtime_ns = item
+            try:
+                return os.stat(os.path.join(root, rel)).st_mtime_ns == mtime_ns
+            except OSError:
+                return False
+
+        def file_ok(f: ManifestFile) -> bool:
+            try:
+                st = os.stat(os.path.join(root, f.rel))
+            except OSError:
+                return False
+            return st.st_size == f.size and st.st_mtime_ns == f.mtime_ns
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return all(pool.map(dir_ok, self.dirs.items())) and all(
+                pool.map(file_ok, self.files)
+            )
+
+    def plan(self, dest: Path) -> StructurePlan:
+        """A StructurePlan that recreates the template below dest."""
+        return StructurePlan(
+            root=dest,
+            missing_dirs=sorted(rel for rel in self.dirs if rel),
+            missing_files={f.rel: f.data for f in self.files},
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "template_path": str(self.template_path),
+                "dirs": self.dirs,
+                "files": [
+                    {
+                        "rel": f.rel,
+                        "size": f.size,
+                        "mtime_ns": f.mtime_ns,
+                        "sha256": f.sha256,
+                        "data": base64.b64encode(f.data).decode("ascii"),
+                    }
+                    for f in self.files
+                ],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> TemplateManifest | None:
+        """Parse a saved manifest; None if it is outdated or a blob is corrupt."""
+        raw = json.loads(text)
+        if raw.get("version") != MANIFEST_VERSION:
+            return None
+        files = []
+        for f in raw["files"]:
+            data = base64.b64decode(f["data"])
+            if hashlib.sha256(data).hexdigest() != f["sha256"]:
+                return None
+            files.append(ManifestFile(f["rel"], f["size"], f["mtime_ns"], f["sha256"], data))
+        return cls(Path(raw["template_path"]), dict(raw["dirs"]), files)
+
+
+def build_manifest(template_path: Path) -> TemplateManifest:
+    """Walk a template folder once with os.scandir and read every file."""
+    if not template_path.is_dir():
+        raise FileNotFoundError(f"Template not found: {template_path}")
+    manifest = TemplateManifest(template_path)
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(template_path, rel)
+        manifest.dirs[rel] = os.stat(path).st_mtime_ns
+        with os.scandir(path) as it:
+            for entry in it:
+                child = os.path.join(rel, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(child)
+                elif entry.is_file():
+                    st = entry.stat()
+                    with open(entry.path, "rb") as f:
+                        data = f.read()
+                    manifest.files.append(
+                        ManifestFile(
+                            child, st.st_size, st.st_mtime_ns, hashlib.sha256(data).hexdigest(), data
+                        )
+                    )
+    return manifest
+
+
+def load_template_manifest(settings: Settings, refresh: bool = False) -> TemplateManifest:
+    """
+    Return the manifest of TEMPLATES/ASSET_LIFECYCLE_TEMPLATE.
+
+    The manifest is kept in memory and saved to default_export_dir, and is
+    only rebuilt (one walk of the template) when refresh is set or the
+    concurrent stat check in TemplateManifest.is_current fails.
+    """
+    template_path = settings.templates_path / TEMPLATE_NAME
+    cache_file = settings.default_export_dir / MANIFEST_FILE
+    with _manifests_lock:
+        manifest = None if refresh else _manifests.get(template_path)
+        if manifest is None and not refresh and cache_file.exists():
+            saved = TemplateManifest.from_json(cache_file.read_text(encoding="utf-8"))
+            if saved is not None and saved.template_path == template_path:
+                manifest = saved
+        if manifest is not None and manifest.is_current():
+            _manifests[template_path] = manifest
+            return manifest
+
+        manifest = build_manifest(template_path)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(manifest.to_json(), encoding="utf-8")
+        os.replace(tmp, cache_file)
+        _manifests[template_path] = manifest
+        print(f"Template manifest built: {len(manifest.dirs)} folders, {len(manifest.files)} files")
+        return manifest
@@ -0,0 +1,497 @@
+"""
+Live asset inventory kept up to date from filesystem events.
+
+    python -m tools.watcher --port 8765
+
+On Linux the watcher uses inotify (one watch per directory); elsewhere, or
+when the watch limit is reached, it polls directory mtimes instead. Either
+way only the directories that changed are listed again, and the per-asset
+totals are served as JSON on http://127.0.0.1:8765/assets. From a notebook:
+
+    from tools.watcher import fetch_inventory
+    df = fetch_inventory()
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import struct
+import sys
+import time
+import urllib.request
+
+import pandas as pd
+
+from .scanner import AssetScan, DirRecord, list_asset_folders, list_dir, summarize_records
+
+if TYPE_CHECKING:
+    from .lifecycle_ops import Settings
+
+DEFAULT_PORT = 8765
+DEFAULT_DEBOUNCE = 0.5
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_RESCAN_INTERVAL = 300.0
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """
+    Minimal inotify binding over ctypes: one watch per directory.
+
+    add, remove_tree and close share one lock, so watches can be added from
+    several threads; close must only be called by the thread that reads.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._libc = libc
+        self.fd = fd
+        self._lock = Lock()
+        self._paths: dict[int, str] = {}
+        self._wds: dict[str, int] = {}
+        self.closed = False
+
+    def add(self, path: str) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err), path)
+            self._paths[wd] = path
+            self._wds[path] = wd
+
+    def remove_tree(self, top: str) -> None:
+        """Drop the watches of top and every directory below it."""
+        prefix = top + os.sep
+        with self._lock:
+            if self.closed:
+                return
+            paths = [p for p in self._wds if p == top or p.startswith(prefix)]
+            for path in paths:
+                wd = self._wds.pop(path)
+                self._paths.pop(wd, None)
+                self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout: float) -> tuple[set[str], bool]:
+        """
+        Wait up to timeout for events.
+
+        Returns:
+            The watched directories that had events, and whether the kernel
+            queue overflowed (events were lost)
+        """
+        dirty: set[str] = set()
+        overflow = False
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return dirty, overflow
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return dirty, overflow
+        offset = 0
+        with self._lock:
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                elif mask & IN_IGNORED:
+                    path = self._paths.pop(wd, None)
+                    if path is not None and self._wds.get(path) == wd:
+                        del self._wds[path]
+                elif wd in self._paths:
+                    dirty.add(self._paths[wd])
+        return dirty, overflow
+
+    def close(self) -> None:
+        with self._lock:
+            if not self.closed:
+                self.closed = True
+                os.close(self.fd)
+
+
+class InventoryWatcher:
+    """
+    In-memory asset inventory that follows changes below settings.assets_path.
+
+    The inventory is the per-directory DirRecord of every folder, as built
+    by scanner.list_dir. A filesystem event only marks its directory dirty;
+    events arriving within `debounce` seconds of each other are coalesced
+    and each dirty directory is then listed once. New subdirectories are
+    walked and removed ones dropped, so the totals always match a full
+    list_assets scan.
+
+    Without inotify, directory mtimes are compared every poll_interval
+    seconds (one stat per directory). As with the scan cache, a file
+    rewritten in place does not change its directory's mtime, so in that
+    mode the whole inventory is also rebuilt every rescan_interval seconds.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool | None = None,
+        rescan_interval: float = DEFAULT_RESCAN_INTERVAL,
+    ):
+        self.settings = settings
+        self.top = os.fspath(settings.assets_path)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        self._inotify: _Inotify | None = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable ({e}); polling instead")
+        self._lock = Lock()
+        self._assets: dict[str, dict[str, DirRecord]] = {}
+        self._top_mtime_ns = 0
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self.updated: datetime | None = None
+        self.dirs_refreshed = 0
+        self._last_rescan = 0.0
+        # Set by any thread when the watch limit is hit; the inotify fd is
+        # then closed by the thread that reads it (see _check_watch_limit)
+        self._watch_limit_hit = Event()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def __enter__(self) -> InventoryWatcher:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- scanning ---------------------------------------------------------
+
+    def _watch(self, path: str) -> None:
+        # Runs on the scan pool threads too, so it never closes or replaces
+        # self._inotify itself
+        inotify = self._inotify
+        if inotify is None:
+            return
+        try:
+            inotify.add(path)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                self._watch_limit_hit.set()
+
+    def _check_watch_limit(self) -> bool:
+        """
+        Switch to polling if a watch could not be added; called only by the
+        thread that reads the inotify fd (or before that thread starts).
+        Returns True if it switched, after which a rescan is needed.
+        """
+        if not self._watch_limit_hit.is_set() or self._inotify is None:
+            return False
+        print("inotify watch limit reached; polling instead")
+        inotify, self._inotify = self._inotify, None
+        inotify.close()
+        return True
+
+    def _walk(self, top: str, asset_top: str) -> dict[str, DirRecord]:
+        """List top and everything below it, watching each directory first."""
+        records = {}
+        stack = [top]
+        while stack:
+            current = stack.pop()
+            self._watch(current)
+            record = list_dir(current, current == asset_top)
+            if record is None:
+                continue
+            records[current] = record
+            stack.extend(os.path.join(current, name) for name in record.subdirs)
+        return records
+
+    def _walk_asset(self, asset_path: str) -> dict[str, DirRecord]:
+        return self._walk(asset_path, asset_path)
+
+    def _refresh_assets(self) -> None:
+        """Pick up added and removed asset folders."""
+        self._watch(self.top)
+        try:
+            self._top_mtime_ns = os.stat(self.top).st_mtime_ns
+        except OSError:
+            return
+        current = {f.name: os.fspath(f) for f in list_asset_folders(self.settings.assets_path)}
+        added = [path for name, path in current.items() if name not in self._assets]
+        with ThreadPoolExecutor(max_workers=self.settings.scan_workers) as pool:
+            walked = list(pool.map(self._walk_asset, added))
+        with self._lock:
+            for name in set(self._assets) - set(current):
+                del self._assets[name]
+                if self._inotify is not None:
+                    self._inotify.remove_tree(os.path.join(self.top, name))
+            for path, records in zip(added, walked):
+                self._assets[os.path.basename(path)] = records
+
+    def rescan(self) -> None:
+        """Rebuild the whole inventory (used at start and after lost events)."""
+        with self._lock:
+            self._assets.clear()
+        self._refresh_assets()
+        self._last_rescan = time.monotonic()
+        self.updated = datetime.now()
+
+    def _apply(self, dirty: set[str]) -> None:
+        if self.top in dirty:
+            self._refresh_assets()
+        prefix_len = len(self.top) + len(os.sep)
+        # Parents first, so a new subtree is walked once from its root
+        for path in sorted(dirty - {self.top}, key=len):
+            asset = path[prefix_len:].split(os.sep, 1)[0]
+            asset_top = os.path.join(self.top, asset)
+            records = self._assets.get(asset)
+            if records is None:
+                continue
+            record = list_dir(path, path == asset_top)
+            with self._lock:
+                old = records.get(path)
+                if record is None:
+                    self._drop_tree(records, path)
+                    continue
+                records[path] = record
+            before = set(old.subdirs) if old else set()
+            after = set(record.subdirs)
+            for name in before - after:
+                with self._lock:
+                    self._drop_tree(records, os.path.join(path, name))
+            for name in after - before:
+                walked = self._walk(os.path.join(path, name), asset_top)
+                with self._lock:
+                    records.update(walked)
+        self.dirs_refreshed += len(dirty)
+        self.updated = datetime.now()
+
+    def _drop_tree(self, records: dict[str, DirRecord], top: str) -> None:
+        prefix = top + os.sep
+        for path in [p for p in records if p == top or p.startswith(prefix)]:
+            del records[path]
+        if self._inotify is not None:
+            self._inotify.remove_tree(top)
+
+    def _poll(self) -> set[str]:
+        dirty = set()
+        try:
+            if os.stat(self.top).st_mtime_ns != self._top_mtime_ns:
+                dirty.add(self.top)
+        except OSError:
+            return dirty
+        with self._lock:
+            known = [(p, r.mtime_ns) for records in self._assets.values() for p, r in records.items()]
+        for path, mtime_ns in known:
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    dirty.add(path)
+            except OSError:
+                dirty.add(path)
+        return dirty
+
+    # -- event loop -------------------------------------------------------
+
+    def _next_changes(self) -> tuple[set[str], bool]:
+        inotify = self._inotify
+        if inotify is None:
+            if self._stop.wait(self.poll_interval):
+                return set(), False
+            return self._poll(), False
+        dirty, overflow = inotify.read(timeout=1.0)
+        if not dirty and not overflow:
+            return dirty, overflow
+        # Coalesce the rest of the burst
+        while True:
+            more, more_overflow = inotify.read(timeout=self.debounce)
+            overflow |= more_overflow
+            if not more:
+                return dirty, overflow
+            dirty |= more
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._check_watch_limit():
+                    self.rescan()
+                    continue
+                dirty, overflow = self._next_changes()
+                stale = (
+                    self._inotify is None
+                    and time.monotonic() - self._last_rescan >= self.rescan_interval
+                )
+                if overflow or stale:
+                    self.rescan()
+                elif dirty:
+                    self._apply(dirty)
+            except Exception as e:
+                # Keep the service up; the next full rescan repairs the state
+                print(f"Watcher error: {e!r}; rescanning")
+                time.sleep(self.debounce)
+                self.rescan()
+
+    def start(self) -> InventoryWatcher:
+        """Scan the portfolio once and follow changes on a background thread."""
+        self.rescan()
+        self._check_watch_limit()
+        self._thread = Thread(target=self._run, name="inventory-watcher", daemon=True)
+        self._thread.start()
+        print(f"Watching {self.top} ({self.mode}): {len(self._assets)} assets")
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    # -- output -----------------------------------------------------------
+
+    def scans(self) -> list[AssetScan]:
+        """Current per-asset totals, in sorted folder order."""
+        with self._lock:
+            items = [(name, list(records.values())) for name, records in self._assets.items()]
+        return [
+            summarize_records(Path(self.top) / name, records) for name, records in sorted(items)
+        ]
+
+    def snapshot(self) -> pd.DataFrame:
+        """The inventory as the DataFrame list_assets returns, without scanning."""
+        from .lifecycle_ops import _assets_frame
+
+        return _assets_frame(self.scans())
+
+    def to_json(self) -> dict:
+        return {
+            "updated": self.updated.isoformat(timespec="seconds") if self.updated else None,
+            "mode": self.mode,
+            "assets": [
+                {
+                    "asset": scan.asset,
+                    "phase": scan.phase,
+                    "file_count": scan.file_count,
+                    "total_size_bytes": scan.total_size_bytes,
+                    "total_size_mb": scan.total_size_mb,
+                    "last_modified": scan.last_modified,
+                }
+                for scan in self.scans()
+            ],
+        }
+
+    def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+        """
+        Serve the inventory as JSON on GET /assets from a background thread.
+        Returns the server; call shutdown() on it to stop.
+        """
+        watcher = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.rstrip("/") not in ("", "/assets"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(watcher.to_json()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        Thread(target=server.serve_forever, name="inventory-http", daemon=True).start()
+        print(f"Serving inventory on http://{host}:{server.server_address[1]}/assets")
+        return server
+
+
+def fetch_inventory(url: str = f"http://127.0.0.1:{DEFAULT_PORT}/assets") -> pd.DataFrame:
+    """Load the inventory from a running watcher, in the list_assets layout."""
+    with urllib.request.urlopen(url, timeout=10) as response:
+        payload = json.load(response)
+    return pd.DataFrame(payload["assets"], columns=["asset", "phase", "file_count", "total_size_mb"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .lifecycle_ops import load_settings
+
+    parser = argparse.ArgumentParser(prog="python -m tools.watcher", description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--env", type=Path, default=Path(".env"), help="settings file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--poll", action="store_true", help="poll instead of using inotify")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument("--rescan-interval", type=float, default=DEFAULT_RESCAN_INTERVAL)
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE)
+    args = parser.parse_args(argv)
+
+    watcher = InventoryWatcher(
+        load_settings(args.env),
+        debounce=args.debounce,
+        poll_interval=args.poll_interval,
+        use_inotify=False if args.poll else None,
+        rescan_interval=args.rescan_interval,
+    )
+    with watcher:
+        server = watcher.serve(args.host, args.port)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())